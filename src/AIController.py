@@ -1,46 +1,219 @@
 # Manages algorithm selection, integration, and comparison
 # contains Easy, Medium, and Hard modes
 
+import logging
 import random
 import time 
 from Minimax import Minimax
 from AlphaBeta import AlphaBeta 
-from HeuristicEvaluator import evaluate, evaluate_distance_to_center, evaluate_freedom
+import HeuristicEvaluator
+from IncrementalEvaluator import IncrementalEvaluator
+from TranspositionTable import TranspositionTable
+from MoveOrdering import MoveOrderer
+from ParallelAlphaBeta import ParallelAlphaBeta
+from ThreatSearch import ThreatSearch
+from OpeningBook import OpeningBook
+from EvalCache import EvalCache, DEFAULT_CACHE_BYTES, fingerprint
+from SearchInstrument import SearchInstrument
+
+# Search reports go through logging (silent unless the application configures it, see main.py)
+logger = logging.getLogger(__name__)
+
+# Evaluation backends: "python" (HeuristicEvaluator + incremental H1) or "numpy" (NumpyEvaluator)
+BACKENDS = ("python", "numpy")
+
+# Heuristic weights (H1 Pattern, H2 Center, H3 Freedom) per mode
+MEDIUM_WEIGHTS = (1, 1, 0)
+HARD_WEIGHTS = (1.5, 1, 1)
+
+# Share of the move's time_limit the threat-space solver may use before the search
+THREAT_TIME_SHARE = 0.1
+# Without a time_limit: threat-space solver nodes per ply of the mode's depth, about the
+# time of the search itself (proofs found in the benchMark positions take under 100 nodes)
+THREAT_NODES_PER_PLY = 100
+
+# Plies of forcing moves (fours, open threes and their answers) searched past the nominal depth
+QUIESCENCE_DEPTH = 4
+
+# Hard mode with selective=True: deeper, with late-move reductions, a candidate cap and
+# futility pruning (see AlphaBeta); about the time of the full-width depth 4 (benchMark.py)
+SELECTIVE_DEPTH = 6
+SELECTIVE_OPTIONS = {"late_move_reductions": True, "max_candidates": 6, "futility_margin": 3000}
 
 class AIController:
     
-    def __init__(self, depth_limit=3): 
+    def __init__(self, depth_limit=3, backend="python", workers=1, book_path=None,
+                 eval_cache_path=None, eval_cache_bytes=None, instrument=None, selective=False): 
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown evaluation backend: {backend}")
+        self.backend = backend
+        if backend == "numpy":
+            import NumpyEvaluator # Optional dependency, only needed for this backend
+            self.heuristics = NumpyEvaluator
+        else:
+            self.heuristics = HeuristicEvaluator
+
         # --- 1. EASY MODE (Minimax + H1 @ Depth 1) ---
-        self.easy_bot = Minimax(depth=1, heuristic_func=evaluate) 
+        self.easy_bot = Minimax(depth=1, heuristic_func=self.heuristics.evaluate) 
         
+        # The vectorised backend scores the leaves of each depth-1 node as one batch
+        # (AlphaBeta._batch_last_ply); the search itself, quiescence included, is the same.
+        batched = backend == "numpy"
+
         # --- 2. MEDIUM MODE (AlphaBeta + H1 + H2 @ Depth 3) ---
-        self.medium_bot = AlphaBeta(depth=3, heuristic_func=self.heuristic_medium) 
+        # Each bot keeps its own transposition table and move orderer for the whole game
+        self.medium_bot = AlphaBeta(depth=3, heuristic_func=self.heuristic_medium,
+                                    transposition_table=TranspositionTable(),
+                                    move_orderer=MoveOrderer(),
+                                    batch_heuristic_func=self.heuristic_medium_batch if batched else None,
+                                    quiescence_depth=QUIESCENCE_DEPTH) 
+
+        # --- 3. HARD MODE (AlphaBeta + H1 + H2 + H3 @ Depth 4, or selective @ Depth 6) ---
+        # With workers > 1 the root moves are searched by a process pool
+        hard_depth, hard_options = (SELECTIVE_DEPTH, SELECTIVE_OPTIONS) if selective else (4, {})
+        if workers > 1:
+            self.hard_bot = ParallelAlphaBeta(depth=hard_depth, heuristic_func=self.heuristic_hard,
+                                              transposition_table=TranspositionTable(),
+                                              move_orderer=MoveOrderer(),
+                                              workers=workers, prepare_board=self.bind_board,
+                                              quiescence_depth=QUIESCENCE_DEPTH, **hard_options)
+        else:
+            self.hard_bot = AlphaBeta(depth=hard_depth, heuristic_func=self.heuristic_hard,
+                                      transposition_table=TranspositionTable(),
+                                      move_orderer=MoveOrderer(),
+                                      batch_heuristic_func=self.heuristic_hard_batch if batched else None,
+                                      quiescence_depth=QUIESCENCE_DEPTH, **hard_options) 
+
+        # Forced wins / mandatory defences, tried before the AlphaBeta modes search
+        self.threat_search = ThreatSearch()
+
+        # Optional opening book (see OpeningBook.py), consulted before everything else
+        self.book = OpeningBook(book_path) if book_path else None
+
+        # Optional evaluation cache per AlphaBeta mode: in memory, plus a SQLite file
+        # with 'eval_cache_path'. Scores of other pattern tables / weights are never reused.
+        # The python backend only writes the file: its incremental evaluation is cheaper
+        # than a disk read, while a NumPy evaluation is ~100x dearer (both give the same scores).
+        self.eval_caches = {}
+        if eval_cache_path or eval_cache_bytes:
+            for mode, bot, weights in (("AlphaBeta_H2", self.medium_bot, MEDIUM_WEIGHTS),
+                                       ("AlphaBeta_Combined", self.hard_bot, HARD_WEIGHTS)):
+                version = fingerprint(mode, weights, sorted(HeuristicEvaluator.PATTERN_SCORES.items()))
+                cache = EvalCache(version, eval_cache_path, eval_cache_bytes or DEFAULT_CACHE_BYTES,
+                                  read_disk=backend == "numpy")
+                bot.eval_cache = cache
+                self.eval_caches[mode] = cache
+
+        # Optional search instrumentation: "stats" (counters and timers), "cprofile" or
+        # "sampling" (plus a profile). Its report lands in last_stats["search"].
+        if instrument not in (None, "stats", "cprofile", "sampling"):
+            raise ValueError(f"Unknown instrumentation: {instrument}")
+        self.instrument = instrument
+
+        # Incremental H1, bound to the board currently being searched
+        self.evaluator = None
+        self.last_stats = {}
 
-        # --- 3. HARD MODE (AlphaBeta + H1 + H2 + H3 @ Depth 4) ---
-        self.hard_bot = AlphaBeta(depth=4, heuristic_func=self.heuristic_hard) 
+    def __getstate__(self):
+        # Pickled for ParallelAlphaBeta workers, which only need the heuristics:
+        # drop the bots (and their tables), the bound evaluator and the backend module.
+        state = self.__dict__.copy()
+        for key in ("easy_bot", "medium_bot", "hard_bot", "threat_search", "book", "eval_caches",
+                    "evaluator", "heuristics"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.evaluator = None
+        self.book = None
+        self.eval_caches = {}
+        if self.backend == "numpy":
+            import NumpyEvaluator
+            self.heuristics = NumpyEvaluator
+        else:
+            self.heuristics = HeuristicEvaluator
+        self.threat_search = ThreatSearch()
+
+    def bind_board(self, board):
+        """Attach an IncrementalEvaluator to 'board' (replacing any previous binding)."""
+        if self.backend != "python":
+            return
+        if self.evaluator is not None and self.evaluator.board is board:
+            return
+        if self.evaluator is not None:
+            self.evaluator.detach()
+        self.evaluator = IncrementalEvaluator(board).attach()
 
     # --- Heuristic Combinations ---
 
+    def pattern_score(self, board_grid, player):
+        """H1, served by the incremental evaluator when it tracks this grid."""
+        if self.evaluator is not None and self.evaluator.board.board is board_grid:
+            return self.evaluator.score(player)
+        return self.heuristics.evaluate(board_grid, player)
+
+    def center_score(self, board_grid, player):
+        """H2, likewise served by the incremental evaluator."""
+        if self.evaluator is not None and self.evaluator.board.board is board_grid:
+            return self.evaluator.distance(player)
+        return self.heuristics.evaluate_distance_to_center(board_grid, player)
+
+    def freedom_score(self, board_grid, player):
+        """H3, likewise served by the incremental evaluator."""
+        if self.evaluator is not None and self.evaluator.board.board is board_grid:
+            return self.evaluator.freedom(player)
+        return self.heuristics.evaluate_freedom(board_grid, player)
+
     def heuristic_medium(self, board_grid, player):
         """Medium: Pattern (H1) + Center (H2)"""
-        h1 = evaluate(board_grid, player)
-        h2 = evaluate_distance_to_center(board_grid, player)
-        return h1 + h2
+        w1, w2, _ = MEDIUM_WEIGHTS
+        h1 = self.pattern_score(board_grid, player)
+        h2 = self.center_score(board_grid, player)
+        return (h1 * w1) + (h2 * w2)
 
     def heuristic_hard(self, board_grid, player):
         """Hard: Pattern (H1) + Center (H2) + Freedom (H3)"""
-        h1 = evaluate(board_grid, player) 
-        h2 = evaluate_distance_to_center(board_grid, player)
-        h3 = evaluate_freedom(board_grid, player)
-        return (h1 * 1.5) + h2 + h3
+        w1, w2, w3 = HARD_WEIGHTS
+        h1 = self.pattern_score(board_grid, player)
+        h2 = self.center_score(board_grid, player)
+        h3 = self.freedom_score(board_grid, player)
+        return (h1 * w1) + (h2 * w2) + (h3 * w3)
+
+    # Batched versions (NumPy backend): one score per position of a stack
+    def heuristic_medium_batch(self, boards, player):
+        w1, w2, _ = MEDIUM_WEIGHTS
+        h1 = self.heuristics.evaluate_batch(boards, player)
+        h2 = self.heuristics.evaluate_distance_to_center_batch(boards, player)
+        return ((h1 * w1) + (h2 * w2)).tolist()
+
+    def heuristic_hard_batch(self, boards, player):
+        h1 = self.heuristics.evaluate_batch(boards, player)
+        h2 = self.heuristics.evaluate_distance_to_center_batch(boards, player)
+        h3 = self.heuristics.evaluate_freedom_batch(boards, player)
+        w1, w2, w3 = HARD_WEIGHTS
+        return ((h1 * w1) + (h2 * w2) + (h3 * w3)).tolist()
 
     # --- Main Selection Logic ---
 
-    def select_best_move(self, board, mode):
-        print(f"--- AI Thinking: {mode} ---")
+    def select_best_move(self, board, mode, time_limit=None):
+        """
+        Returns (move, elapsed_time, nodes_count). The AlphaBeta modes first look
+        the position up in the opening book, then run the threat-space solver,
+        and only search when neither gives a move. With
+        'time_limit' (seconds) they use iterative deepening instead of their fixed depth;
+        the solver then gets THREAT_TIME_SHARE of it and the search what is left.
+        Detailed numbers of the last call are kept in self.last_stats.
+        """
+        logger.debug("AI thinking: %s", mode)
         start_time = time.time()
         move = None
         nodes_count = 0
+        bot = None
+        threat = None
+        book_move = None
+        blunder = False
+        search_report = None
         
         # 1. EASY (Blunder Factor Added)
         if mode == "Minimax_H1":
@@ -48,37 +221,113 @@ class AIController:
             if random.random() < 0.3:
                 candidates = board.get_possible_moves()
                 if candidates:
-                    print(">> Oops! AI made a blunder (Easy Mode).")
+                    blunder = True
                     move = random.choice(candidates)
                     nodes_count = 0 # No search done
             
             # 70% Chance to play the best move
             if move is None: 
                 self.easy_bot.nodes_explored = 0
-                move = self.easy_bot.find_best_move(board)
+                move, search_report = self._instrumented(self.easy_bot, board, None)
                 nodes_count = self.easy_bot.nodes_explored
 
         # 2. MEDIUM
         elif mode == "AlphaBeta_H2": 
-            self.medium_bot.nodes_explored = 0
-            self.medium_bot.pruning_count = 0
-            move = self.medium_bot.find_best_move(board)
-            nodes_count = self.medium_bot.nodes_explored
+            if self.book is not None: book_move = self.book.lookup(board)
+            if book_move is None: threat = self._solve_threats(board, time_limit, self.medium_bot.depth)
+            if book_move is not None:
+                move = book_move
+            elif threat is not None:
+                move = threat[1]
+                nodes_count = self.threat_search.nodes_explored
+            else:
+                self.bind_board(board)
+                self.medium_bot.nodes_explored = 0
+                self.medium_bot.pruning_count = 0
+                move, search_report = self._instrumented(self.medium_bot, board, self._remaining(start_time, time_limit))
+                nodes_count = self.medium_bot.nodes_explored
+                bot = self.medium_bot
 
         # 3. HARD
         elif mode == "AlphaBeta_Combined":
-            self.hard_bot.nodes_explored = 0
-            self.hard_bot.pruning_count = 0
-            move = self.hard_bot.find_best_move(board)
-            nodes_count = self.hard_bot.nodes_explored
+            if self.book is not None: book_move = self.book.lookup(board)
+            if book_move is None: threat = self._solve_threats(board, time_limit, self.hard_bot.depth)
+            if book_move is not None:
+                move = book_move
+            elif threat is not None:
+                move = threat[1]
+                nodes_count = self.threat_search.nodes_explored
+            else:
+                self.bind_board(board)
+                self.hard_bot.nodes_explored = 0
+                self.hard_bot.pruning_count = 0
+                move, search_report = self._instrumented(self.hard_bot, board, self._remaining(start_time, time_limit))
+                nodes_count = self.hard_bot.nodes_explored
+                bot = self.hard_bot
             
         else:
-            print(f"Error: Invalid Mode ({mode})")
+            logger.error("Invalid mode: %s", mode)
             return None, 0, 0 
 
         # --- Performance Reporting ---
         end_time = time.time()
         elapsed_time = end_time - start_time
-        print(f"Stats -> Time: {elapsed_time:.4f}s | Nodes: {nodes_count} | Move: {move}")
-        
-        return move, elapsed_time, nodes_count
\ No newline at end of file
+        self.last_stats = {
+            "mode": mode, "move": move, "time": elapsed_time, "nodes": nodes_count,
+            "threat": threat[0] if threat else None, "book": book_move is not None, "blunder": blunder,
+        }
+        if book_move is not None:
+            self.last_stats.update({"book_hits": self.book.hits, "book_misses": self.book.misses})
+        if threat is not None:
+            self.last_stats["threat_line"] = list(self.threat_search.principal_line)
+        if bot is not None:
+            self.last_stats.update({
+                "pruned": bot.pruning_count, "quiescence_nodes": bot.quiescence_nodes,
+                "tt_hits": bot.tt_hits, "tt_misses": bot.tt_misses, "tt_collisions": bot.tt_collisions,
+                "depth_reached": bot.depth_reached if time_limit else bot.depth,
+                "iteration_times": list(bot.iteration_times) if time_limit else [],
+                "selective": dict(bot.selective_stats),
+            })
+            cache = self.eval_caches.get(mode)
+            if cache is not None: self.last_stats["eval_cache"] = cache.stats()
+        if search_report is not None: self.last_stats["search"] = search_report
+        logger.info("%s -> %s in %.4fs, %d nodes", mode, move, elapsed_time, nodes_count,
+                    extra={"stats": self.last_stats})
+        logger.debug("Stats: %s", self.last_stats)
+
+        return move, elapsed_time, nodes_count
+
+    def cache_stats(self):
+        """Hit counts and rates of the evaluation caches, per mode (empty when disabled)."""
+        return {mode: cache.stats() for mode, cache in self.eval_caches.items()}
+
+    def close(self):
+        """Writes pending cache entries and releases the book, cache files and worker pool."""
+        for cache in self.eval_caches.values():
+            cache.close()
+        if self.book is not None: self.book.close()
+        if isinstance(self.hard_bot, ParallelAlphaBeta): self.hard_bot.close()
+
+    def _solve_threats(self, board, time_limit, depth):
+        # The solver gets THREAT_TIME_SHARE of the time_limit, or THREAT_NODES_PER_PLY nodes per
+        # ply of the search depth without one; it always stops at its own node limit too
+        if time_limit: return self.threat_search.solve(board, time_limit * THREAT_TIME_SHARE)
+        return self.threat_search.solve(board, node_limit=THREAT_NODES_PER_PLY * depth)
+
+    def _remaining(self, start_time, time_limit):
+        """What the search may use of 'time_limit' after the book and solver (None = fixed depth)."""
+        if not time_limit: return None
+        return max(time_limit - (time.time() - start_time), time_limit * THREAT_TIME_SHARE)
+
+    def _search(self, bot, board, time_limit):
+        if time_limit:
+            return bot.find_best_move_timed(board, time_limit)
+        return bot.find_best_move(board)
+
+    def _instrumented(self, bot, board, time_limit):
+        """(move, instrumentation report or None) of one search."""
+        if self.instrument is None: return self._search(bot, board, time_limit), None
+        instrument = SearchInstrument(profile=None if self.instrument == "stats" else self.instrument)
+        with instrument.capture(bot, board):
+            move = self._search(bot, board, time_limit)
+        return move, instrument.report()
\ No newline at end of file
@@ -1,60 +1,392 @@
 # Alpha-Beta Pruning logic
 
 import math
+import time
+from TranspositionTable import EXACT, LOWER, UPPER
+from HeuristicEvaluator import stack_children
+from ThreatSearch import forcing_moves, winning_cells, SearchTimeout, SearchCancelled
+from MoveOrdering import FOUR, cell_threat
+
+# Score of a five forced by the quiescence search (HeuristicEvaluator's score of a five)
+QUIESCENCE_WIN = 1000000000
+
+# Selective search: moves whose local threat score (MoveOrdering.cell_threat) is below a
+# four, made or blocked, are quiet; only quiet moves are reduced, cut or pruned
+QUIET_THREAT = FOUR
+LMR_FULL_MOVES = 2  # moves of a node always searched to full depth
+LMR_MIN_DEPTH = 2   # remaining depth from which late quiet moves are reduced
+LMR_DEEP_INDEX = 8  # from this move on, the reduction is 2 plies instead of 1
+FUTILITY_DEPTH = 2  # futility pruning at remaining depths 1..FUTILITY_DEPTH
+
+# The quiescence search looks for forcing moves around the last QUIESCENCE_AROUND stones
+QUIESCENCE_AROUND = 4
+
 class AlphaBeta:
-    def __init__(self, depth, heuristic_func=None):
+    def __init__(self, depth, heuristic_func=None, transposition_table=None, move_orderer=None,
+                 batch_heuristic_func=None, quiescence_depth=0, quiescence_node_limit=200,
+                 late_move_reductions=False, max_candidates=None, futility_margin=None):
         self.depth = depth
         self.heuristic_func = heuristic_func
+        # Optional: scores a stack of positions at once, batch_heuristic_func(stack, player) -> scores.
+        # When set, the last ply is expanded as one batch instead of node by node.
+        self.batch_heuristic_func = batch_heuristic_func
+        self.transposition_table = transposition_table
+        self.move_orderer = move_orderer
         self.ai_player = None 
         self.nodes_explored = 0
         self.pruning_count = 0
+        self.tt_hits = 0
+        self.tt_misses = 0
+        self.tt_collisions = 0
+        self.last_score = None
+        self.root_first_move = None # searched first at the root (iterative deepening)
+        self.deadline = None        # time.perf_counter() value; None = no limit
+        self.stop_event = None      # threading.Event checked with the deadline; set = cancel the search
+        self.depth_reached = 0
+        self.iteration_times = []
+        self.eval_cache = None      # optional EvalCache for leaf scores, batched or not
+        self.batch_scores = {}      # hash -> score of the children of the last batched depth-1 node
+        self.instrument = None      # SearchInstrument of a capture in progress (see SearchInstrument.py)
+        # Quiescence: up to 'quiescence_depth' plies of forcing moves past depth 0 (0 = off),
+        # at most 'quiescence_node_limit' nodes below each depth-0 node (then static scores only)
+        self.quiescence_depth = quiescence_depth
+        self.quiescence_node_limit = quiescence_node_limit
+        self.quiescence_nodes = 0
+        self.quiescence_budget = 0
+        # Selective search, each switch independent (all off = full-width search); never at the root:
+        # - late_move_reductions: quiet moves after the first LMR_FULL_MOVES are searched 1-2 plies
+        #   shallower with a null window, and again at full depth if they beat the bound
+        # - max_candidates: at most this many moves per node, best local threat score first
+        #   (moves that make or block a four are always kept)
+        # - futility_margin: near the leaves, quiet moves are skipped when the static score
+        #   plus margin * remaining depth cannot reach the window
+        self.late_move_reductions = late_move_reductions
+        self.max_candidates = max_candidates
+        self.futility_margin = futility_margin
+        self.selective_stats = {"reduced": 0, "re_searched": 0, "capped": 0, "futile": 0}
 
     def find_best_move(self, board):
+        tt = self.transposition_table
+        if tt is not None:
+            # Scores are stored from the AI's point of view; a new side invalidates them
+            if self.ai_player != board.current_player: tt.clear()
+            tt.new_search()
+            hits, misses, collisions = tt.hits, tt.misses, tt.collisions
+        if self.move_orderer is not None: self.move_orderer.new_search()
         self.ai_player = board.current_player
+        self.batch_scores = {}
         self.nodes_explored = 0
         self.pruning_count = 0
-        alpha = -math.inf
-        beta = math.inf
-        _, best_move = self._alphabeta(board, self.depth, alpha, beta, True)
+        self.quiescence_nodes = 0
+        self.selective_stats = dict.fromkeys(self.selective_stats, 0)
+        try:
+            self.last_score, best_move = self._root_search(board)
+        finally:
+            if tt is not None:
+                self.tt_hits = tt.hits - hits
+                self.tt_misses = tt.misses - misses
+                self.tt_collisions = tt.collisions - collisions
         return best_move
 
+    def find_best_move_timed(self, board, time_limit, max_depth=20):
+        """
+        Iterative deepening: searches depth 1, 2, 3... until 'time_limit' seconds
+        have passed and returns the best move of the deepest completed iteration.
+        Each iteration searches the previous best move first. Depth 1 always completes.
+        """
+        start = time.perf_counter()
+        nominal_depth = self.depth
+        max_depth = min(max_depth, board.size * board.size - len(board.move_history))
+        best_move = None
+        nodes = pruned = quiet = hits = misses = collisions = 0
+        selective = dict.fromkeys(self.selective_stats, 0)
+        self.depth_reached = 0
+        self.iteration_times = []
+        self.root_first_move = None
+        try:
+            for depth in range(1, max(max_depth, 1) + 1):
+                iteration_start = time.perf_counter()
+                self.depth = depth
+                self.deadline = start + time_limit if depth > 1 else None
+                try:
+                    move = self.find_best_move(board)
+                except SearchTimeout:
+                    break
+                finally:
+                    nodes += self.nodes_explored
+                    pruned += self.pruning_count
+                    quiet += self.quiescence_nodes
+                    for key, count in self.selective_stats.items(): selective[key] += count
+                    hits += self.tt_hits
+                    misses += self.tt_misses
+                    collisions += self.tt_collisions
+                best_move = move
+                self.root_first_move = move
+                self.depth_reached = depth
+                self.iteration_times.append(time.perf_counter() - iteration_start)
+                if time.perf_counter() - start >= time_limit: break
+        finally:
+            self.depth = nominal_depth
+            self.deadline = None
+            self.root_first_move = None
+        self.nodes_explored, self.pruning_count, self.quiescence_nodes = nodes, pruned, quiet
+        self.selective_stats = selective
+        self.tt_hits, self.tt_misses, self.tt_collisions = hits, misses, collisions
+        return best_move
+
+    def _root_search(self, board):
+        """(score, move) of the root with the full window."""
+        return self._alphabeta(board, self.depth, -math.inf, math.inf, True)
+
     def _alphabeta(self, board, depth, alpha, beta, is_maximizing):
         self.nodes_explored += 1
-        if depth == 0 or board.is_terminal(): return self._evaluate_state(board), None
+        if self.nodes_explored % 64 == 0: self._check_limits()
+        tt = self.transposition_table
+        tt_move = None
+        if tt is not None:
+            alpha_orig, beta_orig = alpha, beta
+            entry = tt.probe(board.hash)
+            if entry is not None:
+                _, tt_depth, flag, tt_score, tt_move, _, context = entry
+                if tt_depth >= depth and (context is None or context == self._context(board, tt_depth)):
+                    if flag == EXACT: return tt_score, tt_move
+                    if flag == LOWER: alpha = max(alpha, tt_score)
+                    else: beta = min(beta, tt_score)
+                    if beta <= alpha: return tt_score, tt_move
+        if board.is_terminal() or (depth == 0 and not self.quiescence_depth):
+            score = self._evaluate_state(board)
+            if tt is not None: tt.store(board.hash, depth, EXACT, score, None)
+            return score, None
+        if depth == 0:
+            self.quiescence_budget = self.quiescence_node_limit
+            score = self._quiescence(board, alpha, beta, is_maximizing, self.quiescence_depth)
+            if tt is not None: self._store(board, depth, score, None, alpha_orig, beta_orig)
+            return score, None
         possible_moves = board.get_possible_moves()
         if not possible_moves: return 0, None
+        orderer = self.move_orderer
+        possible_moves = self._order_moves(board, possible_moves, depth, tt_move)
+        if depth == 1 and self.batch_heuristic_func is not None: self._batch_last_ply(board, possible_moves)
         best_move = possible_moves[0] 
+        threats = None
+        if depth < self.depth and (self.late_move_reductions or self.max_candidates or self.futility_margin is not None):
+            threats = self._threat_scores(board, possible_moves)
+            if self.max_candidates: possible_moves = self._cap_candidates(possible_moves, threats)
+        futile = self._futile(board, depth, alpha, beta, is_maximizing) if threats is not None else False
 
         if is_maximizing:
             max_eval = -math.inf
-            for r, c in possible_moves:
+            for index, (r, c) in enumerate(possible_moves):
+                quiet = threats is not None and threats[(r, c)] < QUIET_THREAT
+                if futile and quiet and index:
+                    self.selective_stats["futile"] += 1
+                    continue
                 board.make_move(r, c)
-                eval_score, _ = self._alphabeta(board, depth - 1, alpha, beta, False)
-                board.undo_move(r, c)
+                try:
+                    eval_score = self._child_score(board, depth, alpha, beta, True, self._reduction(depth, index, quiet))
+                finally:
+                    board.undo_move(r, c)
                 if eval_score > max_eval:
                     max_eval = eval_score
                     best_move = (r, c)
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
                     self.pruning_count += 1
+                    if orderer is not None: orderer.record_cutoff((r, c), self.depth - depth, depth)
+                    if self.instrument is not None: self.instrument.cutoff(board, index)
                     break 
+            if tt is not None: self._store(board, depth, max_eval, best_move, alpha_orig, beta_orig)
             return max_eval, best_move
         else:
             min_eval = math.inf
-            for r, c in possible_moves:
+            for index, (r, c) in enumerate(possible_moves):
+                quiet = threats is not None and threats[(r, c)] < QUIET_THREAT
+                if futile and quiet and index:
+                    self.selective_stats["futile"] += 1
+                    continue
                 board.make_move(r, c)
-                eval_score, _ = self._alphabeta(board, depth - 1, alpha, beta, True)
-                board.undo_move(r, c)
+                try:
+                    eval_score = self._child_score(board, depth, alpha, beta, False, self._reduction(depth, index, quiet))
+                finally:
+                    board.undo_move(r, c)
                 if eval_score < min_eval:
                     min_eval = eval_score
                     best_move = (r, c)
                 beta = min(beta, eval_score)
                 if beta <= alpha:
                     self.pruning_count += 1
+                    if orderer is not None: orderer.record_cutoff((r, c), self.depth - depth, depth)
+                    if self.instrument is not None: self.instrument.cutoff(board, index)
                     break 
+            if tt is not None: self._store(board, depth, min_eval, best_move, alpha_orig, beta_orig)
             return min_eval, best_move
 
+    # --- Selective search ---
+
+    def _threat_scores(self, board, moves):
+        """Local threat score of every candidate; the orderer's, when it just computed them."""
+        orderer = self.move_orderer
+        if orderer is not None and orderer.use_threats: return orderer.last_threats
+        grid, player = board.board, board.current_player
+        return {(r, c): cell_threat(grid, r, c, player) for r, c in moves}
+
+    def _cap_candidates(self, moves, threats):
+        if self.move_orderer is None or not self.move_orderer.use_threats:
+            moves = sorted(moves, key=lambda m: -threats[m]) # stable: ties keep the centre order
+        kept = [m for i, m in enumerate(moves) if i < self.max_candidates or threats[m] >= QUIET_THREAT]
+        self.selective_stats["capped"] += len(moves) - len(kept)
+        return kept
+
+    def _futile(self, board, depth, alpha, beta, is_maximizing):
+        """Can no quiet move of this node near the leaves bring the score into the window?"""
+        if self.futility_margin is None or depth > FUTILITY_DEPTH: return False
+        margin = self.futility_margin * depth
+        static = self._evaluate_state(board)
+        return static + margin <= alpha if is_maximizing else static - margin >= beta
+
+    def _reduction(self, depth, index, quiet):
+        if not (self.late_move_reductions and quiet and index >= LMR_FULL_MOVES and depth >= LMR_MIN_DEPTH): return 0
+        return 2 if index >= LMR_DEEP_INDEX and depth > LMR_MIN_DEPTH else 1
+
+    def _child_score(self, board, depth, alpha, beta, is_maximizing, reduction):
+        """
+        Score of the move just made. A reduced move is first searched 'reduction'
+        plies shallower with a null window on the bound it must beat; only if it
+        beats it is it searched again at full depth with the full window.
+        """
+        if reduction:
+            self.selective_stats["reduced"] += 1
+            if is_maximizing:
+                score = self._alphabeta(board, depth - 1 - reduction, alpha, math.nextafter(alpha, math.inf), False)[0]
+                if score <= alpha: return score
+            else:
+                score = self._alphabeta(board, depth - 1 - reduction, math.nextafter(beta, -math.inf), beta, True)[0]
+                if score >= beta: return score
+            self.selective_stats["re_searched"] += 1
+        return self._alphabeta(board, depth - 1, alpha, beta, not is_maximizing)[0]
+
+    def _quiescence(self, board, alpha, beta, is_maximizing, depth):
+        """
+        Score (AI's point of view) of a depth-0 position, extended by forcing
+        moves only: a five to complete wins; an opponent four must be blocked (two
+        cannot be); an opponent open three must be blocked or answered with a
+        four; otherwise the side to move stands pat on the static score or plays
+        its own fours (and open threes, on the first ply only). Moves are looked
+        for on the lines through the last four stones only.
+        """
+        self.nodes_explored += 1
+        self.quiescence_nodes += 1
+        if self.nodes_explored % 64 == 0: self._check_limits()
+        self.quiescence_budget -= 1
+        if depth == 0 or self.quiescence_budget < 0: return self._evaluate_state(board)
+        mover = board.current_player
+        opponent = "O" if mover == "X" else "X"
+        win = QUIESCENCE_WIN if is_maximizing else -QUIESCENCE_WIN
+        if winning_cells(board, mover): return win
+        blocks = winning_cells(board, opponent)
+        if len(blocks) >= 2: return -win
+
+        stand_pat = None
+        if blocks:
+            moves = blocks
+        else:
+            around = board.move_history[-QUIESCENCE_AROUND:]
+            counters = forcing_moves(board, opponent, around, threes=False)[0]
+            if counters:
+                open_fours, fours, _ = forcing_moves(board, mover, around, threes=False)
+                moves = open_fours + fours + [cell for cell in counters if cell not in fours]
+            else:
+                stand_pat = self._evaluate_state(board)
+                # Stand-pat cutoff before the (costlier) move generation
+                if (stand_pat >= beta) if is_maximizing else (stand_pat <= alpha): return stand_pat
+                # Own open threes only on the first quiescence ply; fours all the way
+                open_fours, fours, threes = forcing_moves(board, mover, around, depth == self.quiescence_depth)
+                moves = open_fours + fours + threes
+        if stand_pat is not None:
+            best = stand_pat
+            if is_maximizing: alpha = max(alpha, best)
+            else: beta = min(beta, best)
+        else:
+            best = -math.inf if is_maximizing else math.inf
+
+        for r, c in moves:
+            board.make_move(r, c)
+            try:
+                score = self._quiescence(board, alpha, beta, not is_maximizing, depth - 1)
+            finally:
+                board.undo_move(r, c)
+            if is_maximizing:
+                best = max(best, score)
+                alpha = max(alpha, score)
+            else:
+                best = min(best, score)
+                beta = min(beta, score)
+            if beta <= alpha: break
+        return best
+
+    def _check_limits(self):
+        if self.deadline is not None and time.perf_counter() > self.deadline: raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set(): raise SearchCancelled()
+
+    def _order_moves(self, board, moves, depth, tt_move=None):
+        if self.move_orderer is not None: moves = self.move_orderer.order(board, moves, self.depth - depth)
+        if tt_move in moves:
+            # Search the stored best move first
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        if depth == self.depth and self.root_first_move in moves:
+            moves.remove(self.root_first_move)
+            moves.insert(0, self.root_first_move)
+        return moves
+
+    def _batch_last_ply(self, board, moves):
+        """
+        Scores the children of a depth-1 node with a single batch_heuristic_func call and
+        keeps the scores for _evaluate_state: the node is then searched as usual, cutoffs
+        and quiescence included, so the batch changes the speed of the search, not its result.
+        Children already in the eval_cache are left out of the batch; the others are added to it.
+        """
+        cache, zobrist, player = self.eval_cache, board.zobrist, board.current_player
+        self.batch_scores, misses = {}, []
+        for r, c in moves:
+            key = board.hash ^ zobrist[(r, c, player)] ^ zobrist["side"]
+            score = cache.get(key, self.ai_player) if cache is not None else None
+            if score is None: misses.append(((r, c), key))
+            else: self.batch_scores[key] = score
+        if not misses: return
+        children = stack_children(board.board, [move for move, _ in misses], player)
+        for (_, key), score in zip(misses, self.batch_heuristic_func(children, self.ai_player)):
+            self.batch_scores[key] = score
+            if cache is not None: cache.put(key, self.ai_player, score)
+
+    def _store(self, board, depth, score, best_move, alpha, beta):
+        if score <= alpha: flag = UPPER
+        elif score >= beta: flag = LOWER
+        else: flag = EXACT
+        self.transposition_table.store(board.hash, depth, flag, score, best_move, self._context(board, depth))
+
+    def _context(self, board, depth):
+        """
+        What a searched score depends on besides the position: the quiescence search
+        at the leaves (depth plies down) looks around the last QUIESCENCE_AROUND stones,
+        so the last moves before this node that are still among them. None when no
+        move before it matters (no quiescence, or depth >= QUIESCENCE_AROUND).
+        """
+        if not self.quiescence_depth or depth >= QUIESCENCE_AROUND: return None
+        return tuple(board.move_history[-(QUIESCENCE_AROUND - depth):])
+
     def _evaluate_state(self, board):
+        score = self.batch_scores.get(board.hash)
+        if score is not None: return score
+        cache = self.eval_cache
+        if cache is None: return self._evaluate_position(board)
+        score = cache.get(board.hash, self.ai_player)
+        if score is None:
+            score = self._evaluate_position(board)
+            cache.put(board.hash, self.ai_player, score)
+        return score
+
+    def _evaluate_position(self, board):
         if self.heuristic_func: return self.heuristic_func(board.board, self.ai_player)
         if board.is_terminal():
             winner = "O" if board.current_player == "X" else "X"
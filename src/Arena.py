@@ -0,0 +1,221 @@
+# Headless arena: engine-vs-engine matches across a process pool, with Elo and SPRT estimates
+#
+# Engines are given as strings:
+#   "AlphaBeta_Combined"         an AIController mode (also "AlphaBeta_H2", "Minimax_H1")
+#   "AlphaBeta_Combined@0.5"     the same with iterative deepening and a 0.5 s budget per move
+#   "config:AlphaBeta H1+H2 TT"  a CONFIGS entry of benchMark.py, by name
+#
+# Example: python Arena.py AlphaBeta_Combined "config:PVS H1+H2+H3 Ord" --games 200 --workers 4 --out games.jsonl
+
+import argparse
+import contextlib
+import json
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Board import Board
+
+# --- Engines ---
+
+class ControllerEngine:
+    """An AIController mode; the controller (and its tables) lives for all games of a worker."""
+
+    def __init__(self, mode, time_limit=None):
+        from AIController import AIController
+        self.controller = AIController()
+        self.mode = mode
+        self.time_limit = time_limit
+
+    def play(self, board):
+        move, _, nodes = self.controller.select_best_move(board, self.mode, self.time_limit)
+        return move, nodes
+
+class ConfigEngine:
+    """A ("Name", Class, Depth, Heuristic_Function[, Options]) tuple of benchMark.CONFIGS."""
+
+    def __init__(self, name):
+        from benchMark import CONFIGS
+        for config_name, algo_class, depth, h_func, *options in CONFIGS:
+            if config_name == name:
+                kwargs = {key: factory() for key, factory in (options[0] if options else {}).items()}
+                self.bot = algo_class(depth=depth, heuristic_func=h_func, **kwargs)
+                return
+        raise ValueError(f"Unknown benchMark config: {name}")
+
+    def play(self, board):
+        move = self.bot.find_best_move(board)
+        return move, self.bot.nodes_explored
+
+def make_engine(spec):
+    if spec.startswith("config:"): return ConfigEngine(spec[len("config:"):])
+    mode, _, budget = spec.partition("@")
+    return ControllerEngine(mode, float(budget) if budget else None)
+
+# --- Games ---
+
+def random_opening(size, plies, seed):
+    """'plies' distinct stones near the centre, reproducible from 'seed'."""
+    rng = random.Random(seed)
+    center = size // 2
+    spread = max(1, min(3, plies))
+    cells = [(r, c) for r in range(center - spread, center + spread + 1)
+             for c in range(center - spread, center + spread + 1)]
+    return rng.sample(cells, min(plies, len(cells)))
+
+# Engines of the current worker process, created on first use and reused for every game
+_engines = {}
+
+def play_game(game_id, black, white, size, opening):
+    """
+    Plays one game from the opening stones; 'black' plays X and 'white' plays O.
+    Returns a JSON-ready record.
+    """
+    engines = {}
+    for spec in (black, white):
+        if spec not in _engines: _engines[spec] = make_engine(spec)
+        engines[spec] = _engines[spec]
+    board = Board(size=size)
+    for r, c in opening:
+        board.make_move(r, c)
+    players = {"X": black, "O": white}
+    moves, times, nodes = [], [], []
+    winner = None
+    start = time.perf_counter()
+    while not board.is_terminal():
+        player = board.current_player
+        move_start = time.perf_counter()
+        move, count = engines[players[player]].play(board)
+        times.append(round(time.perf_counter() - move_start, 4))
+        nodes.append(count)
+        if move is None or not board.make_move(*move): # no move / illegal move loses
+            winner = "O" if player == "X" else "X"
+            break
+        moves.append(list(move))
+        if board.check_winner(move[0], move[1], player):
+            winner = player
+    return {
+        "game": game_id, "black": black, "white": white, "size": size,
+        "opening": [list(m) for m in opening], "winner": players[winner] if winner else None,
+        "winner_color": winner, "moves": moves, "times": times, "nodes": nodes,
+        "duration": round(time.perf_counter() - start, 3),
+    }
+
+# --- Statistics ---
+
+def expected_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def elo_estimate(wins, draws, losses):
+    """(Elo difference, 95% margin) of the first engine from its game results."""
+    games = wins + draws + losses
+    if games == 0: return 0.0, math.inf
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+    def to_elo(s):
+        s = min(max(s, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / s - 1)
+    return to_elo(score), (to_elo(min(score + margin, 1)) - to_elo(max(score - margin, 0))) / 2
+
+def sprt(wins, draws, losses, elo0=0, elo1=10, alpha=0.05, beta=0.05):
+    """
+    Sequential probability ratio test of H0 (Elo = elo0) against H1 (Elo = elo1),
+    normal approximation of the log-likelihood ratio. Returns (llr, lower, upper, verdict).
+    """
+    lower, upper = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+    games = wins + draws + losses
+    if games == 0: return 0.0, lower, upper, "continue"
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    if variance == 0: return 0.0, lower, upper, "continue"
+    s0, s1 = expected_score(elo0), expected_score(elo1)
+    llr = games * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+    verdict = "H1" if llr >= upper else "H0" if llr <= lower else "continue"
+    return llr, lower, upper, verdict
+
+class MatchStats:
+    """Results from the first engine's ('a') point of view."""
+
+    def __init__(self, a, b):
+        self.a, self.b = a, b
+        self.wins = self.draws = self.losses = 0
+
+    def add(self, record):
+        # By colour, so that an engine can also play against itself
+        if record["winner_color"] is None: self.draws += 1
+        elif record["winner_color"] == record["a_color"]: self.wins += 1
+        else: self.losses += 1
+
+    def summary(self, elo0=0, elo1=10):
+        elo, margin = elo_estimate(self.wins, self.draws, self.losses)
+        llr, lower, upper, verdict = sprt(self.wins, self.draws, self.losses, elo0, elo1)
+        return {
+            "a": self.a, "b": self.b, "wins": self.wins, "draws": self.draws, "losses": self.losses,
+            "elo": round(elo, 1), "elo_margin": round(margin, 1),
+            "sprt": {"elo0": elo0, "elo1": elo1, "llr": round(llr, 3),
+                     "bounds": [round(lower, 3), round(upper, 3)], "verdict": verdict},
+        }
+
+# --- Match ---
+
+def schedule(a, b, games, size, opening_plies, seed):
+    """Game arguments: every opening is played twice, with colours swapped."""
+    jobs = []
+    for i in range(games):
+        opening = random_opening(size, opening_plies, seed + i // 2)
+        black, white = (a, b) if i % 2 == 0 else (b, a)
+        jobs.append((i, black, white, size, opening))
+    return jobs
+
+def run_match(a, b, games=100, workers=1, size=15, opening_plies=2, seed=0,
+              out=sys.stdout, elo0=0, elo1=10, stop_on_sprt=False):
+    """
+    Plays 'games' games of engine 'a' against engine 'b' and writes one JSON line
+    per finished game to 'out', in completion order. Returns the MatchStats summary.
+    With 'stop_on_sprt' the match ends as soon as the SPRT reaches a verdict.
+    """
+    stats = MatchStats(a, b)
+    jobs = schedule(a, b, games, size, opening_plies, seed)
+
+    def report(record):
+        record["a_color"] = "X" if record["game"] % 2 == 0 else "O" # see schedule()
+        stats.add(record)
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        return stop_on_sprt and stats.summary(elo0, elo1)["sprt"]["verdict"] != "continue"
+
+    if workers <= 1:
+        for job in jobs:
+            if report(play_game(*job)): break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_game, *job) for job in jobs]
+            for future in as_completed(futures):
+                if report(future.result()):
+                    for f in futures: f.cancel()
+                    break
+    return stats.summary(elo0, elo1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless engine-vs-engine Gomoku matches.")
+    parser.add_argument("a", help="first engine (mode, mode@seconds or config:<name>)")
+    parser.add_argument("b", help="second engine")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--opening-plies", type=int, default=2, help="random stones placed before the engines play")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="JSON lines file for the game records (default: stdout)")
+    parser.add_argument("--elo0", type=float, default=0)
+    parser.add_argument("--elo1", type=float, default=10)
+    parser.add_argument("--stop-on-sprt", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with (open(args.out, "w") if args.out else contextlib.nullcontext(sys.stdout)) as out:
+        summary = run_match(args.a, args.b, args.games, args.workers, args.size, args.opening_plies,
+                            args.seed, out, args.elo0, args.elo1, args.stop_on_sprt)
+    summary["seconds"] = round(time.perf_counter() - start, 1)
+    print(json.dumps(summary), file=sys.stderr)
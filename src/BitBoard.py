@@ -0,0 +1,130 @@
+# Bitboard backend for Board - same API, bitwise win / threat detection
+
+from Board import Board
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+def _exact_five_through_center(window):
+    """'window' holds 11 cells of one line, the move in bit 5: is its run exactly 5 long?"""
+    window |= 1 << 5
+    low = 5
+    while low > 0 and window >> (low - 1) & 1: low -= 1
+    high = 5
+    while high < 10 and window >> (high + 1) & 1: high += 1
+    return high - low + 1 == 5
+
+# A run that reaches the edge of the 11-cell window is at least 6 long, so the window suffices
+WIN_TABLE = [_exact_five_through_center(w) for w in range(2048)]
+
+LAYOUTS = {}
+
+def direction_layouts(size):
+    """
+    For every direction, a bit index per cell such that each line of that
+    direction is a contiguous bit range, lines being separated by one
+    always-empty bit. Bits 0..4 are padding, so 'index - 5' is never negative.
+    """
+    if size not in LAYOUTS:
+        layouts = []
+        for dr, dc in DIRECTIONS:
+            index = {}
+            bit = 5
+            for r in range(size):
+                for c in range(size):
+                    if 0 <= r - dr < size and 0 <= c - dc < size: continue # not a line start
+                    x, y = r, c
+                    while 0 <= x < size and 0 <= y < size:
+                        index[(x, y)] = bit
+                        bit += 1
+                        x += dr; y += dc
+                    bit += 1
+            full_mask = 0
+            for b in index.values(): full_mask |= 1 << b
+            layouts.append((index, full_mask))
+        LAYOUTS[size] = layouts
+    return LAYOUTS[size]
+
+class BitBoard(Board):
+    """
+    Board that additionally stores each player's stones as Python big-int
+    bitboards, one per direction layout (rows, columns, diagonals and
+    anti-diagonals each made contiguous). Win detection is a shift, an 11-bit
+    mask and a table lookup per direction; whole-board pattern counts are
+    shift-and-mask operations with a shift of 1 in every layout.
+    The list-of-lists 'board' view is kept in sync by Board, so heuristics,
+    AlphaBeta, Minimax and the GUI use it unchanged.
+    """
+
+    def __init__(self, size=15, radius=1):
+        super().__init__(size, radius)
+        self.layouts = direction_layouts(size)
+        self.bits = {"X": [0, 0, 0, 0], "O": [0, 0, 0, 0]}
+        self.stones = 0
+
+    def make_move(self, row, col):
+        if super().make_move(row, col):
+            layers = self.bits[self.board[row][col]]
+            for i, (index, _) in enumerate(self.layouts):
+                layers[i] |= 1 << index[(row, col)]
+            self.stones += 1
+            return True
+        return False
+
+    def undo_move(self, row, col):
+        if 0 <= row < self.size and 0 <= col < self.size:
+            player = self.board[row][col]
+            if super().undo_move(row, col):
+                layers = self.bits[player]
+                for i, (index, _) in enumerate(self.layouts):
+                    layers[i] &= ~(1 << index[(row, col)])
+                self.stones -= 1
+                return True
+        return False
+
+    # --- Board API ---
+
+    def check_winner(self, x, y, player):
+        # Like Board.check_winner, (x, y) counts as the player's stone
+        layers = self.bits[player]
+        for i, (index, _) in enumerate(self.layouts):
+            if WIN_TABLE[(layers[i] >> (index[(x, y)] - 5)) & 0x7FF]:
+                return True
+        return False
+
+    def is_full(self):
+        return self.stones == self.size * self.size
+
+    # --- Whole-board pattern queries ---
+
+    def _runs(self, b, length):
+        """Bits p such that p .. p + length - 1 are all set in b."""
+        runs = b
+        for k in range(1, length):
+            runs &= b >> k
+        return runs
+
+    def _empty(self, i):
+        return self.layouts[i][1] & ~(self.bits["X"][i] | self.bits["O"][i])
+
+    def has_five(self, player):
+        # A run of 5 with no own stone directly before or after it (6+ is an overline)
+        for b in self.bits[player]:
+            if self._runs(b, 5) & ~(b << 1) & ~(b >> 5):
+                return True
+        return False
+
+    def count_open_fours(self, player):
+        """Occurrences of .PPPP. in all four directions."""
+        total = 0
+        for i, b in enumerate(self.bits[player]):
+            e = self._empty(i)
+            total += (self._runs(b, 4) & (e << 1) & (e >> 4)).bit_count()
+        return total
+
+    def count_open_threes(self, player):
+        """Occurrences of .PPP. in all four directions."""
+        total = 0
+        for i, b in enumerate(self.bits[player]):
+            e = self._empty(i)
+            total += (self._runs(b, 3) & (e << 1) & (e >> 3)).bit_count()
+        return total
@@ -1,54 +1,94 @@
 # Game board and move logic - AI CONTROLLER COMPATIBLE
 
+import random
+from LineIndex import line_index
+
+# Zobrist keys: one random 64-bit number per (cell, player), plus one for the side to move.
+# Tables are generated once per board size from a fixed seed, so hashes are reproducible.
+ZOBRIST_TABLES = {}
+
+def zobrist_table(size):
+    if size not in ZOBRIST_TABLES:
+        rng = random.Random(size)
+        keys = {}
+        for r in range(size):
+            for c in range(size):
+                keys[(r, c, "X")] = rng.getrandbits(64)
+                keys[(r, c, "O")] = rng.getrandbits(64)
+        keys["side"] = rng.getrandbits(64)
+        ZOBRIST_TABLES[size] = keys
+    return ZOBRIST_TABLES[size]
+
+# Per (size, radius): the cells within 'radius' of every cell, and the move ordering key
+NEIGHBOUR_TABLES = {}
+
+def neighbour_table(size, radius):
+    if (size, radius) not in NEIGHBOUR_TABLES:
+        neighbours = {}
+        for r in range(size):
+            for c in range(size):
+                neighbours[(r, c)] = [(r + dr, c + dc)
+                                      for dr in range(-radius, radius + 1)
+                                      for dc in range(-radius, radius + 1)
+                                      if (dr or dc) and 0 <= r + dr < size and 0 <= c + dc < size]
+        center = size // 2
+        rank = {(r, c): (abs(r - center) + abs(c - center), r, c) for r in range(size) for c in range(size)}
+        NEIGHBOUR_TABLES[(size, radius)] = (neighbours, rank)
+    return NEIGHBOUR_TABLES[(size, radius)]
+
 class Board:
-    def __init__(self, size=15):
+    def __init__(self, size=15, radius=1):
         self.size = size
+        self.radius = radius # 1 (direct neighbours, fastest) or 2
         self.board = [["." for _ in range(size)] for _ in range(size)]
         self.current_player = "X"
         self.last_move = None
+        self.listeners = [] # e.g. IncrementalEvaluator, notified after every grid change
+        self.zobrist = zobrist_table(size)
+        self.hash = 0 # Zobrist hash of (grid, side to move), updated incrementally
+        self.move_history = []
+        # Candidate moves: empty cells with at least one stone within 'radius'
+        self.neighbours, self.move_rank = neighbour_table(size, radius)
+        self.stone_count = [[0] * size for _ in range(size)] # stones within 'radius' of each cell
+        self.frontier = set()
+        self.line_index = line_index(size) # rows, columns and diagonals, for check_winner
+
+    def copy(self):
+        """Independent board (same class, size, radius) with the same moves played. Listeners are not copied."""
+        board = type(self)(self.size, self.radius)
+        for r, c in self.move_history:
+            board.make_move(r, c)
+        return board
 
     def get_possible_moves(self):
         """
         Returns candidate moves sorted by potential (Center moves first).
-        Radius 1 (Direct neighbors) is used for maximum speed at Depth 4.
+        Candidates are the empty cells within 'radius' of a stone, kept up to date
+        by make_move/undo_move, so this costs about the size of the frontier.
         """
-        if not self.last_move:
+        if not self.move_history:
             center = self.size // 2
             return [(center, center)]
         
-        # 1. Get all pieces
-        occupied = []
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.board[r][c] != ".":
-                    occupied.append((r, c))
-        
-        # 2. Find neighbors (Radius 1 for speed)
-        possible = set()
-        radius = 1 
-        for r, c in occupied:
-            for dr in range(-radius, radius + 1):
-                for dc in range(-radius, radius + 1):
-                    if dr == 0 and dc == 0: continue
-                    
-                    nr, nc = r + dr, c + dc
-                    
-                    if 0 <= nr < self.size and 0 <= nc < self.size:
-                        if self.board[nr][nc] == ".":
-                            possible.add((nr, nc))
-                            
-        # 3. Sort by distance to center (Crucial for Alpha-Beta pruning efficiency)
-        center = self.size // 2
-        sorted_moves = sorted(list(possible), key=lambda m: abs(m[0]-center) + abs(m[1]-center))
-        
-        return sorted_moves
+        # Sort by distance to center (Crucial for Alpha-Beta pruning efficiency)
+        return sorted(self.frontier, key=self.move_rank.__getitem__)
 
     def make_move(self, row, col):
         if 0 <= row < self.size and 0 <= col < self.size:
             if self.board[row][col] == '.':
                 self.board[row][col] = self.current_player
+                self.hash ^= self.zobrist[(row, col, self.current_player)] ^ self.zobrist["side"]
                 self.last_move = (row, col)
+                self.move_history.append((row, col))
                 self.current_player = "O" if self.current_player == "X" else "X"
+                self.frontier.discard((row, col))
+                for cell in self.neighbours[(row, col)]:
+                    r, c = cell
+                    self.stone_count[r][c] += 1
+                    if self.board[r][c] == '.':
+                        self.frontier.add(cell)
+                for listener in self.listeners:
+                    listener.update(row, col)
                 return True
         return False
 
@@ -56,9 +96,22 @@ class Board:
         if 0 <= row < self.size and 0 <= col < self.size:
             if self.board[row][col] != '.':
                 self.current_player = "O" if self.current_player == "X" else "X"
+                self.hash ^= self.zobrist[(row, col, self.board[row][col])] ^ self.zobrist["side"]
                 self.board[row][col] = '.'
-                # Note: last_move is not strictly reverted for efficiency in search, 
-                # but grid/player state is correct.
+                if self.move_history and self.move_history[-1] == (row, col):
+                    self.move_history.pop()
+                else:
+                    self.move_history.remove((row, col))
+                self.last_move = self.move_history[-1] if self.move_history else None
+                for cell in self.neighbours[(row, col)]:
+                    r, c = cell
+                    self.stone_count[r][c] -= 1
+                    if self.stone_count[r][c] == 0:
+                        self.frontier.discard(cell)
+                if self.stone_count[row][col]:
+                    self.frontier.add((row, col))
+                for listener in self.listeners:
+                    listener.update(row, col)
                 return True
         return False
 
@@ -88,19 +141,23 @@ class Board:
         return count
 
     def check_winner(self, x, y, player):
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        for dx, dy in directions:
-            count = 1 
-            count += self.count_in_direction(x, y, dx, dy, player)
-            count += self.count_in_direction(x, y, -dx, -dy, player)
-            
+        # Walk the (at most 4) lines through (x, y) from the precomputed index
+        grid = self.board
+        lines = self.line_index.lines
+        for idx, offset in self.line_index.slots[(x, y)]:
+            cells = lines[idx]
+            end = offset + 1
+            while end < len(cells) and grid[cells[end][0]][cells[end][1]] == player:
+                end += 1
+            start = offset - 1
+            while start >= 0 and grid[cells[start][0]][cells[start][1]] == player:
+                start -= 1
+
             # RULE IMPLEMENTATION: Exact 5 stones wins. 6+ (Overline) does NOT win.
-            if count == 5:
+            if end - start - 1 == 5:
                 return True
         return False
 
     def is_full(self):
-        for row in self.board:
-            if '.' in row:
-                return False
-        return True
+        # Every stone is in the history, so no need to scan the grid
+        return len(self.move_history) == self.size * self.size
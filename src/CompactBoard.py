@@ -0,0 +1,203 @@
+# Compact board: the grid in one bytearray, __slots__, cheap copy() and a small binary form
+
+from Board import Board, zobrist_table, neighbour_table
+from LineIndex import line_index
+
+EMPTY = ord(".")
+CODES = {"X": ord("X"), "O": ord("O")}
+
+# Binary form: size, radius, format, then the moves in order (1 byte each, 2 above 16x16)
+# or, for long games, the last move and the grid at 2 bits per cell
+HISTORY, GRID = 0, 1
+MAX_HISTORY_BYTES = 99
+NO_MOVE = 255
+
+class CompactBoard:
+    """
+    Board with the same API (make_move, undo_move, get_possible_moves, is_terminal,
+    check_winner, is_full, hash, frontier, move_history, listeners), but the grid
+    is a bytearray of ASCII cells ('.', 'X', 'O'), row-major, in a __slots__ class.
+    - copy() copies a few flat buffers instead of replaying the game.
+    - to_bytes() / from_bytes(): under 100 bytes for boards up to 19x19; pickle uses it.
+    - board: list-of-lists view for heuristics that index board.board[r][c], built on
+      first use and then kept in sync by make_move / undo_move. Writes into it (the
+      ThreatSearch probes) must be undone before the next move, as with Board.
+    """
+
+    __slots__ = ("size", "radius", "cells", "current_player", "last_move", "listeners", "zobrist", "hash",
+                 "move_history", "neighbours", "move_rank", "stone_count", "frontier", "line_index", "_grid")
+
+    def __init__(self, size=15, radius=1):
+        self.size = size
+        self.radius = radius
+        self.cells = bytearray([EMPTY]) * (size * size)
+        self.current_player = "X"
+        self.last_move = None
+        self.listeners = []
+        self.zobrist = zobrist_table(size)
+        self.hash = 0
+        self.move_history = []
+        self.neighbours, self.move_rank = neighbour_table(size, radius)
+        self.stone_count = bytearray(size * size) # stones within 'radius' of each cell
+        self.frontier = set()
+        self.line_index = line_index(size)
+        self._grid = None
+
+    @property
+    def board(self):
+        if self._grid is None:
+            n = self.size
+            self._grid = [list(self.cells[r * n:(r + 1) * n].decode()) for r in range(n)]
+        return self._grid
+
+    def copy(self):
+        """Independent board with the same position and history. Listeners are not copied."""
+        board = object.__new__(type(self))
+        board.size, board.radius = self.size, self.radius
+        board.cells = self.cells[:]
+        board.current_player, board.last_move, board.hash = self.current_player, self.last_move, self.hash
+        board.listeners = []
+        board.zobrist, board.neighbours, board.move_rank = self.zobrist, self.neighbours, self.move_rank
+        board.move_history = self.move_history[:]
+        board.stone_count = self.stone_count[:]
+        board.frontier = set(self.frontier)
+        board.line_index = self.line_index
+        board._grid = None
+        return board
+
+    def get_possible_moves(self):
+        """Candidate moves (empty cells within 'radius' of a stone), centre first, like Board."""
+        if not self.move_history:
+            center = self.size // 2
+            return [(center, center)]
+        return sorted(self.frontier, key=self.move_rank.__getitem__)
+
+    def make_move(self, row, col):
+        n = self.size
+        if not (0 <= row < n and 0 <= col < n) or self.cells[row * n + col] != EMPTY: return False
+        player = self.current_player
+        self.cells[row * n + col] = CODES[player]
+        if self._grid is not None: self._grid[row][col] = player
+        self.hash ^= self.zobrist[(row, col, player)] ^ self.zobrist["side"]
+        self.last_move = (row, col)
+        self.move_history.append((row, col))
+        self.current_player = "O" if player == "X" else "X"
+        self.frontier.discard((row, col))
+        cells, counts = self.cells, self.stone_count
+        for cell in self.neighbours[(row, col)]:
+            i = cell[0] * n + cell[1]
+            counts[i] += 1
+            if cells[i] == EMPTY: self.frontier.add(cell)
+        for listener in self.listeners:
+            listener.update(row, col)
+        return True
+
+    def undo_move(self, row, col):
+        n = self.size
+        if not (0 <= row < n and 0 <= col < n) or self.cells[row * n + col] == EMPTY: return False
+        player = chr(self.cells[row * n + col])
+        self.current_player = "O" if self.current_player == "X" else "X"
+        self.hash ^= self.zobrist[(row, col, player)] ^ self.zobrist["side"]
+        self.cells[row * n + col] = EMPTY
+        if self._grid is not None: self._grid[row][col] = "."
+        if self.move_history and self.move_history[-1] == (row, col): self.move_history.pop()
+        else: self.move_history.remove((row, col))
+        self.last_move = self.move_history[-1] if self.move_history else None
+        counts = self.stone_count
+        for cell in self.neighbours[(row, col)]:
+            i = cell[0] * n + cell[1]
+            counts[i] -= 1
+            if counts[i] == 0: self.frontier.discard(cell)
+        if counts[row * n + col]: self.frontier.add((row, col))
+        for listener in self.listeners:
+            listener.update(row, col)
+        return True
+
+    def is_terminal(self):
+        if not self.last_move: return False
+        prev_player = "O" if self.current_player == "X" else "X"
+        return self.check_winner(*self.last_move, prev_player) or self.is_full()
+
+    def count_in_direction(self, x, y, dx, dy, player):
+        n, cells, code = self.size, self.cells, CODES[player]
+        count = 0
+        x += dx; y += dy
+        while 0 <= x < n and 0 <= y < n and cells[x * n + y] == code:
+            count += 1
+            x += dx; y += dy
+        return count
+
+    def check_winner(self, x, y, player):
+        # Exact five through (x, y), walking its lines' flat positions; an overline does not win
+        cells, code = self.cells, CODES[player]
+        positions = self.line_index.positions
+        for idx, offset in self.line_index.slots[(x, y)]:
+            line = positions[idx]
+            end = offset + 1
+            while end < len(line) and cells[line[end]] == code: end += 1
+            start = offset - 1
+            while start >= 0 and cells[line[start]] == code: start -= 1
+            if end - start - 1 == 5: return True
+        return False
+
+    def is_full(self):
+        return len(self.move_history) == self.size * self.size
+
+    # --- Conversions ---
+
+    @classmethod
+    def from_board(cls, board):
+        compact = cls(board.size, board.radius)
+        for r, c in board.move_history:
+            compact.make_move(r, c)
+        return compact
+
+    def to_board(self, board_class=Board):
+        board = board_class(self.size, self.radius)
+        for r, c in self.move_history:
+            board.make_move(r, c)
+        return board
+
+    def to_bytes(self, keep_order=False):
+        """The position in a few bytes; 'keep_order' always keeps the move order (longer for long games)."""
+        n = self.size
+        wide = n * n > 256
+        if keep_order or 3 + len(self.move_history) * (2 if wide else 1) <= MAX_HISTORY_BYTES:
+            data = bytearray((n, self.radius, HISTORY))
+            for r, c in self.move_history:
+                data += (r * n + c).to_bytes(2 if wide else 1, "big")
+            return bytes(data)
+        # Long game: the last move and 2 bits per cell; the earlier move order is not kept
+        data = bytearray((n, self.radius, GRID))
+        data += bytes(self.last_move) if self.last_move else bytes((NO_MOVE, NO_MOVE))
+        packed = 0
+        for i, cell in enumerate(self.cells):
+            packed |= (0 if cell == EMPTY else 1 if cell == CODES["X"] else 2) << (2 * i)
+        return bytes(data) + packed.to_bytes((n * n + 3) // 4, "little")
+
+    @classmethod
+    def from_bytes(cls, data):
+        n, radius, kind = data[0], data[1], data[2]
+        board = cls(n, radius)
+        if kind == HISTORY:
+            width = 2 if n * n > 256 else 1
+            for i in range(3, len(data), width):
+                board.make_move(*divmod(int.from_bytes(data[i:i + width], "big"), n))
+            return board
+        last = None if data[3] == NO_MOVE else (data[3], data[4])
+        packed = int.from_bytes(data[5:], "little")
+        colours = {}
+        for i in range(n * n):
+            code = packed >> (2 * i) & 3
+            if code: colours[divmod(i, n)] = "X" if code == 1 else "O"
+        # The earlier order is unknown: row-major, then the last move
+        order = [cell for cell in colours if cell != last] + ([last] if last is not None else [])
+        for cell in order:
+            board.current_player = colours[cell]
+            board.make_move(*cell)
+        x_stones = sum(colour == "X" for colour in colours.values())
+        board.current_player = "X" if x_stones == len(colours) - x_stones else "O"
+        return board
+
+    def __reduce__(self):
+        return type(self).from_bytes, (self.to_bytes(),)
@@ -0,0 +1,143 @@
+# Engine service: non-blocking (async) searches on top of AIController, with cancellation and pondering
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from AIController import AIController
+from AlphaBeta import SearchCancelled
+
+class EngineService:
+    """
+    Runs AIController searches on one background thread, always on a copy of
+    the board, so the caller's board is never touched.
+    - await search(board, mode): the move as (move, elapsed, nodes), like select_best_move.
+      Cancelling the awaiting task (or calling cancel()) stops the search, or the
+      threat solver before it, at its next node check (stop_event) and raises CancelledError.
+    - ponder(board, mode): after the engine's move has been played, predicts the
+      opponent's reply (best move stored in the transposition table) and searches
+      the answer to it in the background. If the opponent plays that reply, the
+      next search() returns the pondered result (waiting for it if needed);
+      otherwise the ponder search is cancelled.
+    - submit(board, mode): search() for synchronous code such as the GUI; returns
+      a concurrent.futures.Future.
+    """
+
+    def __init__(self, controller=None, ponder=True):
+        self.controller = controller if controller is not None else AIController()
+        self.ponder_enabled = ponder
+        self.executor = ThreadPoolExecutor(max_workers=1) # the controller is not thread-safe
+        self.stop_events = set()  # one per queued or running search
+        self.pondering = None     # (history, mode, time_limit, future)
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.loop = None          # private event loop for submit(), started on first use
+        self.loop_thread = None
+
+    def _bots(self):
+        return {"AlphaBeta_H2": self.controller.medium_bot, "AlphaBeta_Combined": self.controller.hard_bot}
+
+    def _run(self, board, mode, time_limit, stop_event):
+        # Executor thread: one search at a time
+        if stop_event.is_set(): raise SearchCancelled()
+        searches = list(self._bots().values()) + [self.controller.threat_search]
+        for search in searches:
+            search.stop_event = stop_event
+        try:
+            return self.controller.select_best_move(board, mode, time_limit)
+        finally:
+            for search in searches:
+                search.stop_event = None
+            self.stop_events.discard(stop_event)
+
+    def _start(self, board, mode, time_limit):
+        stop_event = threading.Event()
+        self.stop_events.add(stop_event)
+        future = self.executor.submit(self._run, board, mode, time_limit, stop_event)
+        future.stop_event = stop_event
+        return future
+
+    def _take_ponder(self, board, mode, time_limit):
+        """The pondered search if it was for this exact position and settings; otherwise cancels it."""
+        if self.pondering is None: return None
+        history, ponder_mode, ponder_limit, future = self.pondering
+        if history == tuple(board.move_history) and (ponder_mode, ponder_limit) == (mode, time_limit):
+            self.pondering = None
+            self.ponder_hits += 1
+            return future
+        self.ponder_misses += 1
+        self._cancel_ponder()
+        return None
+
+    def _cancel_ponder(self):
+        if self.pondering is not None:
+            self.pondering[3].stop_event.set()
+            self.pondering = None
+
+    async def search(self, board, mode, time_limit=None):
+        future = self._take_ponder(board, mode, time_limit)
+        if future is None: future = self._start(board.copy(), mode, time_limit)
+        try:
+            return await asyncio.wrap_future(future)
+        except SearchCancelled:
+            raise asyncio.CancelledError()
+        except asyncio.CancelledError:
+            future.stop_event.set()
+            raise
+
+    def ponder(self, board, mode, time_limit=None):
+        """Starts searching the reply to the opponent's predicted move. Returns the prediction or None."""
+        if not self.ponder_enabled or board.is_terminal(): return None
+        self._cancel_ponder()
+        bot = self._bots().get(mode)
+        tt = bot.transposition_table if bot is not None else None
+        if tt is None: return None
+        # Read without waiting for a cancelled search to unwind: entries are immutable tuples
+        # and peek() leaves the hit counters (owned by the executor thread) alone
+        entry = tt.peek(board.hash)
+        predicted = entry[4] if entry is not None else None
+        if predicted is None or board.board[predicted[0]][predicted[1]] != ".": return None
+        child = board.copy()
+        child.make_move(*predicted)
+        if child.is_terminal(): return None
+        future = self._start(child, mode, time_limit)
+        self.pondering = (tuple(child.move_history), mode, time_limit, future)
+        return predicted
+
+    def cancel(self):
+        """Stops the running search and any pondering; their awaiters get CancelledError."""
+        self._cancel_ponder()
+        for stop_event in list(self.stop_events):
+            stop_event.set()
+
+    # --- Synchronous callers ---
+
+    def _event_loop(self):
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+            self.loop_thread.start()
+        return self.loop
+
+    def submit(self, board, mode, time_limit=None):
+        """Thread-safe search(); returns a concurrent.futures.Future of (move, elapsed, nodes)."""
+        return asyncio.run_coroutine_threadsafe(self.search(board.copy(), mode, time_limit), self._event_loop())
+
+    def close(self, wait=True):
+        """
+        Cancels everything and shuts the service down. With wait=False (e.g. from a GUI
+        thread) it returns at once; the search still unwinding finishes in the background.
+        """
+        self.cancel()
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+        if self.loop is not None:
+            loop, loop_thread = self.loop, self.loop_thread
+            self.loop = self.loop_thread = None
+            if wait: self._stop_loop(loop, loop_thread)
+            else: threading.Thread(target=self._stop_loop, args=(loop, loop_thread), daemon=True).start()
+
+    def _stop_loop(self, loop, loop_thread):
+        # After the last search, so its awaiter still gets its CancelledError on the loop
+        self.executor.shutdown(wait=True)
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
@@ -0,0 +1,124 @@
+# Evaluation cache: heuristic scores by position hash, kept across searches, games and processes
+
+import hashlib
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+
+# Approximate memory per in-memory entry: key tuple, 64-bit int, score and the dict/list slots
+ENTRY_BYTES = sys.getsizeof((0, "X")) + sys.getsizeof(2 ** 63) + sys.getsizeof(0.0) + 100
+
+DEFAULT_CACHE_BYTES = 16 << 20
+
+def fingerprint(*parts):
+    """Short digest of everything a score depends on (pattern table, weights, mode...)."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+def _signed(key):
+    # SQLite integers are signed 64-bit
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+class EvalCache:
+    """
+    Two tiers, both keyed by (Zobrist hash, player):
+    - an LRU dictionary limited to 'max_bytes' (approximate, ENTRY_BYTES per entry)
+    - optionally a SQLite file at 'path' in WAL mode, so several processes can
+      read it while one writes. New scores are written in batches of 'flush_every'.
+      With read_disk=False the file is only written: a SELECT (~5 us) costs more
+      than an incremental evaluation (< 1 us), but far less than a NumPy one.
+    Every row carries the 'version' fingerprint; rows of another version are never
+    returned, so changing PATTERN_SCORES or a weight invalidates the old scores.
+    """
+
+    def __init__(self, version, path=None, max_bytes=DEFAULT_CACHE_BYTES, flush_every=1000, read_disk=True):
+        self.version = version
+        self.path = path
+        self.read_disk = read_disk
+        self.max_entries = max(1, max_bytes // ENTRY_BYTES)
+        self.flush_every = flush_every
+        self.memory = OrderedDict()
+        self.pending = []
+        self.connection = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # A connection cannot cross processes: each process opens its own (and starts with an empty LRU)
+        self.flush()
+        state = self.__dict__.copy()
+        state["connection"] = None
+        state["pending"] = []
+        state["memory"] = OrderedDict()
+        return state
+
+    def _connect(self):
+        if self.connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS evals (version TEXT, key INTEGER, player TEXT, score REAL, "
+                "PRIMARY KEY (version, key, player)) WITHOUT ROWID")
+        return self.connection
+
+    def get(self, key, player):
+        """Cached score or None."""
+        entry = (key, player)
+        score = self.memory.get(entry)
+        if score is not None:
+            self.memory.move_to_end(entry)
+            self.memory_hits += 1
+            return score
+        if self.path is not None and self.read_disk:
+            row = self._connect().execute(
+                "SELECT score FROM evals WHERE version = ? AND key = ? AND player = ?",
+                (self.version, _signed(key), player)).fetchone()
+            if row is not None:
+                score = row[0]
+                if score.is_integer(): score = int(score) # REAL column; keep int scores int
+                self._remember(entry, score)
+                self.disk_hits += 1
+                return score
+        self.misses += 1
+        return None
+
+    def put(self, key, player, score):
+        self._remember((key, player), score)
+        if self.path is not None:
+            self.pending.append((self.version, _signed(key), player, score))
+            if len(self.pending) >= self.flush_every: self.flush()
+
+    def _remember(self, entry, score):
+        self.memory[entry] = score
+        if len(self.memory) > self.max_entries: self.memory.popitem(last=False)
+
+    def flush(self):
+        """Writes the pending scores to disk in one transaction."""
+        if self.pending:
+            with self._connect() as connection:
+                connection.executemany("INSERT OR IGNORE INTO evals VALUES (?, ?, ?, ?)", self.pending)
+            self.pending = []
+
+    def purge(self):
+        """Deletes the rows of other versions from the file (they are never read anyway)."""
+        if self.path is not None:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM evals WHERE version != ?", (self.version,))
+
+    def close(self):
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self.memory),
+        }
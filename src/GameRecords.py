@@ -0,0 +1,277 @@
+# Game records: streaming readers for game archives and a bulk position annotator
+#
+# Formats (read line by line, so files of any size stream; ".gz" files are decompressed on the fly):
+#   moves    one game per line, moves separated by spaces or semicolons:
+#            "7,7 8,8 ..." (0-based row,col) or "h8 i9 ..." (Renju notation, see below).
+#            A line may also be a JSON list of [r, c] pairs or an Arena.py game record.
+#   gomocup  Gomocup .psq: a "Piskvorky 20x20, ..." header, then one "x,y[,time]" line per
+#            move (1-based column, row); any other line ends the game.
+#   renju    Renju-style text: optional [Tag "value"] headers ([Size "15"]), then the moves,
+#            move numbers allowed ("1. h8 i9 2. j10 ..."); a blank line or a new header
+#            block ends the game. RIF <move>h8 i9 ...</move> elements are read the same way.
+# Renju notation: the letter is the column (a = 0), the number the row counted from the bottom.
+#
+#   python GameRecords.py games.txt --format moves --engine AlphaBeta_Combined --workers 4 --out annotated.jsonl
+#
+# Every position of every game (after replaying it with Board.make_move) is written as
+# one JSON line, in input order, as soon as its chunk is done:
+#   {"game": "games.txt:12", "ply": 5, "size": 15, "to_move": "O", "hash": "...",
+#    "best_move": [r, c], "score": s, "threat": null, "book": false, "nodes": n, "time": s}
+# 'score' is the search score from the side to move's point of view, null when no search
+# ran (book move or threat solver; 'threat' then names the threat: win, block, vcf, vct).
+
+import argparse
+import contextlib
+import gzip
+import json
+import logging
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from Board import Board
+from OpeningBook import canonical_key
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("moves", "gomocup", "renju")
+DEDUPE = ("hash", "symmetric", "none")
+
+RENJU_MOVE = re.compile(r"^([a-z])(\d{1,2})$")
+PAIR_MOVE = re.compile(r"^(\d+),(\d+)$")
+GOMOCUP_HEADER = re.compile(r"^Piskvorky (\d+)x(\d+)")
+GOMOCUP_MOVE = re.compile(r"^(\d+),(\d+)(,-?\d+)?$")
+RENJU_TAG = re.compile(r'^\[(\w+) "([^"]*)"\]$')
+MOVE_NUMBER = re.compile(r"^\d+\.+$")
+RIF_MOVES = re.compile(r"<move>([^<]*)</move>")
+
+class RecordError(ValueError):
+    """A game record that cannot be read."""
+
+# --- Readers ---
+
+def parse_move(token, size):
+    """(row, col) of one move token: "r,c" (0-based) or Renju notation such as "h8"."""
+    match = PAIR_MOVE.match(token)
+    if match: return int(match.group(1)), int(match.group(2))
+    match = RENJU_MOVE.match(token.lower())
+    if match: return size - int(match.group(2)), ord(match.group(1)) - ord("a")
+    raise RecordError(f"Unknown move: {token!r}")
+
+def read_move_lines(lines, source, size):
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"): continue
+        game_id = f"{source}:{number}"
+        try:
+            if line[0] in "[{":
+                record = json.loads(line)
+                if isinstance(record, dict): # an Arena.py game record
+                    game_size = record.get("size", size)
+                    moves = [tuple(m) for m in record.get("opening", []) + record.get("moves", [])]
+                else:
+                    game_size, moves = size, [tuple(m) for m in record]
+            else:
+                game_size = size
+                moves = [parse_move(token, size) for token in re.split(r"[\s;]+", line) if token]
+        except (RecordError, ValueError, TypeError) as e:
+            logger.warning("Skipping %s: %s", game_id, e)
+            continue
+        yield game_id, game_size, moves
+
+def read_gomocup(lines, source, size):
+    game_id, game_size, moves = None, size, []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        header = GOMOCUP_HEADER.match(line)
+        move = GOMOCUP_MOVE.match(line)
+        if move and game_id is not None:
+            moves.append((int(move.group(2)) - 1, int(move.group(1)) - 1))
+            continue
+        if game_id is not None and moves: yield game_id, game_size, moves
+        game_id, moves = None, []
+        if header: game_id, game_size = f"{source}:{number}", int(header.group(1))
+    if game_id is not None and moves: yield game_id, game_size, moves
+
+def read_renju(lines, source, size):
+    game_id, game_size, tokens = None, size, []
+    def finish():
+        try:
+            return game_id, game_size, [parse_move(token, game_size) for token in tokens]
+        except RecordError as e:
+            logger.warning("Skipping %s: %s", game_id, e)
+            return None
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        tag = RENJU_TAG.match(line)
+        rif = RIF_MOVES.findall(line)
+        if tag or rif or not line:
+            if tokens:
+                game = finish()
+                if game is not None: yield game
+                game_id, game_size, tokens = None, size, []
+            if tag and tag.group(1).lower() == "size": game_size = int(tag.group(2))
+            if tag and game_id is None: game_id = f"{source}:{number}"
+            if rif: # one element per game
+                for moves in rif:
+                    game_id, tokens = f"{source}:{number}", moves.split()
+                    game = finish()
+                    if game is not None: yield game
+                game_id, tokens = None, []
+            continue
+        if game_id is None: game_id = f"{source}:{number}"
+        tokens.extend(token for token in line.split() if not MOVE_NUMBER.match(token))
+    if tokens:
+        game = finish()
+        if game is not None: yield game
+
+READERS = {"moves": read_move_lines, "gomocup": read_gomocup, "renju": read_renju}
+
+def read_games(paths, fmt="moves", size=15):
+    """Yields (game_id, size, moves) for every game of the files, one line in memory at a time."""
+    if fmt not in READERS: raise ValueError(f"Unknown record format: {fmt}")
+    for path in paths:
+        if path == "-":
+            yield from READERS[fmt](sys.stdin, "stdin", size)
+            continue
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            yield from READERS[fmt](f, path, size)
+
+# --- Positions ---
+
+def positions(games, dedupe="hash", min_ply=0, max_ply=None, counts=None):
+    """
+    Replays every game with Board.make_move and yields (game_id, ply, size, moves)
+    for each non-terminal position, 'moves' being the history up to it.
+    dedupe: "hash" skips positions already seen (Zobrist hash, side to move included),
+    "symmetric" also skips their rotations and mirrors (OpeningBook.canonical_key),
+    "none" keeps everything. The set of seen keys is the only state that grows with the input.
+    A game stops at its first illegal move. 'counts' (a dict) receives the totals.
+    """
+    if dedupe not in DEDUPE: raise ValueError(f"Unknown dedupe mode: {dedupe}")
+    counts = counts if counts is not None else {}
+    for key in ("games", "positions", "duplicates", "illegal"): counts.setdefault(key, 0)
+    seen = {} # size -> keys
+    for game_id, size, moves in games:
+        counts["games"] += 1
+        board = Board(size=size)
+        keys = seen.setdefault(size, set())
+        for ply in range(len(moves) + 1):
+            if max_ply is not None and ply > max_ply: break
+            if ply > 0:
+                try: legal = board.make_move(*moves[ply - 1])
+                except (TypeError, ValueError): legal = False
+                if not legal:
+                    counts["illegal"] += 1
+                    logger.warning("%s: illegal move %s at ply %d", game_id, moves[ply - 1], ply)
+                    break
+            if board.is_terminal(): break
+            if ply < min_ply: continue
+            if dedupe != "none":
+                key = canonical_key(board)[0] if dedupe == "symmetric" else board.hash
+                if key in keys:
+                    counts["duplicates"] += 1
+                    continue
+                keys.add(key)
+            counts["positions"] += 1
+            yield game_id, ply, size, tuple(board.move_history)
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+# --- Evaluation ---
+
+# The annotating engine of the current (worker) process, created once by _init_annotator
+_annotator = {}
+
+def _init_annotator(spec):
+    from Arena import make_engine
+    _annotator["engine"] = make_engine(spec)
+
+def annotate(engine, board):
+    """The engine's move and evaluation of one position, as a dict."""
+    move, nodes = engine.play(board)
+    result = {"best_move": list(move) if move else None, "score": None, "threat": None, "book": False, "nodes": nodes}
+    controller = getattr(engine, "controller", None)
+    if controller is not None:
+        stats = controller.last_stats
+        result["threat"], result["book"] = stats.get("threat"), stats.get("book", False)
+        bot = {"AlphaBeta_H2": controller.medium_bot, "AlphaBeta_Combined": controller.hard_bot}.get(engine.mode)
+        if bot is not None and "depth_reached" in stats: result["score"] = bot.last_score
+    else:
+        result["score"] = getattr(engine.bot, "last_score", None)
+    return result
+
+def _annotate_chunk(chunk):
+    engine = _annotator["engine"]
+    results = []
+    for game_id, ply, size, moves in chunk:
+        board = Board(size=size)
+        for r, c in moves:
+            board.make_move(r, c)
+        start = time.perf_counter()
+        result = annotate(engine, board)
+        results.append({"game": game_id, "ply": ply, "size": size, "to_move": board.current_player,
+                        "hash": f"{board.hash:016x}", **result, "time": round(time.perf_counter() - start, 4)})
+    return results
+
+def run_pipeline(games, engine="AlphaBeta_Combined", workers=1, out=sys.stdout, dedupe="hash",
+                 min_ply=0, max_ply=None, chunk_size=16):
+    """
+    Annotates every position of 'games' (see read_games) with 'engine' (an Arena.py
+    engine spec) and writes one JSON line per position to 'out', in input order.
+    At most 4 chunks per worker are queued, so memory does not grow with the input.
+    Returns the counts (games, positions, duplicates, illegal, seconds).
+    """
+    counts = {}
+    start = time.perf_counter()
+    chunks = chunked(positions(games, dedupe, min_ply, max_ply, counts), chunk_size)
+
+    def write(results):
+        for record in results:
+            out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    if workers <= 1:
+        _init_annotator(engine)
+        for chunk in chunks:
+            write(_annotate_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_annotator, initargs=(engine,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_annotate_chunk, chunk))
+                if len(pending) >= 4 * workers: write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    counts["seconds"] = round(time.perf_counter() - start, 2)
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Annotate every position of archived Gomoku games.")
+    parser.add_argument("paths", nargs="+", help="game record files ('-' for stdin, .gz allowed)")
+    parser.add_argument("--format", choices=FORMATS, default="moves")
+    parser.add_argument("--size", type=int, default=15, help="board size when the records do not give one")
+    parser.add_argument("--engine", default="AlphaBeta_Combined", help="mode, mode@seconds or config:<name> (see Arena.py)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--dedupe", choices=DEDUPE, default="hash")
+    parser.add_argument("--min-ply", type=int, default=0)
+    parser.add_argument("--max-ply", type=int)
+    parser.add_argument("--chunk-size", type=int, default=16, help="positions per worker task")
+    parser.add_argument("--out", help="JSON lines output file (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    games = read_games(args.paths, args.format, args.size)
+    with (open(args.out, "w") if args.out else contextlib.nullcontext(sys.stdout)) as out:
+        counts = run_pipeline(games, args.engine, args.workers, out, args.dedupe,
+                              args.min_ply, args.max_ply, args.chunk_size)
+    print(json.dumps(counts), file=sys.stderr)
@@ -1,10 +1,13 @@
 # GomokuGUI
 
+import logging
 import pygame
 import sys
-import threading 
 from Board import Board
 from AIController import AIController
+from EngineService import EngineService
+
+logger = logging.getLogger(__name__)
 
 # --- CONFIGURATION ---
 WIDTH = 600
@@ -43,6 +46,8 @@ class GomokuGUI:
         self.winner_text = ""
         self.winner_color = BLACK
         self.ai_thinking = False 
+        self.engine = None    # EngineService: searches in the background, cancellable
+        self.ai_future = None # pending AI move
 
     def init_game(self):
         try:
@@ -53,6 +58,8 @@ class GomokuGUI:
         self.cell_size = WIDTH // (self.cols + 1)
         self.board = Board(size=size)
         self.ai = AIController(depth_limit=2) 
+        self.stop_ai()
+        self.engine = EngineService(self.ai)
         self.game_over = False
         self.winner_text = ""
         self.ai_thinking = False 
@@ -110,8 +117,36 @@ class GomokuGUI:
             
         return back_rect
 
-    def ai_play_thread(self):
-        move, elapsed_time, nodes_count = self.ai.select_best_move(self.board, self.selected_mode)
+    def start_ai_turn(self):
+        self.ai_thinking = True
+        self.ai_future = self.engine.submit(self.board, self.selected_mode)
+
+    def stop_ai(self):
+        """Cancels the AI search (and pondering) of the current game, if any."""
+        self.ai_future = None
+        self.ai_thinking = False
+        if self.engine is not None:
+            self.engine.close(wait=False) # never block the GUI on a search that is unwinding
+            self.engine = None
+
+    def poll_ai(self):
+        # Called every frame: applies the AI move once its search has finished
+        if self.ai_future is None or not self.ai_future.done(): return
+        future, self.ai_future = self.ai_future, None
+        if future.cancelled(): return
+        try:
+            result = future.result()
+        except Exception:
+            # A failed search must not kill the GUI loop: end the game, the menu still works
+            logger.exception("AI search failed (%s)", self.selected_mode)
+            self.ai_thinking = False
+            self.game_over = True
+            self.winner_text = "AI ERROR"
+            self.winner_color = RED
+            return
+        self.ai_play(*result)
+
+    def ai_play(self, move, elapsed_time, nodes_count):
         print("-" * 30)
         print(f"AI Search Finished ({self.selected_mode})")
         print(f"Time Taken: {elapsed_time:.3f} seconds") 
@@ -138,6 +173,8 @@ class GomokuGUI:
             self.winner_color = BLACK
             
         self.ai_thinking = False
+        # Think on the human's time about the reply we expect
+        if not self.game_over: self.engine.ponder(self.board, self.selected_mode)
 
     def start_menu(self):
         screen.fill(BOARD_COLOR)
@@ -199,6 +236,7 @@ class GomokuGUI:
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.stop_ai()
                     pygame.quit(); sys.exit()
 
                 if self.current_page == "Start":
@@ -220,7 +258,8 @@ class GomokuGUI:
                     if event.type == pygame.MOUSEBUTTONDOWN:
                         back_btn = self.draw_grid() 
                         if back_btn.collidepoint(event.pos):
-                            self.current_page = "Start"; self.board = None; self.selected_mode = None; self.ai_thinking = False; continue 
+                            self.stop_ai()
+                            self.current_page = "Start"; self.board = None; self.selected_mode = None; continue 
 
                         if not self.game_over and not self.ai_thinking:
                             if self.board.current_player == "X":
@@ -243,9 +282,9 @@ class GomokuGUI:
                                             self.winner_color = BLACK
                                             
                                         if not self.game_over:
-                                            self.ai_thinking = True 
-                                            ai_thread = threading.Thread(target=self.ai_play_thread)
-                                            ai_thread.start()
-            if self.current_page == "Game": self.draw_grid()
+                                            self.start_ai_turn()
+            if self.current_page == "Game":
+                self.poll_ai()
+                self.draw_grid()
             elif self.current_page == "Start": self.start_menu() 
             pygame.display.update(); clock.tick(30)
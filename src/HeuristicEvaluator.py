@@ -1,5 +1,10 @@
 # HeuristicEvaluators
 
+import re
+from Board import neighbour_table
+from LineIndex import line_index, board_string
+from PatternMatcher import PatternMatcher
+
 AI = "X"
 OP = "O"
 EMPTY = "." 
@@ -41,6 +46,12 @@ PATTERN_SCORES = {
 }
 
 def get_lines(board):
+    # Rows, columns, diagonals, anti-diagonals: each one a slice of the board string (see LineIndex)
+    flat = board_string(board)
+    return [flat[s] for s in line_index(len(board)).slices]
+
+def get_lines_join(board):
+    """Reference implementation (a join per row, column and diagonal), kept for benchmarks."""
     n = len(board)
     lines = []
     # Rows
@@ -81,7 +92,29 @@ def get_lines(board):
         if len(diag) >= 5: lines.append("".join(diag))
     return lines
 
+STONE_PATTERNS = {None: re.compile("[XO]"), AI: re.compile(AI), OP: re.compile(OP)}
+
+def stones(board, player=None):
+    """
+    (r, c, cell) of every stone (or only the 'player' stones), row by row;
+    rows without one are skipped without a Python loop.
+    """
+    pattern = STONE_PATTERNS[player]
+    for r, row in enumerate(board):
+        if (player in row) if player else (AI in row or OP in row):
+            for match in pattern.finditer("".join(row)):
+                yield r, match.start(), match.group()
+
+# Pattern table compiled once; the overline patterns only serve the exact-5 check
+MATCHER = PatternMatcher(PATTERN_SCORES, extra=("XXXXXX", "OOOOOO"))
+FIVE_BITS = {AI: MATCHER.bit["XXXXX"], OP: MATCHER.bit["OOOOO"]}
+SIX_BITS = {AI: MATCHER.bit["XXXXXX"], OP: MATCHER.bit["OOOOOO"]}
+
 def evaluate_line(line, player):
+    return MATCHER.score(line, player)
+
+def evaluate_line_substring(line, player):
+    """Reference implementation (one substring search per pattern), kept for benchmarks."""
     score = 0
     for pattern, value in PATTERN_SCORES.items():
         if player == AI:
@@ -94,20 +127,77 @@ def evaluate_line(line, player):
 
 # H1: Pattern Evaluation
 def evaluate(board, player=AI):
+    # Every pattern holds two stones or more: only lines with two are sliced, in get_lines() order
+    index = line_index(len(board))
+    flat = board_string(board)
+    counts = [0] * len(index.slices)
+    position_lines = index.position_lines
+    for match in STONE_PATTERNS[None].finditer(flat):
+        for idx in position_lines[match.start()]:
+            counts[idx] += 1
+    slices = index.slices
     score = 0
-    lines = get_lines(board)
-    for line in lines:
-        score += evaluate_line(line, player)
+    for idx, count in enumerate(counts):
+        if count < 2: continue
+        mask = MATCHER.mask(flat[slices[idx]])
+        score += MATCHER.value(mask, player)
         
         # WIN DETECTION (EXACT 5 RULE)
         # We ensure it's not 6 (Overline)
-        if "XXXXX" in line and "XXXXXX" not in line:
+        if mask & FIVE_BITS[AI] and not mask & SIX_BITS[AI]:
             return 1000000000 if player == "X" else -1000000000
-        if "OOOOO" in line and "OOOOOO" not in line:
+        if mask & FIVE_BITS[OP] and not mask & SIX_BITS[OP]:
             return 1000000000 if player == "O" else -1000000000
             
     return score
 
+def evaluate_join(board, player=AI):
+    """Reference implementation (a join per line holding a stone), kept for benchmarks."""
+    index = line_index(len(board))
+    occupied = set()
+    for r, c, _ in stones(board):
+        occupied.update(idx for idx, _ in index.slots[(r, c)])
+    score = 0
+    for idx in sorted(occupied):
+        line = "".join([board[r][c] for r, c in index.lines[idx]])
+        mask = MATCHER.mask(line)
+        score += MATCHER.value(mask, player)
+        if mask & FIVE_BITS[AI] and not mask & SIX_BITS[AI]:
+            return 1000000000 if player == "X" else -1000000000
+        if mask & FIVE_BITS[OP] and not mask & SIX_BITS[OP]:
+            return 1000000000 if player == "O" else -1000000000
+    return score
+
+# Batched H1: many positions in one vectorised pass (NumPy backend when installed)
+_numpy_backend = None
+
+def _vectorised():
+    global _numpy_backend
+    if _numpy_backend is None:
+        try:
+            import NumpyEvaluator
+            _numpy_backend = NumpyEvaluator
+        except ImportError:
+            _numpy_backend = False
+    return _numpy_backend
+
+def stack_children(board, moves, stone):
+    """The positions reached by placing 'stone' on each of 'moves', ready for evaluate_batch()."""
+    backend = _vectorised()
+    if backend: return backend.stack_children(board, moves, stone)
+    children = []
+    for r, c in moves:
+        child = [row[:] for row in board]
+        child[r][c] = stone
+        children.append(child)
+    return children
+
+def evaluate_batch(boards, player=AI):
+    """H1 of every position of 'boards' (a list of grids, or a stack from stack_children())."""
+    backend = _vectorised()
+    if backend: return [int(score) for score in backend.evaluate_batch(boards, player)]
+    return [evaluate(board, player) for board in boards]
+
 # H2: Distance Evaluation
 def distance_score(r, c, n):
     center = (n - 1) / 2.0
@@ -115,36 +205,33 @@ def distance_score(r, c, n):
     max_dist = center * 2
     return int((max_dist - dist) * 10)
 
+# Per board size: distance_score of every cell
+DISTANCE_TABLES = {}
+
+def distance_table(n):
+    if n not in DISTANCE_TABLES:
+        DISTANCE_TABLES[n] = [[distance_score(r, c, n) for c in range(n)] for r in range(n)]
+    return DISTANCE_TABLES[n]
+
 def evaluate_distance_to_center(board, player=AI):
-    n = len(board)
+    table = distance_table(len(board))
     score = 0
-    opponent = OP if player == AI else AI
-    for r in range(n):
-        for c in range(n):
-            cell = board[r][c]
-            if cell == player:
-                score += distance_score(r, c, n)
-            elif cell == opponent:
-                score -= distance_score(r, c, n) * 2  
+    for r, c, cell in stones(board):
+        if cell == player:
+            score += table[r][c]
+        else:
+            score -= table[r][c] * 2  
     return score
 
 # H3: Freedom/Mobility Evaluation
 def evaluate_freedom(board, player):
-    n = len(board)
+    # 5 points per empty cell next to one of the player's stones, in each of the 8 directions
+    neighbours = neighbour_table(len(board), 1)[0]
     score = 0
-    directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-    for r in range(n):
-        for c in range(n):
-            if board[r][c] == player:
-                for dr, dc in directions:
-                    # Check forward
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < n and 0 <= nc < n and board[nr][nc] == ".":
-                        score += 5
-                    # Check backward
-                    pr, pc = r - dr, c - dc
-                    if 0 <= pr < n and 0 <= pc < n and board[pr][pc] == ".":
-                        score += 5
+    for r, c, _ in stones(board, player):
+        for x, y in neighbours[(r, c)]:
+            if board[x][y] == EMPTY:
+                score += 5
     return score
 
 if __name__ == "__main__":
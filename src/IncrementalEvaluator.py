@@ -0,0 +1,117 @@
+# Incremental H1 (Pattern), H2 (Distance) and H3 (Freedom) Evaluation bound to a Board
+
+from Board import neighbour_table
+from HeuristicEvaluator import AI, OP, EMPTY, evaluate_line, distance_table, stones
+from LineIndex import line_index, board_string
+
+def line_winner(line):
+    """Mirrors the exact-five check of evaluate(): X is tested before O."""
+    if "XXXXX" in line and "XXXXXX" not in line: return AI
+    if "OOOOO" in line and "OOOOOO" not in line: return OP
+    return None
+
+class IncrementalEvaluator:
+    """
+    Keeps the H1 score of every line cached for both players, and the H2 / H3
+    sums per colour. After attach(), Board.make_move/undo_move call update(row, col),
+    which rescans only the (at most 4) lines passing through that cell and adjusts
+    the sums for that cell and its 8 neighbours, so a move costs the same on any board size.
+    score(player) always equals evaluate(board.board, player), distance(player)
+    evaluate_distance_to_center() and freedom(player) evaluate_freedom().
+    """
+
+    def __init__(self, board, cache_limit=100000):
+        self.board = board
+        n = board.size
+        index = line_index(n)
+        self.lines = index.lines
+        self.slots = index.slots
+        self.distances = distance_table(n)
+        self.neighbours = neighbour_table(n, 1)[0]
+        grid = board.board
+        # The cells of every line, kept in step with the grid so a rescan is a single join
+        flat = board_string(grid)
+        self.line_cells = [list(flat[s]) for s in index.slices]
+        self.line_cache = {} # line string -> (H1 for X, H1 for O, winner); cleared when full
+        self.cache_limit = cache_limit
+        self.line_scores = [None] * len(self.lines)
+        self.totals = {AI: 0, OP: 0}
+        self.win_lines = {}
+        for idx in range(len(self.lines)):
+            self._rescan(idx)
+        # H2 / H3 per colour: distance sum, and empty neighbours of its stones (x5 in freedom())
+        self.stones = {}
+        self.distance_sums = {AI: 0, OP: 0}
+        self.free_cells = {AI: 0, OP: 0}
+        for r, c, cell in stones(grid):
+            self.stones[(r, c)] = cell
+            self.distance_sums[cell] += self.distances[r][c]
+            self.free_cells[cell] += self._empty_neighbours(r, c)
+
+    def attach(self):
+        self.board.listeners.append(self)
+        return self
+
+    def detach(self):
+        if self in self.board.listeners:
+            self.board.listeners.remove(self)
+
+    def _line_entry(self, line):
+        entry = self.line_cache.get(line)
+        if entry is None:
+            entry = (evaluate_line(line, AI), evaluate_line(line, OP), line_winner(line))
+            if len(self.line_cache) >= self.cache_limit: self.line_cache.clear()
+            self.line_cache[line] = entry
+        return entry
+
+    def _rescan(self, idx):
+        entry = self._line_entry("".join(self.line_cells[idx]))
+        old = self.line_scores[idx]
+        if old is not None:
+            self.totals[AI] -= old[0]
+            self.totals[OP] -= old[1]
+        self.totals[AI] += entry[0]
+        self.totals[OP] += entry[1]
+        self.line_scores[idx] = entry
+        if entry[2]:
+            self.win_lines[idx] = entry[2]
+        else:
+            self.win_lines.pop(idx, None)
+
+    def _empty_neighbours(self, r, c):
+        grid = self.board.board
+        return sum(1 for x, y in self.neighbours[(r, c)] if grid[x][y] == EMPTY)
+
+    def update(self, row, col):
+        cell = self.board.board[row][col]
+        for idx, offset in self.slots[(row, col)]:
+            self.line_cells[idx][offset] = cell
+            self._rescan(idx)
+        old = self.stones.get((row, col), EMPTY)
+        if old == cell: return
+        for stone, sign in ((old, -1), (cell, 1)):
+            if stone == EMPTY: continue
+            self.distance_sums[stone] += sign * self.distances[row][col]
+            self.free_cells[stone] += sign * self._empty_neighbours(row, col)
+        if (old == EMPTY) != (cell == EMPTY):
+            # Placing a stone takes this cell from its neighbours' freedom, removing one gives it back
+            delta = -1 if old == EMPTY else 1
+            for neighbour in self.neighbours[(row, col)]:
+                stone = self.stones.get(neighbour)
+                if stone is not None: self.free_cells[stone] += delta
+        if cell == EMPTY: del self.stones[(row, col)]
+        else: self.stones[(row, col)] = cell
+
+    def score(self, player=AI):
+        if self.win_lines:
+            # evaluate() returns on the first winning line in get_lines() order
+            winner = self.win_lines[min(self.win_lines)]
+            return 1000000000 if player == winner else -1000000000
+        return self.totals[AI] if player == AI else self.totals[OP]
+
+    def distance(self, player=AI):
+        opponent = OP if player == AI else AI
+        return self.distance_sums[player] - 2 * self.distance_sums[opponent]
+
+    def freedom(self, player=AI):
+        return 5 * self.free_cells[player]
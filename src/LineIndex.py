@@ -0,0 +1,62 @@
+# Line index: the geometry of every row, column and diagonal, computed once per board size
+
+def line_coordinates(n):
+    """
+    Returns the cell coordinates of every line, in the same order as get_lines():
+    rows, columns, then the (>= 5 long) diagonals and anti-diagonals.
+    Shorter diagonals cannot hold five stones, so they are left out.
+    """
+    lines = []
+    for r in range(n):
+        lines.append([(r, c) for c in range(n)])
+    for c in range(n):
+        lines.append([(r, c) for r in range(n)])
+    starts = [(r, 0) for r in range(n)] + [(0, c) for c in range(1, n)]
+    for x, y in starts:
+        diag = []
+        while x < n and y < n:
+            diag.append((x, y))
+            x += 1; y += 1
+        if len(diag) >= 5: lines.append(diag)
+    starts = [(r, n - 1) for r in range(n)] + [(0, c) for c in range(n - 2, -1, -1)]
+    for x, y in starts:
+        diag = []
+        while x < n and y >= 0:
+            diag.append((x, y))
+            x += 1; y -= 1
+        if len(diag) >= 5: lines.append(diag)
+    return lines
+
+class LineIndex:
+    """
+    Read-only tables for one board size, shared by the boards and evaluators:
+    - lines[i]: the (r, c) cells of line i, positions[i]: the same cells as r * n + c
+    - slices[i]: line i as a slice of board_string() (every line is evenly spaced in
+      the row-major grid), so reading a line is one slice instead of a join over its cells
+    - slots[(r, c)]: the (line, offset) pairs of the lines through the cell
+    - position_lines[r * n + c]: the indices of those lines, in increasing order
+    """
+
+    def __init__(self, n):
+        self.size = n
+        self.lines = tuple(tuple(cells) for cells in line_coordinates(n))
+        self.positions = tuple(tuple(r * n + c for r, c in cells) for cells in self.lines)
+        self.slices = tuple(slice(p[0], p[-1] + 1, p[1] - p[0]) for p in self.positions)
+        slots = {(r, c): [] for r in range(n) for c in range(n)}
+        for idx, cells in enumerate(self.lines):
+            for offset, cell in enumerate(cells):
+                slots[cell].append((idx, offset))
+        self.slots = {cell: tuple(pairs) for cell, pairs in slots.items()}
+        self.position_lines = tuple(tuple(idx for idx, _ in self.slots[(r, c)]) for r in range(n) for c in range(n))
+
+# Per board size: the LineIndex, built on first use
+LINE_INDEXES = {}
+
+def line_index(n):
+    if n not in LINE_INDEXES:
+        LINE_INDEXES[n] = LineIndex(n)
+    return LINE_INDEXES[n]
+
+def board_string(board):
+    """The list-of-lists grid as one row-major string of n * n cells (see LineIndex.slices)."""
+    return "".join(map("".join, board))
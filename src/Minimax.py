@@ -7,6 +7,7 @@ class Minimax:
         self.heuristic_func = heuristic_func
         self.ai_player = None 
         self.nodes_explored = 0 
+        self.instrument = None # SearchInstrument of a capture in progress (no cutoffs here, only nodes and timers)
 
     def find_best_move(self, board):
         self.ai_player = board.current_player
@@ -0,0 +1,220 @@
+# Local HTTP/JSON move server: AIController.select_best_move behind a pool of warm engine processes
+#
+#   python MoveServer.py --port 8765 --workers 2 [--book opening_book.bin] [--eval-cache evals.db]
+#
+# POST /move   {"moves": [[7, 7], [6, 6]], "size": 15, "mode": "AlphaBeta_Combined", "time_limit": 0.5}
+#              or {"grid": [["X", ".", ...], ...], ...} instead of "moves"
+#           -> {"move": [r, c], "time": s, "nodes": n, "stats": {...}, "latency": s}
+# POST /batch  {"requests": [<move request>, ...]} -> {"results": [<move response or {"error": ...}>, ...]}
+# GET  /stats  request count, errors and latency percentiles
+# Errors come back as {"error": message} with status 400 (bad request) or 500.
+
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Board import Board
+
+MODES = ("Minimax_H1", "AlphaBeta_H2", "AlphaBeta_Combined")
+
+class RequestError(ValueError):
+    """A malformed move request (answered with status 400)."""
+
+# --- Positions ---
+
+def board_from_moves(moves, size):
+    board = Board(size=size)
+    for move in moves:
+        try: legal = len(move) == 2 and board.make_move(int(move[0]), int(move[1]))
+        except (TypeError, ValueError): legal = False
+        if not legal: raise RequestError(f"Illegal move: {move}")
+    return board
+
+def board_from_grid(grid, size):
+    """Plays the grid's stones alternately, X first, so X must have as many stones as O or one more."""
+    if len(grid) != size or any(len(row) != size for row in grid):
+        raise RequestError(f"Grid must be {size}x{size}")
+    stones = {"X": [], "O": []}
+    for r, row in enumerate(grid):
+        for c, cell in enumerate(row):
+            if cell in stones: stones[cell].append((r, c))
+            elif cell != ".": raise RequestError(f"Unknown cell value: {cell!r}")
+    xs, os_ = stones["X"], stones["O"]
+    if len(xs) - len(os_) not in (0, 1):
+        raise RequestError("X must have as many stones as O, or one more")
+    order = [m for pair in zip(xs, os_) for m in pair] + xs[len(os_):]
+    return board_from_moves(order, size)
+
+def parse_request(request):
+    """(size, moves or grid, mode, time_limit) of a move request, validated."""
+    if not isinstance(request, dict): raise RequestError("A move request must be a JSON object")
+    size = request.get("size", 15)
+    if not isinstance(size, int) or not 5 <= size <= 25: raise RequestError("'size' must be an integer in 5..25")
+    mode = request.get("mode", "AlphaBeta_Combined")
+    if mode not in MODES: raise RequestError(f"'mode' must be one of {', '.join(MODES)}")
+    time_limit = request.get("time_limit")
+    if time_limit is not None and (not isinstance(time_limit, (int, float)) or time_limit <= 0):
+        raise RequestError("'time_limit' must be a positive number of seconds")
+    if "grid" in request: position = ("grid", request["grid"])
+    else: position = ("moves", request.get("moves", []))
+    return size, position, mode, time_limit
+
+# --- Engine processes ---
+
+# The worker's AIController, created and warmed up once by _init_engine
+_engine = {}
+
+def _init_engine(book_path, eval_cache_path):
+    from AIController import AIController
+    controller = AIController(book_path=book_path, eval_cache_path=eval_cache_path)
+    # Warm-up: imports, pattern tables and the first transposition table entries
+    board = board_from_moves([(7, 7), (7, 8)], 15)
+    for mode in ("AlphaBeta_H2", "AlphaBeta_Combined"):
+        controller.select_best_move(board, mode)
+    _engine["controller"] = controller
+
+def _select_move(size, position, mode, time_limit):
+    kind, data = position
+    board = board_from_grid(data, size) if kind == "grid" else board_from_moves(data, size)
+    if board.is_terminal(): raise RequestError("The game is already over")
+    controller = _engine["controller"]
+    move, elapsed, nodes = controller.select_best_move(board, mode, time_limit)
+    stats = {key: list(value) if isinstance(value, tuple) else value for key, value in controller.last_stats.items()}
+    return {"move": list(move) if move else None, "time": elapsed, "nodes": nodes, "stats": stats}
+
+# --- Latency statistics ---
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values: return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+class LatencyStats:
+    """Latencies of the last 'window' requests (thread-safe)."""
+
+    def __init__(self, window=10000):
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency, error=False):
+        with self.lock:
+            self.latencies.append(latency)
+            self.requests += 1
+            if error: self.errors += 1
+
+    def summary(self):
+        with self.lock:
+            values = sorted(self.latencies)
+            requests, errors = self.requests, self.errors
+        result = {"requests": requests, "errors": errors}
+        for p in (50, 90, 99):
+            value = percentile(values, p)
+            result[f"p{p}"] = round(value, 4) if value is not None else None
+        result["max"] = round(values[-1], 4) if values else None
+        return result
+
+# --- HTTP ---
+
+class MoveServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer on localhost whose handler threads hand the searches to the engine pool."""
+    daemon_threads = True
+
+    def __init__(self, port=8765, workers=2, book_path=None, eval_cache_path=None):
+        super().__init__(("127.0.0.1", port), MoveRequestHandler)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_engine,
+                                        initargs=(book_path, eval_cache_path))
+        self.latency = LatencyStats()
+        # Start every worker now rather than on the first requests
+        for future in [self.pool.submit(time.sleep, 0.1) for _ in range(workers)]: future.result()
+
+    def solve(self, request):
+        """One move request -> response dict (raises RequestError on bad input)."""
+        start = time.perf_counter()
+        try:
+            response = self.pool.submit(_select_move, *parse_request(request)).result()
+        except Exception:
+            self.latency.record(time.perf_counter() - start, error=True)
+            raise
+        response["latency"] = time.perf_counter() - start
+        self.latency.record(response["latency"])
+        return response
+
+    def solve_batch(self, requests):
+        """All requests of a batch go to the pool at once; results keep the request order."""
+        if not isinstance(requests, list): raise RequestError("'requests' must be a list")
+        start = time.perf_counter()
+        futures = []
+        for request in requests:
+            try: futures.append(self.pool.submit(_select_move, *parse_request(request)))
+            except RequestError as e: futures.append(e)
+        results = []
+        for future in futures:
+            try:
+                if isinstance(future, Exception): raise future
+                response = future.result()
+                response["latency"] = time.perf_counter() - start
+                self.latency.record(response["latency"])
+            except Exception as e:
+                self.latency.record(time.perf_counter() - start, error=True)
+                response = {"error": str(e)}
+            results.append(response)
+        return results
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+class MoveRequestHandler(BaseHTTPRequestHandler):
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats": self._reply(200, self.server.latency.summary())
+        else: self._reply(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            try: request = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as e: raise RequestError(f"Invalid JSON: {e}")
+            if self.path == "/move": self._reply(200, self.server.solve(request))
+            elif self.path == "/batch":
+                if not isinstance(request, dict): raise RequestError("A batch must be a JSON object")
+                self._reply(200, {"results": self.server.solve_batch(request.get("requests"))})
+            else: self._reply(404, {"error": f"Unknown path: {self.path}"})
+        except RequestError as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        pass # latency stats replace the per-request access log
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Gomoku moves over HTTP/JSON on localhost.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="engine processes")
+    parser.add_argument("--book", help="opening book file (see OpeningBook.py)")
+    parser.add_argument("--eval-cache", help="SQLite evaluation cache shared by the engines")
+    args = parser.parse_args()
+
+    server = MoveServer(args.port, args.workers, args.book, args.eval_cache)
+    print(f"Serving moves on http://127.0.0.1:{args.port} with {args.workers} engines")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
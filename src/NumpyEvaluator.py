@@ -0,0 +1,148 @@
+# NumPy evaluation backend: vectorised H1 (Pattern), H2 (Distance), H3 (Freedom)
+# Gives exactly the same scores as the functions in HeuristicEvaluator.
+
+import numpy as np
+from HeuristicEvaluator import AI, OP, PATTERN_SCORES, distance_score
+from LineIndex import line_index
+
+# Cell codes. PAD fills short diagonals, so no pattern can match across a line end.
+EMPTY_CODE, AI_CODE, OP_CODE, PAD_CODE = 0, 1, 2, 3
+CELL_CODES = {".": EMPTY_CODE, AI: AI_CODE, OP: OP_CODE}
+
+def _flip(pattern):
+    return pattern.replace("X", "T").replace("O", "X").replace("T", "O")
+
+def _code(pattern):
+    """Base-4 code of a pattern, first cell in the lowest digit."""
+    return sum(CELL_CODES[ch] * 4 ** i for i, ch in enumerate(pattern))
+
+# Patterns grouped by length: codes, and their values from each player's perspective
+PATTERN_GROUPS = {}
+for _length in sorted({len(p) for p in PATTERN_SCORES} | {5, 6}):
+    _patterns = [p for p in PATTERN_SCORES if len(p) == _length]
+    PATTERN_GROUPS[_length] = (
+        np.array([_code(p) for p in _patterns], dtype=np.int64),
+        np.array([PATTERN_SCORES[p] for p in _patterns], dtype=np.int64),
+        np.array([PATTERN_SCORES.get(_flip(p), 0) for p in _patterns], dtype=np.int64),
+    )
+# Flipping is a bijection on the table, so the O-perspective values above cover every flipped pattern
+assert sorted(_flip(p) for p in PATTERN_SCORES) == sorted(PATTERN_SCORES)
+
+FIVE_CODES = {AI: _code("XXXXX"), OP: _code("OOOOO")}
+SIX_CODES = {AI: _code("XXXXXX"), OP: _code("OOOOOO")}
+
+TABLES = {}
+
+def size_tables(n):
+    """Per board size: line gather indices (get_lines order) and the H2 weight matrix."""
+    if n not in TABLES:
+        positions = line_index(n).positions
+        index = np.full((len(positions), n), n * n, dtype=np.intp) # n * n points at the PAD cell
+        for i, cells in enumerate(positions):
+            index[i, :len(cells)] = cells
+        weights = np.array([[distance_score(r, c, n) for c in range(n)] for r in range(n)], dtype=np.int64)
+        TABLES[n] = (index, weights)
+    return TABLES[n]
+
+def to_array(board):
+    """List-of-lists grid (or a list of grids) -> int8 array of cell codes."""
+    grid = np.array(board, dtype="<U1")
+    return ((grid == AI) * AI_CODE + (grid == OP) * OP_CODE).astype(np.int8)
+
+def to_stack(boards):
+    """A stack of positions as an int8 array (k, n, n); accepts grids or an existing array."""
+    if isinstance(boards, np.ndarray): return boards.astype(np.int8, copy=False)
+    return to_array(list(boards))
+
+def stack_children(board, moves, stone):
+    """All positions reached by placing 'stone' on each of 'moves', as one (k, n, n) stack."""
+    base = to_array(board)
+    stack = np.repeat(base[None], len(moves), axis=0)
+    rows, cols = zip(*moves) if moves else ((), ())
+    stack[np.arange(len(moves)), list(rows), list(cols)] = CELL_CODES[stone]
+    return stack
+
+def _window_codes(lines, length):
+    """Base-4 code of every window of 'length' cells, per line: shape (..., lines, windows)."""
+    width = lines.shape[-1] - length + 1
+    codes = np.zeros(lines.shape[:-1] + (max(width, 0),), dtype=np.int64)
+    for i in range(length):
+        codes += lines[..., i:i + width].astype(np.int64) << (2 * i)
+    return codes
+
+def _gather_lines(cells, n):
+    """cells: (..., n * n) codes -> (..., lines, n) codes in get_lines order."""
+    index, _ = size_tables(n)
+    padded = np.concatenate([cells, np.full(cells.shape[:-1] + (1,), PAD_CODE, dtype=cells.dtype)], axis=-1)
+    return padded[..., index]
+
+def _pattern_scores(lines, player):
+    """H1 for a stack of line sets (k, lines, n) -> (k,) scores, same semantics as evaluate()."""
+    scores = np.zeros(lines.shape[0], dtype=np.int64)
+    wins = {}
+    for length, (codes, ai_values, op_values) in PATTERN_GROUPS.items():
+        windows = _window_codes(lines, length)
+        # present[k, line, pattern]: the pattern occurs somewhere in that line
+        present = (windows[..., None] == codes).any(axis=2)
+        if present.size:
+            scores += present.sum(axis=1) @ (ai_values if player == AI else op_values)
+        if length in (5, 6):
+            for p in (AI, OP):
+                target = FIVE_CODES[p] if length == 5 else SIX_CODES[p]
+                wins[(p, length)] = (windows == target).any(axis=2)
+    ai_wins = wins[(AI, 5)] & ~wins[(AI, 6)]
+    op_wins = wins[(OP, 5)] & ~wins[(OP, 6)]
+    either = ai_wins | op_wins
+    decided = either.any(axis=1)
+    if decided.any():
+        # evaluate() returns on the first winning line, checking X before O
+        first = np.argmax(either, axis=1)
+        ai_first = ai_wins[np.arange(len(first)), first]
+        winner_is_player = ai_first == (player == AI)
+        scores = np.where(decided, np.where(winner_is_player, 1000000000, -1000000000), scores)
+    return scores
+
+def _distance_scores(stack, player):
+    _, weights = size_tables(stack.shape[-1])
+    opponent = OP if player == AI else AI
+    mine = (stack == CELL_CODES[player]).astype(np.int64)
+    theirs = (stack == CELL_CODES[opponent]).astype(np.int64)
+    return np.tensordot(mine - 2 * theirs, weights, axes=([1, 2], [0, 1]))
+
+def _freedom_scores(stack, player):
+    k, n = stack.shape[0], stack.shape[-1]
+    if player not in CELL_CODES: return np.zeros(k, dtype=np.int64)
+    padded = np.full((k, n + 2, n + 2), PAD_CODE, dtype=np.int8)
+    padded[:, 1:-1, 1:-1] = stack
+    mine = stack == CELL_CODES[player]
+    free = np.zeros(k, dtype=np.int64)
+    for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+        for sr, sc in ((dr, dc), (-dr, -dc)):
+            neighbour = padded[:, 1 + sr:n + 1 + sr, 1 + sc:n + 1 + sc]
+            free += np.count_nonzero(mine & (neighbour == EMPTY_CODE), axis=(1, 2))
+    return free * 5
+
+# H1: Pattern Evaluation
+def evaluate(board, player=AI):
+    return int(evaluate_batch([board], player)[0])
+
+def evaluate_batch(boards, player=AI):
+    """H1 of every position of a stack in one vectorised pass."""
+    stack = to_stack(boards)
+    if stack.shape[0] == 0: return np.zeros(0, dtype=np.int64)
+    n = stack.shape[-1]
+    return _pattern_scores(_gather_lines(stack.reshape(stack.shape[0], -1), n), player)
+
+# H2: Distance Evaluation
+def evaluate_distance_to_center(board, player=AI):
+    return int(evaluate_distance_to_center_batch([board], player)[0])
+
+def evaluate_distance_to_center_batch(boards, player=AI):
+    return _distance_scores(to_stack(boards), player)
+
+# H3: Freedom/Mobility Evaluation
+def evaluate_freedom(board, player):
+    return int(evaluate_freedom_batch([board], player)[0])
+
+def evaluate_freedom_batch(boards, player):
+    return _freedom_scores(to_stack(boards), player)
@@ -0,0 +1,163 @@
+# Opening book: best moves of early positions, precomputed offline
+#
+# File format (little-endian):
+#   header : magic b"GMKB", version (H), board size (H), record count (I)
+#   records: key (Q), move (H) - sorted by key, 10 bytes each
+# 'key' is the canonical Zobrist hash (smallest over the 8 board symmetries)
+# and 'move' is r * size + c in that canonical orientation.
+#
+# Build:  python OpeningBook.py build opening_book.bin --plies 6 --width 2 --depth 4
+# Show:   python OpeningBook.py info opening_book.bin
+
+import argparse
+import mmap
+import struct
+import time
+from Board import Board, zobrist_table
+
+MAGIC = b"GMKB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<QH")
+
+# Per board size: for each of the 8 symmetries, the cell map and its inverse
+SYMMETRY_TABLES = {}
+
+def symmetry_maps(size):
+    if size not in SYMMETRY_TABLES:
+        n = size - 1
+        transforms = [
+            lambda r, c: (r, c), lambda r, c: (c, n - r), lambda r, c: (n - r, n - c), lambda r, c: (n - c, r),
+            lambda r, c: (r, n - c), lambda r, c: (c, r), lambda r, c: (n - r, c), lambda r, c: (n - c, n - r),
+        ]
+        maps = []
+        for t in transforms:
+            forward = {(r, c): t(r, c) for r in range(size) for c in range(size)}
+            maps.append((forward, {v: k for k, v in forward.items()}))
+        SYMMETRY_TABLES[size] = maps
+    return SYMMETRY_TABLES[size]
+
+def canonical_key(board):
+    """(key, symmetry index): the smallest Zobrist hash of the position over the 8 symmetries."""
+    zobrist = zobrist_table(board.size)
+    side = zobrist["side"] if board.current_player == "O" else 0
+    stones = [(cell, board.board[cell[0]][cell[1]]) for cell in board.move_history]
+    best = None
+    for i, (forward, _) in enumerate(symmetry_maps(board.size)):
+        key = side
+        for cell, player in stones:
+            key ^= zobrist[forward[cell] + (player,)]
+        if best is None or key < best[0]: best = (key, i)
+    return best
+
+class OpeningBook:
+    """Read-only book file, memory-mapped; lookup() is a binary search over the records."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"Not an opening book (version {VERSION}): {path}")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.data.close()
+
+    def _find(self, key):
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            mid_key, move = RECORD.unpack_from(self.data, HEADER.size + mid * RECORD.size)
+            if mid_key == key: return move
+            if mid_key < key: low = mid + 1
+            else: high = mid
+        return None
+
+    def lookup(self, board):
+        """Book move for 'board' in its own orientation, or None."""
+        if board.size != self.size: return None
+        key, symmetry = canonical_key(board)
+        code = self._find(key)
+        if code is None or code >= self.size * self.size:
+            self.misses += 1
+            return None
+        _, inverse = symmetry_maps(self.size)[symmetry]
+        move = inverse[divmod(code, self.size)]
+        if board.board[move[0]][move[1]] != ".": # hash collision
+            self.misses += 1
+            return None
+        self.hits += 1
+        return move
+
+def write_book(path, size, entries):
+    """entries: {canonical key: canonical move (r, c)}."""
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, len(entries)))
+        for key in sorted(entries):
+            r, c = entries[key]
+            f.write(RECORD.pack(key, r * size + c))
+
+def build_book(path, size=15, plies=6, width=2, depth=4, verbose=True):
+    """
+    Searches every position reached from the centre opening within 'plies' moves
+    where each side plays the book move or one of the 'width' next candidates
+    of get_possible_moves(), and writes the best move of each to 'path'.
+    """
+    from AIController import AIController # the Hard mode heuristic and search settings
+    from AlphaBeta import AlphaBeta
+    from MoveOrdering import MoveOrderer
+    from TranspositionTable import TranspositionTable
+
+    ai = AIController()
+    bot = AlphaBeta(depth=depth, heuristic_func=ai.heuristic_hard,
+                    transposition_table=TranspositionTable(), move_orderer=MoveOrderer())
+    entries = {}
+    frontier = [[]]
+    start = time.perf_counter()
+    for ply in range(plies + 1):
+        next_frontier = []
+        for history in frontier:
+            board = Board(size)
+            for r, c in history:
+                board.make_move(r, c)
+            if board.is_terminal(): continue
+            key, symmetry = canonical_key(board)
+            if key in entries: continue
+            ai.bind_board(board)
+            move = bot.find_best_move(board)
+            if move is None: continue
+            forward, _ = symmetry_maps(size)[symmetry]
+            entries[key] = forward[move]
+            if ply < plies:
+                replies = [move] + [m for m in board.get_possible_moves() if m != move][:width]
+                next_frontier.extend(history + [m] for m in replies)
+        if verbose:
+            print(f"Ply {ply}: {len(entries)} positions, {time.perf_counter() - start:.1f}s")
+        frontier = next_frontier
+    write_book(path, size, entries)
+    return len(entries)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect a Gomoku opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="search early positions and write the book")
+    build.add_argument("path")
+    build.add_argument("--size", type=int, default=15)
+    build.add_argument("--plies", type=int, default=6, help="moves from the empty board")
+    build.add_argument("--width", type=int, default=2, help="non-book moves tried per position")
+    build.add_argument("--depth", type=int, default=4, help="AlphaBeta depth per position")
+    info = commands.add_parser("info", help="print the header of a book file")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build_book(args.path, args.size, args.plies, args.width, args.depth)
+        print(f"Wrote {count} positions to {args.path}")
+    else:
+        book = OpeningBook(args.path)
+        print(f"{args.path}: {book.count} positions, board size {book.size}, {HEADER.size + book.count * RECORD.size} bytes")
+        book.close()
@@ -0,0 +1,127 @@
+# Principal Variation Search: negamax AlphaBeta with null windows and aspiration windows
+
+import math
+from AlphaBeta import AlphaBeta
+from TranspositionTable import EXACT, LOWER, UPPER
+
+# Root scores at or beyond this are wins/losses: no aspiration window around them
+DECIDED_SCORE = 1000000
+
+class PVSAlphaBeta(AlphaBeta):
+    """
+    Drop-in alternative to AlphaBeta (same constructor, tables and orderer).
+    Negamax form: scores are from the side to move, 'sign' is +1 when the AI
+    moves. The first child gets the full window, the others a null window
+    (alpha, next float after alpha) and are re-searched with the full window
+    only when they fail high. Ties never fail high, so the returned move is
+    the same as AlphaBeta at equal depth.
+    During iterative deepening the root starts with an aspiration window of
+    +/- 'aspiration_window' around an earlier iteration's score and widens the
+    failing side until the score lands inside it.
+    Transposition table entries keep AlphaBeta's convention (AI's point of view).
+    """
+
+    def __init__(self, depth, heuristic_func=None, transposition_table=None, move_orderer=None,
+                 batch_heuristic_func=None, aspiration_window=1000, quiescence_depth=0,
+                 quiescence_node_limit=200):
+        super().__init__(depth, heuristic_func, transposition_table, move_orderer, batch_heuristic_func,
+                         quiescence_depth, quiescence_node_limit)
+        self.aspiration_window = aspiration_window
+        self.re_searches = 0
+        self.aspiration_failures = 0
+        self.root_scores = {} # depth -> root score, within one iterative deepening run
+
+    def find_best_move(self, board):
+        self.re_searches = 0
+        self.aspiration_failures = 0
+        return super().find_best_move(board)
+
+    def _root_search(self, board):
+        if self.root_first_move is None: self.root_scores = {} # a new iterative deepening run
+        score, move = self._aspiration_search(board)
+        self.root_scores[self.depth] = score
+        return score, move
+
+    def _aspiration_search(self, board):
+        # Gomoku scores swing between odd and even depths, so centre on the
+        # last iteration with the same side making the final move
+        previous = self.root_scores.get(self.depth - 2, self.root_scores.get(self.depth - 1))
+        if previous is None or abs(previous) >= DECIDED_SCORE:
+            return self._pvs(board, self.depth, -math.inf, math.inf, 1)
+        # Widen only the side that failed, 4x per failure, until the score fits
+        low = high = self.aspiration_window
+        while True:
+            alpha, beta = previous - low, previous + high
+            score, move = self._pvs(board, self.depth, alpha, beta, 1)
+            if alpha < score < beta: return score, move
+            self.aspiration_failures += 1
+            if score <= alpha: low *= 4
+            else: high *= 4
+            if max(low, high) >= DECIDED_SCORE:
+                return self._pvs(board, self.depth, -math.inf, math.inf, 1)
+
+    def _pvs(self, board, depth, alpha, beta, sign):
+        self.nodes_explored += 1
+        if self.nodes_explored % 64 == 0: self._check_limits()
+        tt = self.transposition_table
+        tt_move = None
+        if tt is not None:
+            alpha_orig, beta_orig = alpha, beta
+            entry = tt.probe(board.hash)
+            if entry is not None:
+                _, tt_depth, flag, tt_score, tt_move, _, context = entry
+                if tt_depth >= depth and (context is None or context == self._context(board, tt_depth)):
+                    tt_score *= sign
+                    if flag == EXACT: return tt_score, tt_move
+                    # A lower bound for the AI is an upper bound for its opponent
+                    if (flag == LOWER) == (sign == 1): alpha = max(alpha, tt_score)
+                    else: beta = min(beta, tt_score)
+                    if beta <= alpha: return tt_score, tt_move
+        if board.is_terminal() or (depth == 0 and not self.quiescence_depth):
+            score = self._evaluate_state(board)
+            if tt is not None: tt.store(board.hash, depth, EXACT, score, None)
+            return sign * score, None
+        if depth == 0:
+            # The quiescence search works from the AI's point of view, like the table
+            self.quiescence_budget = self.quiescence_node_limit
+            if sign == 1: score = self._quiescence(board, alpha, beta, True, self.quiescence_depth)
+            else: score = self._quiescence(board, -beta, -alpha, False, self.quiescence_depth)
+            if tt is not None:
+                if sign == 1: self._store(board, depth, score, None, alpha_orig, beta_orig)
+                else: self._store(board, depth, score, None, -beta_orig, -alpha_orig)
+            return sign * score, None
+        possible_moves = board.get_possible_moves()
+        if not possible_moves: return 0, None
+        orderer = self.move_orderer
+        possible_moves = self._order_moves(board, possible_moves, depth, tt_move)
+        if depth == 1 and self.batch_heuristic_func is not None: self._batch_last_ply(board, possible_moves)
+        best_move = possible_moves[0]
+
+        best_score = -math.inf
+        for i, (r, c) in enumerate(possible_moves):
+            board.make_move(r, c)
+            try:
+                if i == 0:
+                    score = -self._pvs(board, depth - 1, -beta, -alpha, -sign)[0]
+                else:
+                    null_beta = math.nextafter(alpha, math.inf)
+                    score = -self._pvs(board, depth - 1, -null_beta, -alpha, -sign)[0]
+                    if alpha < score < beta: # fails high: it may be the new best, get its exact score
+                        self.re_searches += 1
+                        score = -self._pvs(board, depth - 1, -beta, -alpha, -sign)[0]
+            finally:
+                board.undo_move(r, c)
+            if score > best_score:
+                best_score = score
+                best_move = (r, c)
+            alpha = max(alpha, score)
+            if beta <= alpha:
+                self.pruning_count += 1
+                if orderer is not None: orderer.record_cutoff((r, c), self.depth - depth, depth)
+                if self.instrument is not None: self.instrument.cutoff(board, i)
+                break
+        if tt is not None:
+            # Back to the AI's point of view for the table
+            if sign == 1: self._store(board, depth, best_score, best_move, alpha_orig, beta_orig)
+            else: self._store(board, depth, -best_score, best_move, -beta_orig, -alpha_orig)
+        return best_score, best_move
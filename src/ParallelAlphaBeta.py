@@ -0,0 +1,204 @@
+# Parallel root search: AlphaBeta with the root moves split across a process pool
+
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from AlphaBeta import AlphaBeta, SearchCancelled, SearchTimeout
+from CompactBoard import CompactBoard
+from MoveOrdering import MoveOrderer
+from TranspositionTable import TranspositionTable
+
+# Per-process state of a pool worker, set once by _init_worker
+_worker = {}
+
+class _SearchStop:
+    """A worker's stop_event: set once the parent has moved on from search 'search_id' (cancelled or done)."""
+
+    def __init__(self, current_search, search_id):
+        self.current_search = current_search
+        self.search_id = search_id
+
+    def is_set(self):
+        return self.current_search.value != self.search_id
+
+def _init_worker(shared_alpha, current_search, heuristic_func, prepare_board, use_tt, orderer_switches, eval_cache,
+                 quiescence=(0, 0), selective=(False, None, None)):
+    _worker["alpha"] = shared_alpha
+    _worker["search"] = current_search
+    _worker["prepare_board"] = prepare_board
+    _worker["bot"] = AlphaBeta(
+        depth=0, heuristic_func=heuristic_func,
+        transposition_table=TranspositionTable() if use_tt else None,
+        move_orderer=MoveOrderer(**orderer_switches) if orderer_switches is not None else None,
+        quiescence_depth=quiescence[0], quiescence_node_limit=quiescence[1],
+        late_move_reductions=selective[0], max_candidates=selective[1], futility_margin=selective[2])
+    _worker["bot"].eval_cache = eval_cache # its own connection to the shared file
+
+def _search_root_move(position, move, depth, deadline, search_id):
+    """
+    Scores one root move of search 'search_id' in a worker ('position': CompactBoard.to_bytes()).
+    Returns (score, searched_alpha, nodes, cutoffs); raises SearchCancelled once that search is over.
+    """
+    stop = _SearchStop(_worker["search"], search_id)
+    if stop.is_set(): raise SearchCancelled()
+    board = CompactBoard.from_bytes(position)
+    if _worker["prepare_board"] is not None: _worker["prepare_board"](board)
+    bot = _worker["bot"]
+    # Same per-search reset as AlphaBeta.find_best_move
+    if bot.transposition_table is not None:
+        if bot.ai_player != board.current_player: bot.transposition_table.clear()
+        bot.transposition_table.new_search()
+    if bot.move_orderer is not None: bot.move_orderer.new_search()
+    bot.ai_player = board.current_player
+    bot.depth = depth
+    bot.deadline = deadline
+    bot.stop_event = stop
+    bot.nodes_explored = 0
+    bot.pruning_count = 0
+    bot.quiescence_nodes = 0
+    bot.selective_stats = dict.fromkeys(bot.selective_stats, 0)
+
+    shared_alpha = _worker["alpha"]
+    alpha = shared_alpha.value # best root score found so far by any worker
+    board.make_move(*move)
+    score, _ = bot._alphabeta(board, depth - 1, alpha, math.inf, False)
+    with shared_alpha.get_lock(): # also guards the search id: no write into a later search's bound
+        if not stop.is_set() and score > shared_alpha.value: shared_alpha.value = score
+    if bot.eval_cache is not None: bot.eval_cache.flush()
+    return score, alpha, bot.nodes_explored, bot.pruning_count
+
+class ParallelAlphaBeta(AlphaBeta):
+    """
+    AlphaBeta whose root moves are searched by a ProcessPoolExecutor.
+    The first root move is searched locally to get a bound; the others are
+    spread across the workers, which share the best root score found so far
+    (a multiprocessing.Value) as their alpha. Root moves whose fail-low
+    bound ties the best score are re-searched with a full window, so the
+    returned move is the same as the serial search at equal depth.
+    Each search has an id, shared with the workers: the tasks of a cancelled
+    or timed-out search stop at their next node check and never write the
+    alpha of the next search.
+    'heuristic_func' and 'prepare_board' (called on each worker board, e.g.
+    AIController.bind_board) must be picklable.
+    """
+
+    def __init__(self, depth, heuristic_func=None, transposition_table=None, move_orderer=None,
+                 workers=None, prepare_board=None, quiescence_depth=0, quiescence_node_limit=200,
+                 late_move_reductions=False, max_candidates=None, futility_margin=None):
+        super().__init__(depth, heuristic_func, transposition_table, move_orderer,
+                         quiescence_depth=quiescence_depth, quiescence_node_limit=quiescence_node_limit,
+                         late_move_reductions=late_move_reductions, max_candidates=max_candidates,
+                         futility_margin=futility_margin)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.prepare_board = prepare_board
+        self.pool = None
+        self.shared_alpha = None
+        self.current_search = None # id of the running search, shared with the workers
+
+    def _start_pool(self):
+        if self.pool is None:
+            orderer = self.move_orderer
+            switches = None
+            if orderer is not None:
+                switches = {"use_threats": orderer.use_threats, "use_killers": orderer.use_killers,
+                            "use_history": orderer.use_history, "killer_slots": orderer.killer_slots}
+            self.shared_alpha = multiprocessing.Value("d", -math.inf)
+            self.current_search = multiprocessing.Value("q", 0, lock=False) # under shared_alpha's lock
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.shared_alpha, self.current_search, self.heuristic_func, self.prepare_board,
+                          self.transposition_table is not None, switches, self.eval_cache,
+                          (self.quiescence_depth, self.quiescence_node_limit),
+                          (self.late_move_reductions, self.max_candidates, self.futility_margin)))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def find_best_move(self, board):
+        if self.workers <= 1 or self.depth < 2:
+            return super().find_best_move(board)
+        tt = self.transposition_table
+        if tt is not None:
+            if self.ai_player != board.current_player: tt.clear()
+            tt.new_search()
+            hits, misses, collisions = tt.hits, tt.misses, tt.collisions
+        if self.move_orderer is not None: self.move_orderer.new_search()
+        self.ai_player = board.current_player
+        self.nodes_explored = 1
+        self.pruning_count = 0
+        self.quiescence_nodes = 0
+        self.selective_stats = dict.fromkeys(self.selective_stats, 0) # local searches only
+        try:
+            return self._parallel_root(board)
+        finally:
+            # Counters of the local table only; workers keep their own tables
+            if tt is not None:
+                self.tt_hits = tt.hits - hits
+                self.tt_misses = tt.misses - misses
+                self.tt_collisions = tt.collisions - collisions
+
+    def _next_search(self, alpha):
+        """Ends the current search for the workers and starts the next one with 'alpha'; returns its id."""
+        with self.shared_alpha.get_lock():
+            self.current_search.value += 1
+            self.shared_alpha.value = alpha
+            return self.current_search.value
+
+    def _parallel_root(self, board):
+        if board.is_terminal(): return None
+        moves = board.get_possible_moves()
+        if not moves: return None
+        moves = self._order_moves(board, moves, self.depth)
+
+        # 1. First move locally, with a full window (its score is exact)
+        board.make_move(*moves[0])
+        try:
+            first_score, _ = self._alphabeta(board, self.depth - 1, -math.inf, math.inf, False)
+        finally:
+            board.undo_move(*moves[0])
+        results = [(first_score, -math.inf)]
+
+        # 2. Remaining moves in parallel, sharing the best score as alpha.
+        # The deadline is a perf_counter() value: a system-wide monotonic clock on Linux.
+        self._start_pool()
+        search_id = self._next_search(first_score)
+        # A few dozen bytes per task; the move order matters to the quiescence search
+        position = CompactBoard.from_board(board).to_bytes(keep_order=True)
+        futures = [self.pool.submit(_search_root_move, position, move, self.depth, self.deadline, search_id)
+                   for move in moves[1:]]
+        try:
+            for future in futures:
+                while True:
+                    try:
+                        score, alpha, nodes, cutoffs = future.result(timeout=0.05)
+                        break
+                    except FutureTimeout:
+                        self._check_limits() # the workers cannot see stop_event
+                results.append((score, alpha))
+                self.nodes_explored += nodes
+                self.pruning_count += cutoffs
+        except (SearchTimeout, SearchCancelled):
+            # Root moves already running in a worker stop at their next node check
+            for future in futures: future.cancel()
+            self._next_search(-math.inf)
+            raise
+
+        # 3. Serial rule: the earliest move with the highest exact score wins.
+        # A score above its alpha is exact; otherwise it is only an upper bound.
+        best_score = max(score for score, alpha in results if score > alpha)
+        best_index = next(i for i, (score, alpha) in enumerate(results) if score > alpha and score == best_score)
+        for i in range(best_index):
+            score, alpha = results[i]
+            if score == best_score: # fail-low bound that may equal the best: resolve it
+                board.make_move(*moves[i])
+                try:
+                    exact, _ = self._alphabeta(board, self.depth - 1, -math.inf, math.inf, False)
+                finally:
+                    board.undo_move(*moves[i])
+                if exact == best_score:
+                    best_index = i
+                    break
+        self.last_score = best_score
+        return moves[best_index]
@@ -0,0 +1,77 @@
+# Precompiled pattern matcher for the H1 pattern table
+
+def flip(pattern):
+    """Swaps X and O, i.e. the same shape seen from the other player."""
+    return pattern.replace("X", "T").replace("O", "X").replace("T", "O")
+
+class PatternMatcher:
+    """
+    Compiles a {pattern: value} table once.
+    Every window of up to 'longest' cells ('.', 'X', 'O') maps to the bitmask of
+    the patterns it starts with; a line's mask is the OR over its start
+    positions, so bit i is set exactly when "pattern_i in line". Values for
+    both player perspectives are precomputed per mask byte. Masks are memoised
+    per line string, since the same lines come back at nearly every leaf.
+    'extra' patterns get a bit but no value (e.g. overline checks).
+    """
+
+    def __init__(self, pattern_scores, extra=(), memo_limit=200000):
+        self.patterns = list(pattern_scores) + [p for p in extra if p not in pattern_scores]
+        self.bit = {p: 1 << i for i, p in enumerate(self.patterns)}
+        self.shortest = min(len(p) for p in self.patterns)
+        self.longest = max(len(p) for p in self.patterns)
+
+        # Window table: all strings over '.XO' of length shortest..longest
+        self.windows = {}
+        level = [""]
+        for length in range(1, self.longest + 1):
+            level = [w + ch for w in level for ch in ".XO"]
+            if length < self.shortest: continue
+            for window in level:
+                mask = 0
+                for p in self.patterns:
+                    if window.startswith(p): mask |= self.bit[p]
+                self.windows[window] = mask
+
+        # Per perspective: value of each byte of a mask ("X" = table as written, "O" = flipped)
+        values = {
+            "X": [pattern_scores.get(p, 0) for p in self.patterns],
+            "O": [pattern_scores.get(flip(p), 0) if p not in extra else 0 for p in self.patterns],
+        }
+        self.byte_tables = {}
+        for player, vals in values.items():
+            tables = []
+            for shift in range(0, len(self.patterns), 8):
+                table = []
+                for byte in range(256):
+                    table.append(sum(vals[shift + i] for i in range(8) if byte >> i & 1 and shift + i < len(vals)))
+                tables.append(table)
+            self.byte_tables[player] = tables
+
+        self.memo = {}
+        self.memo_limit = memo_limit
+
+    def mask(self, line):
+        """Bitmask of the patterns occurring in 'line'."""
+        found = self.memo.get(line)
+        if found is None:
+            found = 0
+            windows = self.windows
+            longest = self.longest
+            for i in range(len(line) - self.shortest + 1):
+                found |= windows[line[i:i + longest]]
+            if len(self.memo) >= self.memo_limit: self.memo.clear()
+            self.memo[line] = found
+        return found
+
+    def value(self, mask, player):
+        """Sum of the values of the patterns in 'mask', from 'player''s perspective."""
+        tables = self.byte_tables["X" if player == "X" else "O"]
+        total = 0
+        for table in tables:
+            total += table[mask & 255]
+            mask >>= 8
+        return total
+
+    def score(self, line, player):
+        return self.value(self.mask(line), player)
@@ -0,0 +1,182 @@
+# Search instrumentation: per-ply counters, phase timers, cutoff indices and optional profiling
+#
+#   instrument = SearchInstrument(profile="cprofile")   # or "sampling" / None
+#   with instrument.capture(bot, board):
+#       move = bot.find_best_move(board)
+#   report = instrument.report()                       # plain dict, JSON-ready
+#
+# Nothing is hooked while no capture is active: the searches only test
+# 'self.instrument is not None' at a cutoff, so the disabled cost is one
+# attribute check per cutoff.
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Recursive search method of each search class; its second argument is the remaining depth
+SEARCH_METHODS = ("_pvs", "_alphabeta", "_minimax")
+
+MISSING = object()
+
+class SearchInstrument:
+
+    def __init__(self, profile=None, sample_interval=0.001, top=15):
+        if profile not in (None, "cprofile", "sampling"):
+            raise ValueError(f"Unknown profiler: {profile}")
+        self.profile = profile
+        self.sample_interval = sample_interval
+        self.top = top
+        self.reset()
+
+    def reset(self):
+        self.nodes = Counter()          # ply -> nodes
+        self.cutoffs = Counter()        # ply -> cutoffs
+        self.cutoff_index = Counter()   # index of the move that caused the cutoff -> count
+        self.timers = Counter()         # phase -> seconds
+        self.calls = Counter()          # phase -> calls
+        self.wall_time = 0.0
+        self.profile_report = None
+        self.root_length = 0            # len(move_history) at the root of the captured search
+
+    # --- Hooks called by the searches ---
+
+    def ply(self, board):
+        # From the real recursion depth: with late-move reductions 'depth' skips plies
+        return len(board.move_history) - self.root_length
+
+    def cutoff(self, board, index):
+        self.cutoffs[self.ply(board)] += 1
+        self.cutoff_index[index] += 1
+
+    # --- Capture ---
+
+    def _timed(self, phase, func):
+        timers, calls, clock = self.timers, self.calls, time.perf_counter
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timers[phase] += clock() - start
+                calls[phase] += 1
+        return wrapper
+
+    def _counted(self, func):
+        nodes, ply = self.nodes, self.ply
+        def wrapper(board, depth, *args):
+            nodes[ply(board)] += 1
+            return func(board, depth, *args)
+        return wrapper
+
+    @contextmanager
+    def capture(self, bot, board):
+        """
+        Instruments one search of 'bot' on 'board' by shadowing methods on the two
+        instances (removed again on exit): node counting on the recursive search
+        method, timers on move generation, ordering, evaluation and terminal checks.
+        """
+        patched = []
+        def patch(obj, name, wrapper):
+            patched.append((obj, name, obj.__dict__.get(name, MISSING)))
+            setattr(obj, name, wrapper)
+
+        for name in SEARCH_METHODS:
+            if hasattr(bot, name):
+                patch(bot, name, self._counted(getattr(bot, name)))
+                break
+        patch(bot, "_evaluate_state", self._timed("evaluation", bot._evaluate_state))
+        if getattr(bot, "batch_heuristic_func", None) is not None:
+            patch(bot, "batch_heuristic_func", self._timed("evaluation", bot.batch_heuristic_func))
+        if hasattr(bot, "_order_moves"): patch(bot, "_order_moves", self._timed("ordering", bot._order_moves))
+        if hasattr(board, "__dict__"): # a __slots__ board (CompactBoard) cannot be patched: no board timers
+            patch(board, "get_possible_moves", self._timed("move_generation", board.get_possible_moves))
+            patch(board, "is_terminal", self._timed("terminal_check", board.is_terminal))
+        self.root_length = len(board.move_history)
+        bot.instrument = self
+
+        profiler = sampler = None
+        if self.profile == "cprofile":
+            profiler = cProfile.Profile()
+        elif self.profile == "sampling":
+            sampler = Sampler(threading.get_ident(), self.sample_interval)
+        start = time.perf_counter()
+        try:
+            if profiler is not None: profiler.enable()
+            if sampler is not None: sampler.start()
+            yield self
+        finally:
+            if profiler is not None: profiler.disable()
+            if sampler is not None: sampler.stop()
+            self.wall_time += time.perf_counter() - start
+            bot.instrument = None
+            for obj, name, original in reversed(patched):
+                if original is MISSING: delattr(obj, name)
+                else: setattr(obj, name, original)
+            if profiler is not None: self.profile_report = cprofile_summary(profiler, self.top)
+            if sampler is not None: self.profile_report = sampler.summary(self.top)
+
+    # --- Output ---
+
+    def report(self):
+        """Everything collected so far as a plain dict."""
+        total_cutoffs = sum(self.cutoff_index.values())
+        return {
+            "wall_time": self.wall_time,
+            "nodes_per_ply": {ply: self.nodes[ply] for ply in sorted(self.nodes)},
+            "cutoffs_per_ply": {ply: self.cutoffs[ply] for ply in sorted(self.cutoffs)},
+            # Share of cutoffs caused by the first move searched: 1.0 is perfect ordering
+            "first_move_cutoff_rate": self.cutoff_index[0] / total_cutoffs if total_cutoffs else None,
+            "cutoff_index": {index: self.cutoff_index[index] for index in sorted(self.cutoff_index)},
+            "phase_seconds": dict(self.timers),
+            "phase_calls": dict(self.calls),
+            "profile": self.profile_report,
+        }
+
+def cprofile_summary(profiler, top):
+    """The 'top' functions by cumulative time, as dicts."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({"function": f"{filename.rsplit('/', 1)[-1]}:{line}({function})",
+                     "calls": calls, "own_seconds": own, "cumulative_seconds": cumulative})
+    rows.sort(key=lambda row: -row["cumulative_seconds"])
+    return {"profiler": "cprofile", "functions": rows[:top]}
+
+class Sampler:
+    """Samples the innermost frame of one thread every 'interval' seconds (low overhead, statistical)."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self.total = 0
+        self.running = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.running.set()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+        self.thread.join()
+
+    def _run(self):
+        while self.running.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                code = frame.f_code
+                self.samples[f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno}({code.co_name})"] += 1
+                self.total += 1
+            time.sleep(self.interval)
+
+    def summary(self, top):
+        return {"profiler": "sampling", "samples": self.total,
+                "functions": [{"function": name, "samples": count, "share": count / self.total}
+                              for name, count in self.samples.most_common(top)]}
@@ -0,0 +1,314 @@
+# Threat-space search: forced wins by continuous fours (VCF) or fours and threes (VCT)
+
+import time
+from Board import neighbour_table
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+class NodeLimitReached(Exception):
+    pass
+
+# Shared with AlphaBeta (which imports this module), so one except clause covers both searches
+class SearchTimeout(Exception):
+    """Raised inside the search when the wall-clock deadline has passed."""
+
+class SearchCancelled(Exception):
+    """Raised inside the search when its stop_event is set; the search is abandoned."""
+
+def other(player):
+    return "O" if player == "X" else "X"
+
+def makes_five(grid, r, c, player, directions=DIRECTIONS):
+    """
+    Would a 'player' stone on (r, c) be part of exactly five in a row?
+    Grid-only version of Board.check_winner, so it also works while probing
+    cells by writing to the grid directly (on any Board backend).
+    """
+    n = len(grid)
+    for dr, dc in directions:
+        count = 1
+        for sign in (1, -1):
+            x, y = r + sign * dr, c + sign * dc
+            while 0 <= x < n and 0 <= y < n and grid[x][y] == player:
+                count += 1
+                x += sign * dr; y += sign * dc
+        if count == 5: return True
+    return False
+
+# Per (size, reach): the cells within 'reach' of every cell along each direction
+WINDOW_TABLES = {}
+
+def line_window(n, r, c, dr, dc, reach=4):
+    """Cells within 'reach' steps of (r, c) along one line, (r, c) included."""
+    table = WINDOW_TABLES.get((n, reach))
+    if table is None:
+        table = WINDOW_TABLES[(n, reach)] = {
+            (x, y, ddr, ddc): [(x + k * ddr, y + k * ddc) for k in range(-reach, reach + 1)
+                               if 0 <= x + k * ddr < n and 0 <= y + k * ddc < n]
+            for x in range(n) for y in range(n) for ddr, ddc in DIRECTIONS}
+    return table[(r, c, dr, dc)]
+
+def line_cells(board, r, c, dr, dc, reach):
+    """Empty cells within 'reach' steps of (r, c) along one line, both sides."""
+    grid = board.board
+    return [(x, y) for x, y in line_window(board.size, r, c, dr, dc, reach)
+            if (x, y) != (r, c) and grid[x][y] == "."]
+
+def line_threats(grid, r, c, dr, dc, player):
+    """
+    Empty cells within 4 of (r, c) on one line where 'player' would make exactly
+    five on that line. A five needs four stones in the window, so most lines
+    are rejected by the count alone.
+    """
+    window = line_window(len(grid), r, c, dr, dc)
+    if [grid[x][y] for x, y in window].count(player) < 4: return []
+    return [(x, y) for x, y in window if grid[x][y] == "." and makes_five(grid, x, y, player, ((dr, dc),))]
+
+def winning_cells(board, player):
+    """Empty cells where 'player' would make exactly five (same rule as Board.check_winner)."""
+    # A five-completing cell always touches one of the player's stones, so the frontier is enough
+    cells = board.frontier if board.move_history else ()
+    grid = board.board
+    return sorted((cell for cell in cells if makes_five(grid, cell[0], cell[1], player)),
+                  key=board.move_rank.__getitem__)
+
+def threats_through(board, r, c, player):
+    """
+    Winning cells of 'player' on the four lines through its stone at (r, c),
+    each checked along its own line: the fives this stone helps to make.
+    """
+    threats = set()
+    for dr, dc in DIRECTIONS:
+        threats.update(line_threats(board.board, r, c, dr, dc, player))
+    return threats
+
+def open_four_cells(board, r, c, player):
+    """
+    Cells on the lines through (r, c) where 'player' would get two or more
+    winning cells on that same line (an open four): the threat of a three.
+    Forks across other lines through the cell do not count, they do not
+    involve (r, c).
+    """
+    cells = set()
+    grid = board.board
+    for dr, dc in DIRECTIONS:
+        # Three stones in the window, or the probe cannot reach four
+        if [grid[x][y] for x, y in line_window(board.size, r, c, dr, dc)].count(player) < 3: continue
+        for x, y in line_cells(board, r, c, dr, dc, 4):
+            grid[x][y] = player # probe on the grid only; restored below
+            try:
+                if len(line_threats(grid, x, y, dr, dc, player)) >= 2: cells.add((x, y))
+            finally:
+                grid[x][y] = "."
+    return cells
+
+def forcing_moves(board, player, around, threes=True):
+    """
+    Forcing moves of 'player' along the lines through the cells 'around'
+    (usually the last moves), as three lists of empty cells where a 'player'
+    stone would make: an open four or double four (two or more winning cells),
+    a four, an open three (no four). Only shapes on those lines are seen, so
+    this is a cheap, local version of ThreatSearch's _four_moves / _three_moves;
+    'threes=False' skips the (costlier) three check.
+    """
+    grid = board.board
+    n = board.size
+    threats = {} # cell -> winning cells it creates
+    three_cells = set()
+    seen = set()
+    for r, c in around:
+        for dr, dc in DIRECTIONS:
+            # A three needs two stones already within reach of the line's cells
+            if [grid[x][y] for x, y in line_window(n, r, c, dr, dc, 8)].count(player) < 2: continue
+            for x, y in line_window(n, r, c, dr, dc):
+                if grid[x][y] != "." or (x, y, dr, dc) in seen: continue
+                seen.add((x, y, dr, dc))
+                grid[x][y] = player # probe on the grid only; restored below
+                try:
+                    wins = line_threats(grid, x, y, dr, dc, player)
+                    if wins: threats.setdefault((x, y), set()).update(wins)
+                    elif threes and _makes_open_three(grid, n, x, y, dr, dc, player): three_cells.add((x, y))
+                finally:
+                    grid[x][y] = "."
+    rank = board.move_rank.__getitem__
+    open_fours = sorted((cell for cell, wins in threats.items() if len(wins) >= 2), key=rank)
+    fours = sorted((cell for cell, wins in threats.items() if len(wins) == 1), key=rank)
+    open_threes = sorted(three_cells - threats.keys(), key=rank)
+    return open_fours, fours, open_threes
+
+def _makes_open_three(grid, n, r, c, dr, dc, player):
+    # Some empty cell within 4 on the line would then make an open four on it
+    window = line_window(n, r, c, dr, dc)
+    if [grid[x][y] for x, y in window].count(player) < 3: return False
+    for x, y in window:
+        if grid[x][y] != ".": continue
+        grid[x][y] = player
+        try:
+            if len(line_threats(grid, x, y, dr, dc, player)) >= 2: return True
+        finally:
+            grid[x][y] = "."
+    return False
+
+class ThreatSearch:
+    """
+    Searches only forcing moves for the side to move (the attacker):
+    - VCF: every attacker move makes a four, so the defender's reply is forced.
+    - VCT: attacker moves may also make open threes; the defender then tries
+      every cell of the lines through the three plus all of its own fours.
+    Fives follow the exact-five rule of Board.check_winner.
+    solve() returns (kind, move) with kind "win", "block", "vcf" or "vct",
+    or None when nothing is proved within the limits (node_limit, and the
+    optional 'time_limit' and smaller 'node_limit' of solve()). Setting stop_event (a threading.Event,
+    like AlphaBeta.stop_event) makes solve() raise SearchCancelled.
+    """
+
+    def __init__(self, max_vcf_depth=12, max_vct_depth=3, node_limit=1000):
+        self.max_vcf_depth = max_vcf_depth
+        self.max_vct_depth = max_vct_depth
+        self.node_limit = node_limit
+        self.budget = node_limit # node limit of the current solve()
+        self.nodes_explored = 0
+        self.principal_line = []
+        self.deadline = None   # time.perf_counter() value; None = only the node limit
+        self.stop_event = None # threading.Event checked at every node; set = cancel the search
+
+    def solve(self, board, time_limit=None, node_limit=None):
+        self.nodes_explored = 0
+        self.budget = self.node_limit if node_limit is None else min(node_limit, self.node_limit)
+        self.principal_line = []
+        self.deadline = time.perf_counter() + time_limit if time_limit else None
+        if board.is_terminal() or not board.move_history: return None
+        attacker = board.current_player
+        defender = other(attacker)
+
+        wins = winning_cells(board, attacker)
+        if wins: return "win", wins[0]
+        blocks = winning_cells(board, defender)
+        if blocks: return "block", blocks[0] # mandatory defence against a five
+
+        try:
+            line = self.vcf(board, attacker, self.max_vcf_depth)
+            if line:
+                self.principal_line = line
+                return "vcf", line[0]
+            line = self.vct(board, attacker, self.max_vct_depth)
+            if line:
+                self.principal_line = line
+                return "vct", line[0]
+        except (NodeLimitReached, SearchTimeout):
+            pass
+        finally:
+            self.deadline = None
+        return None
+
+    # --- Move generation ---
+
+    def _candidates(self, board, player):
+        """Empty cells within 2 of the player's stones: the only cells that can make a four or three."""
+        neighbours, _ = neighbour_table(board.size, 2)
+        cells = set()
+        for r, c in board.move_history:
+            if board.board[r][c] == player:
+                for x, y in neighbours[(r, c)]:
+                    if board.board[x][y] == ".": cells.add((x, y))
+        return sorted(cells, key=board.move_rank.__getitem__)
+
+    def _four_moves(self, board, player):
+        """[(move, winning cells it creates)] for every move that makes a four."""
+        fours = []
+        for r, c in self._candidates(board, player):
+            board.board[r][c] = player
+            try:
+                threats = threats_through(board, r, c, player)
+            finally:
+                board.board[r][c] = "."
+            if threats: fours.append(((r, c), threats))
+        fours.sort(key=lambda f: -len(f[1]))
+        return fours
+
+    def _three_moves(self, board, player):
+        """[(move, open-four cells it creates)] for every move that makes an open three (and no four)."""
+        threes = []
+        for r, c in self._candidates(board, player):
+            board.board[r][c] = player
+            try:
+                if threats_through(board, r, c, player): continue
+                cells = open_four_cells(board, r, c, player)
+            finally:
+                board.board[r][c] = "."
+            if cells: threes.append(((r, c), cells))
+        threes.sort(key=lambda t: -len(t[1]))
+        return threes
+
+    def _count_node(self):
+        self.nodes_explored += 1
+        if self.nodes_explored > self.budget: raise NodeLimitReached()
+        if self.deadline is not None and time.perf_counter() > self.deadline: raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set(): raise SearchCancelled()
+
+    # --- Searches (attacker to move) ---
+
+    def vcf(self, board, attacker, depth):
+        """Forced win by continuous fours: the move sequence, or None."""
+        self._count_node()
+        defender = other(attacker)
+        wins = winning_cells(board, attacker)
+        if wins: return [wins[0]]
+        if depth == 0 or winning_cells(board, defender): return None
+        for move, threats in self._four_moves(board, attacker):
+            if len(threats) >= 2: return [move] # open four / double four: cannot be blocked
+            block = next(iter(threats))
+            line = self._after_forced_block(board, move, block, lambda: self.vcf(board, attacker, depth - 1))
+            if line: return [move, block] + line
+        return None
+
+    def vct(self, board, attacker, depth):
+        """Forced win by fours and open threes: the move sequence, or None."""
+        self._count_node()
+        line = self.vcf(board, attacker, self.max_vcf_depth)
+        if line: return line
+        defender = other(attacker)
+        if depth == 0 or winning_cells(board, defender): return None
+
+        for move, threats in self._four_moves(board, attacker):
+            if len(threats) >= 2: return [move]
+            block = next(iter(threats))
+            line = self._after_forced_block(board, move, block, lambda: self.vct(board, attacker, depth - 1))
+            if line: return [move, block] + line
+
+        for move, _ in self._three_moves(board, attacker):
+            board.make_move(*move)
+            try:
+                refuted = False
+                for reply in self._defences(board, move, defender):
+                    board.make_move(*reply)
+                    try:
+                        if makes_five(board.board, reply[0], reply[1], defender) or not self.vct(board, attacker, depth - 1):
+                            refuted = True
+                    finally:
+                        board.undo_move(*reply)
+                    if refuted: break
+            finally:
+                board.undo_move(*move)
+            if not refuted: return [move]
+        return None
+
+    def _after_forced_block(self, board, move, block, continuation):
+        board.make_move(*move)
+        try:
+            board.make_move(*block)
+            try:
+                if makes_five(board.board, block[0], block[1], board.board[block[0]][block[1]]): return None
+                return continuation()
+            finally:
+                board.undo_move(*block)
+        finally:
+            board.undo_move(*move)
+
+    def _defences(self, board, move, defender):
+        """Replies to a three at 'move': any cell of its lines, or a four of the defender's own."""
+        replies = set()
+        for dr, dc in DIRECTIONS:
+            replies.update(line_cells(board, move[0], move[1], dr, dc, 5))
+        replies.update(m for m, _ in self._four_moves(board, defender))
+        return sorted(replies, key=board.move_rank.__getitem__)
@@ -0,0 +1,54 @@
+# Fixed-size transposition table keyed by Board.hash (Zobrist)
+
+# Bound types of a stored score
+EXACT = 0
+LOWER = 1 # score is a lower bound (search failed high)
+UPPER = 2 # score is an upper bound (search failed low)
+
+class TranspositionTable:
+    """
+    One entry per slot: (key, depth, flag, score, best_move, generation, context).
+    'context' is None, or whatever else than the position the score depends on
+    (see AlphaBeta._context); the searches only reuse the score when it matches.
+    Replacement policy: an entry is overwritten by any entry of a newer search
+    (generation), or by a search at least as deep.
+    The table outlives find_best_move() calls, so later turns reuse earlier work.
+    """
+
+    def __init__(self, size=1 << 18):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0 # slot held a different position
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key):
+        entry = self.entries[key % self.size]
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != key:
+            self.collisions += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def peek(self, key):
+        """probe() without the counters: safe from another thread than the searching one."""
+        entry = self.entries[key % self.size]
+        return entry if entry is not None and entry[0] == key else None
+
+    def store(self, key, depth, flag, score, best_move, context=None):
+        slot = key % self.size
+        old = self.entries[slot]
+        if old is None or old[5] != self.generation or depth >= old[1]:
+            self.entries[slot] = (key, depth, flag, score, best_move, self.generation, context)
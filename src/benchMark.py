@@ -1,24 +1,45 @@
 ''' Conducts automated performance testing of the AI algorithms (Minimax vs. AlphaBeta)
     across standardized game scenarios. It generates the (Time, Nodes Explored, Pruning Counts) 
     required for the "Experiments & Results" section of the project documentation.'''
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
 import time
+import traceback
+import tracemalloc
 from Board import Board
+from BitBoard import BitBoard
+from CompactBoard import CompactBoard
 from Minimax import Minimax
 from AlphaBeta import AlphaBeta
 from HeuristicEvaluator import evaluate, evaluate_distance_to_center, evaluate_freedom
+from HeuristicEvaluator import MATCHER, get_lines, get_lines_join, evaluate_join, evaluate_line, evaluate_line_substring
+from TranspositionTable import TranspositionTable
+from MoveOrdering import MoveOrderer
+from ParallelAlphaBeta import ParallelAlphaBeta
+from ThreatSearch import ThreatSearch
+from PVSAlphaBeta import PVSAlphaBeta
+from AIController import SELECTIVE_OPTIONS, MEDIUM_WEIGHTS, HARD_WEIGHTS
 
 # --- HEURISTIC COMBINATIONS ---
 
+# Same weights as the AIController modes, so the benchmark follows any tuning
 def h_medium(board_grid, player):
     """H1 + H2 (Pattern + Center)"""
-    return evaluate(board_grid, player) + evaluate_distance_to_center(board_grid, player)
+    w1, w2, _ = MEDIUM_WEIGHTS
+    return (evaluate(board_grid, player) * w1) + (evaluate_distance_to_center(board_grid, player) * w2)
 
 def h_hard(board_grid, player):
     """H1 + H2 + H3 (Pattern + Center + Freedom)"""
+    w1, w2, w3 = HARD_WEIGHTS
     h1 = evaluate(board_grid, player)
     h2 = evaluate_distance_to_center(board_grid, player)
     h3 = evaluate_freedom(board_grid, player)
-    return (h1 * 1.5) + h2 + h3
+    return (h1 * w1) + (h2 * w2) + (h3 * w3)
 
 # --- TEST SCENARIOS ---
 SCENARIOS = {
@@ -32,8 +53,24 @@ SCENARIOS = {
     ]
 }
 
+# Tactical positions with a forced win for the side to move (threat-space search)
+TACTICAL_SCENARIOS = {
+    "T1. Open Three": [(7, 6), (0, 0), (7, 7), (0, 14), (7, 8), (14, 0)],
+    "T2. Double Four": [(7, 7), (7, 6), (7, 8), (3, 3), (7, 9), (3, 5), (8, 11), (12, 11), (9, 11), (3, 7), (10, 11), (13, 0)],
+    "T3. Double Three": [(7, 7), (0, 0), (7, 8), (0, 3), (8, 9), (14, 14), (9, 9), (14, 10)],
+}
+
+# Quiet-looking openings where AlphaBeta at depth 3 and at depth 5 choose different moves
+HORIZON_SCENARIOS = {
+    "H1. Broken Three": [(7, 7), (7, 6), (6, 8), (7, 8), (5, 7)],
+    "H2. Column Pair": [(7, 7), (6, 7), (8, 7), (9, 6), (7, 6)],
+    "H3. Cross": [(7, 7), (8, 8), (6, 7), (8, 6), (9, 8)],
+    "H4. Capped Column": [(7, 7), (8, 7), (9, 7), (7, 6), (6, 7), (7, 8), (7, 9)],
+}
+
 # --- ALGORITHM CONFIGURATIONS ---
-# Format: ("Name", Class, Depth, Heuristic_Function)
+# Format: ("Name", Class, Depth, Heuristic_Function[, Options])
+# Options (optional) maps constructor keywords to factories, so every run gets fresh objects.
 CONFIGS = [
     # 1. NO HEURISTICS (Control Group / "Blind" Search)
     # These bots return 0 for any state that isn't a Win/Loss.
@@ -47,40 +84,606 @@ CONFIGS = [
     # 3. ALPHABETA VARIANTS (Comparing Heuristics on optimized search)
     ("AlphaBeta H1+H2",    AlphaBeta, 3, h_medium),
     ("AlphaBeta H1+H2+H3", AlphaBeta, 4, h_hard),
+
+    # 4. ALPHABETA + TRANSPOSITION TABLE
+    ("AlphaBeta H1+H2+H3 TT", AlphaBeta, 4, h_hard, {"transposition_table": TranspositionTable}),
+
+    # 5. ALPHABETA + MOVE ORDERING (threats, killers, history)
+    ("AlphaBeta H1+H2+H3 Ord", AlphaBeta, 4, h_hard, {"move_orderer": MoveOrderer}),
+
+    # 6. PRINCIPAL VARIATION SEARCH (negamax, null windows)
+    ("PVS H1+H2+H3 Ord",       PVSAlphaBeta, 4, h_hard, {"move_orderer": MoveOrderer}),
+    ("PVS H1+H2+H3 TT+Ord",    PVSAlphaBeta, 4, h_hard, {"transposition_table": TranspositionTable, "move_orderer": MoveOrderer}),
+
+    # 7. QUIESCENCE (forcing moves past the horizon) at depth 3
+    ("AlphaBeta H1+H2+H3 Q TT+Ord", AlphaBeta, 3, h_hard, {"transposition_table": TranspositionTable, "move_orderer": MoveOrderer,
+                                                          "quiescence_depth": lambda: 4}),
+
+    # 8. SELECTIVE SEARCH (late-move reductions, candidate cap, futility pruning) at depth 6
+    ("AlphaBeta Sel D6 Q TT+Ord", AlphaBeta, 6, h_hard, {"transposition_table": TranspositionTable, "move_orderer": MoveOrderer,
+                                                        "quiescence_depth": lambda: 4,
+                                                        **{key: (lambda value=value: value) for key, value in SELECTIVE_OPTIONS.items()}}),
+]
+
+# --- SELECTIVE SEARCH RUNS ---
+# Format: ("Name", depth, AlphaBeta selective keywords); compared with a full-width reference search
+SELECTIVE_RUNS = [
+    ("D4 full",     4, {}),
+    ("D4 LMR",      4, {"late_move_reductions": True}),
+    ("D4 cap",      4, {"max_candidates": SELECTIVE_OPTIONS["max_candidates"]}),
+    ("D4 futility", 4, {"futility_margin": SELECTIVE_OPTIONS["futility_margin"]}),
+    ("D4 all",      4, SELECTIVE_OPTIONS),
+    ("D6 all",      6, SELECTIVE_OPTIONS),
+]
+
+# --- MOVE ORDERING VARIANTS ---
+# Format: ("Name", MoveOrderer keywords or None for the plain centre-distance order)
+ORDERINGS = [
+    ("Centre only",       None),
+    ("Threats",           {"use_killers": False, "use_history": False}),
+    ("Threats+Killers",   {"use_history": False}),
+    ("Threats+K+History", {}),
 ]
 
-def run_benchmark():
-    # Header
-    print(f"{'SCENARIO':<20} | {'VARIANT':<20} | {'TIME':<8} | {'NODES':<8} | {'PRUNED':<8} | {'MOVE'}")
-    print("=" * 95)
+# --- POSITION CORPUS ---
+
+def generate_positions(count=24, seed=2024, size=15, min_plies=4, max_plies=24):
+    """
+    Reproducible mid-game positions: random candidate moves (nearest the centre
+    more likely) from the centre opening, stopped before any win.
+    """
+    rng = random.Random(seed)
+    positions = {}
+    while len(positions) < count:
+        board = Board(size=size)
+        plies = rng.randint(min_plies, max_plies)
+        for _ in range(plies):
+            moves = board.get_possible_moves()
+            move = moves[min(int(rng.expovariate(0.25)), len(moves) - 1)]
+            board.make_move(*move)
+            if board.is_terminal(): break
+        if board.is_terminal(): continue
+        positions[f"C{len(positions) + 1:02d}. Random {len(board.move_history)} plies"] = list(board.move_history)
+    return positions
+
+POSITION_SETS = {
+    "scenarios": lambda: SCENARIOS,
+    "tactical": lambda: TACTICAL_SCENARIOS,
+    "horizon": lambda: HORIZON_SCENARIOS,
+    "corpus": generate_positions,
+}
+
+def load_positions(names=("scenarios",), size=15):
+    positions = {}
+    for name in names:
+        positions.update(POSITION_SETS[name]())
+    return positions_for_size(positions, size)
+
+def positions_for_size(positions, size):
+    """
+    The (15x15) positions moved onto a 'size' board, keeping their offset from the
+    centre: the same shapes, further from the edges on larger boards.
+    """
+    shift = size // 2 - 7
+    return {name: [(r + shift, c + shift) for r, c in moves] for name, moves in positions.items()}
+
+# --- STATISTICAL SUITE ---
+
+def quartiles(values):
+    """(first quartile, median, third quartile), linear interpolation."""
+    ordered = sorted(values)
+    def at(q):
+        position = (len(ordered) - 1) * q
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+    return at(0.25), at(0.5), at(0.75)
+
+def benchmark_error(stage, error):
+    """Structured description of a failed measurement."""
+    frame = traceback.extract_tb(error.__traceback__)[-1] if error.__traceback__ else None
+    return {
+        "stage": stage, "type": type(error).__name__, "message": str(error),
+        "location": f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}" if frame else None,
+    }
+
+def measure(config, moves, repeats=5, warmup=1, board_class=Board, size=15):
+    """
+    Times one (position, config) pair: 'warmup' untimed runs, then 'repeats' timed
+    runs, each with a fresh board and bot. Returns a result dict; on failure the
+    dict has an "error" entry instead of the timings.
+    """
+    name, AlgoClass, depth, h_func, *options = config
+    result = {"config": name, "depth": depth}
+    stage = "setup"
+    try:
+        times = []
+        for run in range(warmup + repeats):
+            stage = "setup"
+            board = board_class(size=size)
+            for r, c in moves:
+                if not board.make_move(r, c): raise ValueError(f"Illegal move in position: {(r, c)}")
+            kwargs = {key: factory() for key, factory in (options[0] if options else {}).items()}
+            bot = AlgoClass(depth=depth, heuristic_func=h_func, **kwargs)
+            stage = "search"
+            start = time.perf_counter()
+            move = bot.find_best_move(board)
+            elapsed = time.perf_counter() - start
+            if run >= warmup: times.append(elapsed)
+    except Exception as error: # reported per pair, the rest of the suite still runs
+        result["error"] = benchmark_error(stage, error)
+        return result
+
+    q1, median, q3 = quartiles(times)
+    nodes = bot.nodes_explored
+    result.update({
+        "move": list(move) if move else None, "runs": len(times),
+        "median": median, "iqr": q3 - q1, "min": min(times), "times": times,
+        "nodes": nodes, "nodes_per_second": nodes / median if median else None,
+        # Effective branching factor: the b with b ** depth == nodes
+        "ebf": nodes ** (1 / depth) if depth else None,
+        "pruned": getattr(bot, "pruning_count", 0),
+        "tt": [getattr(bot, "tt_hits", 0), getattr(bot, "tt_misses", 0), getattr(bot, "tt_collisions", 0)],
+    })
+    return result
+
+def run_benchmark(board_class=Board, repeats=5, warmup=1, positions=None, configs=None, size=15):
+    """
+    Repeated, warmed-up measurements of every (position, config) pair on a 'size' board
+    (positions given for that size, see positions_for_size()).
+    Prints median time and IQR, nodes, nodes/s and effective branching factor;
+    returns the list of result dicts (see measure()).
+    """
+    positions = positions if positions is not None else SCENARIOS
+    configs = configs if configs is not None else CONFIGS
+    print(f"{'POSITION':<24} | {'VARIANT':<22} | {'MEDIAN':<9} | {'IQR':<8} | {'NODES':<8} | {'NODES/S':<8} | {'EBF':<5} | {'PRUNED':<8} | {'MOVE'}")
+    print("=" * 125)
+
+    results = []
+    for scen_name, moves in positions.items():
+        for config in configs:
+            result = measure(config, moves, repeats, warmup, board_class, size)
+            result["position"] = scen_name
+            if size != 15: result["size"] = size
+            results.append(result)
+            if "error" in result:
+                error = result["error"]
+                print(f"{scen_name:<24} | {config[0]:<22} | ERROR in {error['stage']}: {error['type']}: {error['message']} ({error['location']})")
+                continue
+            move = tuple(result["move"]) if result["move"] else None
+            print(f"{scen_name:<24} | {config[0]:<22} | {result['median']:.4f}s | {result['iqr']:.4f}s | {result['nodes']:<8} | "
+                  f"{result['nodes_per_second']:<8.0f} | {result['ebf']:<5.2f} | {result['pruned']:<8} | {move}")
+
+    print("=" * 125)
+    return results
+
+def save_results(path, results, repeats, warmup):
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+        "platform": platform.platform(), "repeats": repeats, "warmup": warmup, "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+
+def compare_results(results, baseline_path, threshold=0.10):
+    """
+    Flags pairs that got slower than the saved baseline: the median grew by more
+    than 'threshold' (relative) and by more than the baseline's IQR. Node counts
+    are deterministic, so any change there, a changed move or a new error is flagged too.
+    Returns the list of regression messages.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["position"], r["config"], r.get("size", 15)): r for r in json.load(f)["results"]}
+    regressions = []
+    print(f"{'POSITION':<24} | {'VARIANT':<22} | {'BASE':<9} | {'NOW':<9} | {'CHANGE':<8} | {'STATUS'}")
+    print("=" * 100)
+    for result in results:
+        key = (result["position"], result["config"], result.get("size", 15))
+        base = baseline.get(key)
+        if base is None: continue
+        if "error" in result or "error" in base:
+            if "error" in result and "error" not in base:
+                regressions.append(f"{key}: now fails ({result['error']['type']}: {result['error']['message']})")
+                print(f"{key[0]:<24} | {key[1]:<22} | {'-':<9} | {'-':<9} | {'-':<8} | NOW FAILS")
+            continue
+        change = (result["median"] - base["median"]) / base["median"] if base["median"] else 0.0
+        problems = []
+        if change > threshold and result["median"] - base["median"] > base["iqr"]: problems.append("SLOWER")
+        if result["nodes"] != base["nodes"]: problems.append(f"NODES {base['nodes']}->{result['nodes']}")
+        if result["move"] != base["move"]: problems.append(f"MOVE {base['move']}->{result['move']}")
+        status = ", ".join(problems) if problems else "ok"
+        if problems: regressions.append(f"{key}: {status}")
+        print(f"{key[0]:<24} | {key[1]:<22} | {base['median']:.4f}s | {result['median']:.4f}s | {change:+7.1%} | {status}")
+    print("=" * 100)
+    print(f"{len(regressions)} regression(s) against {baseline_path}")
+    return regressions
+
+def run_ordering_benchmark(depth=4, h_func=h_hard):
+    """
+    Nodes and cutoffs of AlphaBeta per ordering variant, relative to the centre-only order.
+    CUT RATE is cutoffs per 100 nodes: better ordering cuts earlier, so it rises as nodes drop.
+    """
+    print(f"{'SCENARIO':<20} | {'ORDERING':<18} | {'TIME':<8} | {'NODES':<8} | {'CUTOFFS':<8} | {'NODES %':<8} | {'CUT RATE':<14} | {'MOVE'}")
+    print("=" * 115)
 
     for scen_name, moves in SCENARIOS.items():
-        for name, AlgoClass, depth, h_func in CONFIGS:
-            # 1. Setup Board
+        base_nodes = base_rate = None
+        for name, options in ORDERINGS:
             board = Board(size=15)
             for r, c in moves:
                 board.make_move(r, c)
-            
-            # 2. Instantiate Bot
-            # Passing 'None' as h_func works because your classes handle "if self.heuristic_func:"
-            bot = AlgoClass(depth=depth, heuristic_func=h_func)
-            
-            # 3. Run & Time
+            orderer = MoveOrderer(**options) if options is not None else None
+            bot = AlphaBeta(depth=depth, heuristic_func=h_func, move_orderer=orderer)
+
             start = time.time()
+            move = bot.find_best_move(board)
+            elapsed = time.time() - start
+
+            nodes, cutoffs = bot.nodes_explored, bot.pruning_count
+            rate = cutoffs / nodes * 100
+            if base_nodes is None: base_nodes, base_rate = nodes, rate
+            d_nodes = (nodes - base_nodes) / base_nodes * 100
+            d_rate = rate - base_rate
+            print(f"{scen_name:<20} | {name:<18} | {elapsed:.4f}s  | {nodes:<8} | {cutoffs:<8} | {d_nodes:+7.1f}% | {rate:5.1f} ({d_rate:+5.1f}) | {move}")
+
+    print("=" * 115)
+
+# --- BOARD BACKENDS ---
+BACKENDS = [("List", Board), ("Bitboard", BitBoard), ("Compact", CompactBoard)]
+
+def run_backend_benchmark(repeats=2000, depth=3, h_func=h_medium):
+    """Win detection micro-benchmark and a full AlphaBeta search per board backend."""
+    print(f"{'SCENARIO':<20} | {'BACKEND':<10} | {'CHECK_WINNER':<13} | {'IS_TERMINAL':<12} | {'SEARCH':<9} | {'NODES':<8} | {'MOVE'}")
+    print("=" * 100)
+
+    for scen_name, moves in SCENARIOS.items():
+        for name, board_class in BACKENDS:
+            board = board_class(size=15)
+            for r, c in moves:
+                board.make_move(r, c)
+            cells = [(r, c) for r in range(board.size) for c in range(board.size)]
+
+            start = time.perf_counter()
+            for _ in range(repeats // len(cells) + 1):
+                for r, c in cells:
+                    board.check_winner(r, c, "X")
+            winner_time = (time.perf_counter() - start) / ((repeats // len(cells) + 1) * len(cells))
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                board.is_terminal()
+            terminal_time = (time.perf_counter() - start) / repeats
+
+            bot = AlphaBeta(depth=depth, heuristic_func=h_func)
+            start = time.perf_counter()
+            move = bot.find_best_move(board)
+            search_time = time.perf_counter() - start
+
+            print(f"{scen_name:<20} | {name:<10} | {winner_time * 1e6:9.2f} us | {terminal_time * 1e6:8.2f} us | {search_time:.4f}s | {bot.nodes_explored:<8} | {move}")
+
+    print("=" * 100)
+
+def run_parallel_benchmark(worker_counts=(1, 2, 4, 8), depth=4, h_func=h_hard):
+    """Speed-up and efficiency (speed-up / workers) of ParallelAlphaBeta against the serial search."""
+    print(f"{'SCENARIO':<20} | {'WORKERS':<7} | {'TIME':<8} | {'SPEED-UP':<8} | {'EFFICIENCY':<10} | {'NODES':<8} | {'SAME MOVE':<9} | {'MOVE'}")
+    print("=" * 105)
+
+    for scen_name, moves in SCENARIOS.items():
+        board = Board(size=15)
+        for r, c in moves:
+            board.make_move(r, c)
+
+        serial = AlphaBeta(depth=depth, heuristic_func=h_func, move_orderer=MoveOrderer())
+        start = time.perf_counter()
+        serial_move = serial.find_best_move(board)
+        serial_time = time.perf_counter() - start
+        print(f"{scen_name:<20} | {'serial':<7} | {serial_time:.4f}s | {1.0:<8.2f} | {1.0:<10.2f} | {serial.nodes_explored:<8} | {'-':<9} | {serial_move}")
+
+        for workers in worker_counts:
+            bot = ParallelAlphaBeta(depth=depth, heuristic_func=h_func, move_orderer=MoveOrderer(), workers=workers)
+            bot._start_pool() # Pool start-up is not part of the search time
             try:
+                start = time.perf_counter()
                 move = bot.find_best_move(board)
-                elapsed = time.time() - start
-                
-                # 4. Gather Stats
+                elapsed = time.perf_counter() - start
+            finally:
+                bot.close()
+            speed_up = serial_time / elapsed
+            print(f"{scen_name:<20} | {workers:<7} | {elapsed:.4f}s | {speed_up:<8.2f} | {speed_up / workers:<10.2f} | {bot.nodes_explored:<8} | {str(move == serial_move):<9} | {move}")
+
+    print("=" * 105)
+
+def run_threat_benchmark(depth=4, h_func=h_hard):
+    """ThreatSearch against AlphaBeta (with move ordering) on all scenarios, tactical ones included."""
+    print(f"{'SCENARIO':<20} | {'SOLVER':<12} | {'TIME':<8} | {'NODES':<8} | {'RESULT':<6} | {'MOVE'}")
+    print("=" * 80)
+
+    for scen_name, moves in {**SCENARIOS, **TACTICAL_SCENARIOS}.items():
+        board = Board(size=15)
+        for r, c in moves:
+            board.make_move(r, c)
+
+        solver = ThreatSearch()
+        start = time.perf_counter()
+        result = solver.solve(board)
+        elapsed = time.perf_counter() - start
+        kind, move = result if result else ("-", None)
+        print(f"{scen_name:<20} | {'ThreatSearch':<12} | {elapsed:.4f}s | {solver.nodes_explored:<8} | {kind:<6} | {move}")
+
+        bot = AlphaBeta(depth=depth, heuristic_func=h_func, move_orderer=MoveOrderer())
+        start = time.perf_counter()
+        move = bot.find_best_move(board)
+        elapsed = time.perf_counter() - start
+        print(f"{scen_name:<20} | {'AlphaBeta':<12} | {elapsed:.4f}s | {bot.nodes_explored:<8} | {'-':<6} | {move}")
+
+    print("=" * 80)
+
+def run_pvs_benchmark(depth=4, h_func=h_hard):
+    """
+    Nodes of AlphaBeta and PVSAlphaBeta at the same depth, with a fresh TT and
+    move orderer per run: a fixed-depth search and iterative deepening up to
+    'depth' (where PVS also uses aspiration windows). RE-SEARCH counts null-window
+    fail-highs, ASP FAIL aspiration windows that had to be widened.
+    """
+    print(f"{'SCENARIO':<20} | {'SEARCH':<10} | {'ALGORITHM':<9} | {'TIME':<8} | {'NODES':<8} | {'NODES %':<8} | {'RE-SEARCH':<9} | {'ASP FAIL':<8} | {'SAME MOVE':<9} | {'MOVE'}")
+    print("=" * 125)
+
+    for scen_name, moves in SCENARIOS.items():
+        for search in ("fixed", "deepening"):
+            base_nodes = base_move = None
+            for name, AlgoClass in (("AlphaBeta", AlphaBeta), ("PVS", PVSAlphaBeta)):
+                board = Board(size=15)
+                for r, c in moves:
+                    board.make_move(r, c)
+                bot = AlgoClass(depth=depth, heuristic_func=h_func,
+                                transposition_table=TranspositionTable(), move_orderer=MoveOrderer())
+
+                start = time.perf_counter()
+                if search == "fixed": move = bot.find_best_move(board)
+                else: move = bot.find_best_move_timed(board, time_limit=3600, max_depth=depth)
+                elapsed = time.perf_counter() - start
+
                 nodes = bot.nodes_explored
-                pruned = getattr(bot, 'pruning_count', 0) 
-                
-                print(f"{scen_name:<20} | {name:<20} | {elapsed:.4f}s  | {nodes:<8} | {pruned:<8} | {move}")
-                
-            except Exception as e:
-                print(f"{scen_name:<20} | {name:<20} | ERROR: {e}")
+                if base_nodes is None: base_nodes, base_move = nodes, move
+                d_nodes = (nodes - base_nodes) / base_nodes * 100
+                re_searches = getattr(bot, "re_searches", "-")
+                failures = getattr(bot, "aspiration_failures", "-")
+                print(f"{scen_name:<20} | {search:<10} | {name:<9} | {elapsed:.4f}s | {nodes:<8} | {d_nodes:+7.1f}% | {re_searches:<9} | {failures:<8} | {str(move == base_move):<9} | {move}")
+
+    print("=" * 125)
+
+def run_quiescence_benchmark(h_func=h_hard, quiescence_depth=4):
+    """
+    Depth 3 with and without the quiescence search against a plain depth 5, on
+    the tactical and horizon scenarios (fresh TT and move orderer per run).
+    SAME AS D5 compares the chosen move; Q-NODES are the nodes past depth 3.
+    """
+    print(f"{'SCENARIO':<20} | {'SEARCH':<6} | {'TIME':<8} | {'NODES':<8} | {'Q-NODES':<8} | {'SCORE':<12} | {'SAME AS D5':<10} | {'MOVE'}")
+    print("=" * 105)
+
+    for scen_name, moves in {**TACTICAL_SCENARIOS, **HORIZON_SCENARIOS}.items():
+        rows = []
+        for name, depth, q_depth in (("D3", 3, 0), ("D3+Q", 3, quiescence_depth), ("D5", 5, 0)):
+            board = Board(size=15)
+            for r, c in moves:
+                board.make_move(r, c)
+            bot = AlphaBeta(depth=depth, heuristic_func=h_func, transposition_table=TranspositionTable(),
+                            move_orderer=MoveOrderer(), quiescence_depth=q_depth)
+            start = time.perf_counter()
+            move = bot.find_best_move(board)
+            rows.append((name, time.perf_counter() - start, bot.nodes_explored, bot.quiescence_nodes, bot.last_score, move))
+        reference = rows[-1][-1]
+        for name, elapsed, nodes, q_nodes, score, move in rows:
+            print(f"{scen_name:<20} | {name:<6} | {elapsed:.4f}s | {nodes:<8} | {q_nodes:<8} | {score:<12.0f} | {str(move == reference):<10} | {move}")
+
+    print("=" * 105)
+
+def run_selective_benchmark(runs=SELECTIVE_RUNS, reference_depth=5, h_func=h_hard, quiescence_depth=4):
+    """
+    Node count against strength for the selective-search switches: every run of
+    'runs' and a full-width reference at 'reference_depth' (all with quiescence, a
+    fresh TT and move orderer), on every scenario. SAME AS REF compares the chosen
+    move with the reference; the summary gives the total time relative to the first
+    run (the full-width depth 4 of Hard mode) and the share of moves agreeing.
+    For playing strength, match the "Sel" CONFIGS entry against Hard mode with Arena.py.
+    """
+    print(f"{'SCENARIO':<20} | {'RUN':<12} | {'TIME':<8} | {'NODES':<8} | {'REDUCED':<7} | {'RE-SRCH':<7} | {'CAPPED':<7} | {'FUTILE':<7} | {'SAME AS REF':<11} | {'MOVE'}")
+    print("=" * 125)
+
+    reference_name = f"D{reference_depth} ref"
+    totals = {}
+    for scen_name, moves in {**SCENARIOS, **TACTICAL_SCENARIOS, **HORIZON_SCENARIOS}.items():
+        rows = []
+        for name, depth, options in [(reference_name, reference_depth, {})] + list(runs):
+            board = Board(size=15)
+            for r, c in moves:
+                board.make_move(r, c)
+            bot = AlphaBeta(depth=depth, heuristic_func=h_func, transposition_table=TranspositionTable(),
+                            move_orderer=MoveOrderer(), quiescence_depth=quiescence_depth, **options)
+            start = time.perf_counter()
+            move = bot.find_best_move(board)
+            rows.append((name, time.perf_counter() - start, bot.nodes_explored, dict(bot.selective_stats), move))
+        reference = rows[0][-1]
+        for name, elapsed, nodes, stats, move in rows:
+            same = move == reference
+            seconds, node_total, agree, count = totals.get(name, (0.0, 0, 0, 0))
+            totals[name] = (seconds + elapsed, node_total + nodes, agree + same, count + 1)
+            print(f"{scen_name:<20} | {name:<12} | {elapsed:.4f}s | {nodes:<8} | {stats['reduced']:<7} | {stats['re_searched']:<7} | "
+                  f"{stats['capped']:<7} | {stats['futile']:<7} | {str(same):<11} | {move}")
+
+    print("=" * 125)
+    base_time = totals[runs[0][0]][0]
+    print(f"{'RUN':<12} | {'TIME':<9} | {'TIME %':<7} | {'NODES':<9} | {'SAME AS REF'}")
+    for name, (seconds, nodes, agree, count) in totals.items():
+        print(f"{name:<12} | {seconds:8.2f}s | {seconds / base_time * 100:5.0f}% | {nodes:<9} | {agree}/{count}")
+    print("=" * 125)
+
+def run_matcher_benchmark(repeats=200):
+    """evaluate_line (compiled matcher) against the substring loop, on every line of every scenario."""
+    print(f"{'SCENARIO':<20} | {'LINES':<5} | {'SUBSTRING':<12} | {'MATCHER COLD':<12} | {'MATCHER WARM':<12} | {'SPEED-UP':<8} | {'SAME'}")
+    print("=" * 100)
+
+    for scen_name, moves in SCENARIOS.items():
+        board = Board(size=15)
+        for r, c in moves:
+            board.make_move(r, c)
+        lines = get_lines(board.board)
+        calls = repeats * len(lines) * 2
 
-    print("=" * 95)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            reference = [evaluate_line_substring(line, p) for line in lines for p in ("X", "O")]
+        substring_time = (time.perf_counter() - start) / calls
+
+        MATCHER.memo.clear()
+        start = time.perf_counter()
+        compiled = [evaluate_line(line, p) for line in lines for p in ("X", "O")]
+        cold_time = (time.perf_counter() - start) / (len(lines) * 2)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            compiled = [evaluate_line(line, p) for line in lines for p in ("X", "O")]
+        warm_time = (time.perf_counter() - start) / calls
+
+        print(f"{scen_name:<20} | {len(lines):<5} | {substring_time * 1e6:8.2f} us | {cold_time * 1e6:8.2f} us | {warm_time * 1e6:8.2f} us | {substring_time / warm_time:<8.1f} | {compiled == reference}")
+
+    print("=" * 100)
+
+def run_scaling_benchmark(sizes=(15, 19, 25), depth=3, repeats=200):
+    """
+    Nodes per second of AlphaBeta (TT + ordering) as the board grows, with the
+    full-grid heuristic (h_hard) and with the Hard mode's incremental one
+    (AIController, no quiescence), plus the cost of one h_hard call and one
+    is_terminal() on the position. NODES/S % is relative to the first size.
+    """
+    from AIController import AIController
+    print(f"{'SIZE':<5} | {'SCENARIO':<20} | {'HEURISTIC':<11} | {'TIME':<8} | {'NODES':<8} | {'NODES/S':<8} | {'H_HARD':<10} | {'TERMINAL':<9} | {'MOVE'}")
+    print("=" * 110)
+
+    base_rates = {}
+    for size in sizes:
+        totals = {}
+        for scen_name, moves in positions_for_size(SCENARIOS, size).items():
+            for name in ("h_hard", "incremental"):
+                board = Board(size=size)
+                for r, c in moves:
+                    board.make_move(r, c)
+                if name == "h_hard":
+                    h_func = h_hard
+                else:
+                    controller = AIController()
+                    controller.bind_board(board)
+                    h_func = controller.heuristic_hard
+                bot = AlphaBeta(depth=depth, heuristic_func=h_func,
+                                transposition_table=TranspositionTable(), move_orderer=MoveOrderer())
+                start = time.perf_counter()
+                move = bot.find_best_move(board)
+                elapsed = time.perf_counter() - start
+                nodes, seconds = totals.get(name, (0, 0.0))
+                totals[name] = (nodes + bot.nodes_explored, seconds + elapsed)
+
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    h_func(board.board, "X")
+                eval_time = (time.perf_counter() - start) / repeats
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    board.is_terminal()
+                terminal_time = (time.perf_counter() - start) / repeats
+                print(f"{size:<5} | {scen_name:<20} | {name:<11} | {elapsed:.4f}s | {bot.nodes_explored:<8} | {bot.nodes_explored / elapsed:<8.0f} | "
+                      f"{eval_time * 1e6:7.1f} us | {terminal_time * 1e6:6.2f} us | {move}")
+        for name, (nodes, seconds) in totals.items():
+            rate = nodes / seconds
+            base_rates.setdefault(name, rate)
+            print(f"{size:<5} | {'ALL':<20} | {name:<11} | {seconds:.4f}s | {nodes:<8} | {rate:<8.0f} | NODES/S % {rate / base_rates[name] * 100:.0f}")
+        print("-" * 110)
+
+    print("=" * 110)
+
+def _allocation_count(func):
+    """
+    Memory blocks allocated by one call (tracemalloc snapshot counts), after a warm-up call.
+    Every object the call binds to a local name, and its result, is kept alive until the
+    second snapshot, so loop temporaries (one line string per iteration) count too;
+    objects that never get a name (inside a C-level join) are not seen.
+    """
+    func()
+    kept = [None]
+    def keep_locals(frame, event, arg):
+        kept.extend(frame.f_locals.values())
+        return keep_locals
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(own)
+    sys.settrace(keep_locals)
+    try:
+        kept.append(func())
+    finally:
+        sys.settrace(None)
+    after = tracemalloc.take_snapshot().filter_traces(own)
+    tracemalloc.stop()
+    return sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+def run_allocation_benchmark(sizes=(15, 19), repeats=500):
+    """
+    Allocations and time per call of the line readers (LineIndex): get_lines and evaluate()
+    against their join-per-line references, and check_winner on every cell of the board.
+    BLOCKS counts the memory blocks one call allocates (the masks are memoised first).
+    """
+    print(f"{'SIZE':<5} | {'SCENARIO':<20} | {'FUNCTION':<15} | {'BLOCKS':<6} | {'TIME':<10}")
+    print("=" * 75)
+
+    for size in sizes:
+        for scen_name, moves in positions_for_size(SCENARIOS, size).items():
+            board = Board(size=size)
+            for r, c in moves:
+                board.make_move(r, c)
+            grid = board.board
+            cells = [(r, c) for r in range(size) for c in range(size)]
+            functions = [
+                ("get_lines_join", lambda: get_lines_join(grid), repeats),
+                ("get_lines", lambda: get_lines(grid), repeats),
+                ("evaluate_join", lambda: evaluate_join(grid, "X"), repeats),
+                ("evaluate", lambda: evaluate(grid, "X"), repeats),
+                ("check_winner", lambda: [board.check_winner(r, c, "X") for r, c in cells], repeats // 20 + 1),
+            ]
+            for name, func, calls in functions:
+                blocks = _allocation_count(func)
+                start = time.perf_counter()
+                for _ in range(calls):
+                    func()
+                elapsed = (time.perf_counter() - start) / calls
+                print(f"{size:<5} | {scen_name:<20} | {name:<15} | {blocks:<6} | {elapsed * 1e6:7.1f} us")
+        print("-" * 75)
+
+    print("=" * 75)
+
+# Other experiments, run by "all"
+EXPERIMENTS = [run_ordering_benchmark, run_backend_benchmark, run_parallel_benchmark,
+               run_matcher_benchmark, run_threat_benchmark, run_pvs_benchmark, run_quiescence_benchmark,
+               run_scaling_benchmark, run_selective_benchmark, run_allocation_benchmark]
 
 if __name__ == "__main__":
-    run_benchmark()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Gomoku search benchmarks.")
+    parser.add_argument("what", nargs="?", choices=("suite", "all"), default="suite",
+                        help="suite: statistical (position, config) suite; all: the suite and every other experiment")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--positions", default="scenarios", help=f"comma-separated: {', '.join(POSITION_SETS)}")
+    parser.add_argument("--configs", help="regular expression on the CONFIGS names")
+    parser.add_argument("--size", type=int, default=15, help="board size; the positions are moved to its centre")
+    parser.add_argument("--json", help="write the results to this file (e.g. a new baseline)")
+    parser.add_argument("--compare", help="baseline JSON file: report regressions, exit code 1 if any")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slow-down that counts as a regression")
+    args = parser.parse_args()
+
+    positions = load_positions(args.positions.split(","), args.size)
+    configs = [c for c in CONFIGS if args.configs is None or re.search(args.configs, c[0])]
+    results = run_benchmark(repeats=args.repeats, warmup=args.warmup, positions=positions, configs=configs, size=args.size)
+    if args.json: save_results(args.json, results, args.repeats, args.warmup)
+    if args.what == "all":
+        for experiment in EXPERIMENTS:
+            experiment()
+    failed = any("error" in r for r in results)
+    regressions = compare_results(results, args.compare, args.threshold) if args.compare else []
+    sys.exit(1 if regressions else 2 if failed else 0)
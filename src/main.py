@@ -1,7 +1,10 @@
 # Application entry point
 
+import logging
 from GomokuGUI import GomokuGUI
 
 if __name__ == "__main__":
+   # AIController's per-move search summary on the console
+   logging.basicConfig(level=logging.INFO, format="%(message)s")
    app = GomokuGUI()
    app.start_game()
\ No newline at end of file
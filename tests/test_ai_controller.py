@@ -0,0 +1,65 @@
+# Time budgets of AIController.select_best_move, and its evaluation backends
+
+import time
+import pytest
+
+from AIController import AIController, THREAT_NODES_PER_PLY
+from Board import Board
+from ThreatSearch import ThreatSearch
+
+# Quiet midgame (benchMark.HORIZON_SCENARIOS "H4"): no forced win, so the threat solver
+# explores its whole node budget without a result before the search runs
+QUIET_MIDGAME = [(7, 7), (8, 7), (9, 7), (7, 6), (6, 7), (7, 8), (7, 9)]
+
+def quiet_board():
+    board = Board(size=15)
+    for r, c in QUIET_MIDGAME:
+        board.make_move(r, c)
+    return board
+
+def test_threat_search_stops_at_its_time_limit():
+    solver = ThreatSearch(node_limit=10 ** 6)
+    start = time.perf_counter()
+    assert solver.solve(quiet_board(), time_limit=0.05) is None
+    assert time.perf_counter() - start < 0.15
+
+@pytest.mark.parametrize("mode", ["AlphaBeta_H2", "AlphaBeta_Combined"])
+def test_threat_solver_budget_follows_the_depth_without_time_limit(mode):
+    controller = AIController()
+    controller.threat_search.node_limit = 10 ** 6 # the per-move budget must apply anyway
+    bot = controller.medium_bot if mode == "AlphaBeta_H2" else controller.hard_bot
+    controller.select_best_move(quiet_board(), mode)
+    controller.close()
+    assert controller.last_stats["threat"] is None
+    assert controller.threat_search.nodes_explored <= THREAT_NODES_PER_PLY * bot.depth + 1
+
+@pytest.mark.parametrize("mode", ["AlphaBeta_H2", "AlphaBeta_Combined"])
+def test_select_best_move_stays_near_time_limit(mode):
+    controller = AIController()
+    board = quiet_board()
+    start = time.perf_counter()
+    move, _, _ = controller.select_best_move(board, mode, time_limit=0.2)
+    elapsed = time.perf_counter() - start
+    controller.close()
+    assert move in board.get_possible_moves()
+    assert controller.last_stats["threat"] is None
+    assert elapsed < 0.2 * 1.5
+
+# benchMark.HORIZON_SCENARIOS "H1" and "H3": the side to move must see forcing moves past depth 3
+HORIZON_POSITIONS = [[(7, 7), (7, 6), (6, 8), (7, 8), (5, 7)], [(7, 7), (8, 8), (6, 7), (8, 6), (9, 8)]]
+
+@pytest.mark.parametrize("moves", HORIZON_POSITIONS)
+def test_backends_run_the_same_search(moves):
+    pytest.importorskip("numpy")
+    results = []
+    for backend in ("python", "numpy"):
+        controller = AIController(backend=backend)
+        controller.threat_search.node_limit = 0 # search every position
+        board = Board(size=15)
+        for r, c in moves:
+            board.make_move(r, c)
+        move, _, nodes = controller.select_best_move(board, "AlphaBeta_H2")
+        results.append((move, nodes, controller.medium_bot.last_score, controller.medium_bot.quiescence_nodes))
+        controller.close()
+    assert results[0] == results[1]
+    assert results[0][3] > 0
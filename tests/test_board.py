@@ -0,0 +1,42 @@
+# Board state restored by undo_move: last move, history, hash and the candidate frontier
+
+import random
+
+from Board import Board
+
+def snapshot(board):
+    return (board.last_move, list(board.move_history), board.hash, set(board.frontier),
+            [row[:] for row in board.stone_count], board.current_player)
+
+def test_undo_restores_last_move_and_frontier():
+    rng = random.Random(0)
+    for radius in (1, 2):
+        board = Board(size=15, radius=radius)
+        states = [snapshot(board)]
+        for _ in range(60):
+            assert board.make_move(*rng.choice(board.get_possible_moves()))
+            states.append(snapshot(board))
+        while board.move_history:
+            states.pop()
+            board.undo_move(*board.move_history[-1])
+            assert snapshot(board) == states[-1]
+        assert board.last_move is None and board.frontier == set()
+
+def test_frontier_is_the_empty_cells_next_to_a_stone():
+    rng = random.Random(1)
+    board = Board(size=9)
+    for _ in range(30):
+        board.make_move(*rng.choice(board.get_possible_moves()))
+        if rng.random() < 0.3: board.undo_move(*board.move_history[-1])
+        expected = {(r, c) for r in range(9) for c in range(9) if board.board[r][c] == "."
+                    and any(board.board[x][y] != "." for x, y in board.neighbours[(r, c)])}
+        assert board.frontier == expected
+
+def test_undo_of_an_earlier_move_keeps_last_move_consistent():
+    board = Board(size=15)
+    for move in [(7, 7), (7, 8), (8, 8)]:
+        board.make_move(*move)
+    board.undo_move(7, 7)
+    assert board.move_history == [(7, 8), (8, 8)]
+    assert board.last_move == (8, 8)
+    assert (7, 7) in board.frontier
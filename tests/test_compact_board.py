@@ -0,0 +1,71 @@
+# CompactBoard: same behaviour as Board, and a binary form under 100 bytes
+
+import pickle
+import random
+
+from Board import Board
+from CompactBoard import CompactBoard
+from HeuristicEvaluator import evaluate
+
+def play(boards, rng, plies):
+    for _ in range(plies):
+        move = rng.choice(boards[0].get_possible_moves())
+        assert all(board.make_move(*move) for board in boards)
+        if boards[0].is_terminal(): break
+
+def assert_same(compact, board):
+    assert compact.board == board.board
+    assert compact.hash == board.hash and compact.frontier == board.frontier
+    assert compact.move_history == board.move_history and compact.last_move == board.last_move
+    assert compact.current_player == board.current_player
+    assert compact.get_possible_moves() == board.get_possible_moves()
+    assert compact.is_terminal() == board.is_terminal()
+
+def test_same_api_as_board():
+    rng = random.Random(0)
+    for size in (9, 15, 19):
+        compact, board = CompactBoard(size), Board(size)
+        for _ in range(80):
+            if board.move_history and rng.random() < 0.3:
+                move = board.move_history[-1]
+                assert compact.undo_move(*move) and board.undo_move(*move)
+            else:
+                move = rng.choice(board.get_possible_moves())
+                assert compact.make_move(*move) and board.make_move(*move)
+            assert_same(compact, board)
+            assert evaluate(compact.board, "X") == evaluate(board.board, "X")
+        assert not compact.make_move(*board.move_history[0])
+        assert not compact.make_move(size, 0)
+
+def test_round_trip_under_100_bytes():
+    rng = random.Random(1)
+    for size in (15, 19):
+        for plies in (0, 10, 60, 200):
+            compact = CompactBoard(size)
+            board = Board(size)
+            play([compact, board], rng, plies)
+            data = compact.to_bytes()
+            assert len(data) < 100
+            restored = CompactBoard.from_bytes(data)
+            assert restored.cells == compact.cells and restored.hash == compact.hash
+            assert restored.current_player == compact.current_player
+            assert restored.last_move == compact.last_move
+            assert restored.frontier == compact.frontier
+            assert pickle.loads(pickle.dumps(compact)).cells == compact.cells
+
+def test_keep_order_and_conversions():
+    rng = random.Random(2)
+    compact = CompactBoard(15)
+    play([compact], rng, 40)
+    restored = CompactBoard.from_bytes(compact.to_bytes(keep_order=True))
+    assert restored.move_history == compact.move_history
+    assert_same(CompactBoard.from_board(compact.to_board()), compact.to_board())
+
+def test_copy_is_independent():
+    rng = random.Random(3)
+    compact = CompactBoard(15)
+    play([compact], rng, 20)
+    copy = compact.copy()
+    assert copy.cells == compact.cells and copy.hash == compact.hash
+    copy.make_move(*copy.get_possible_moves()[0])
+    assert copy.cells != compact.cells and len(copy.move_history) == len(compact.move_history) + 1
@@ -0,0 +1,65 @@
+# Cancellation of EngineService searches, including the threat solver that runs first
+
+import asyncio
+import concurrent.futures
+import time
+
+from AIController import AIController
+from Board import Board
+from EngineService import EngineService
+from ThreatSearch import ThreatSearch
+
+# Quiet midgame (benchMark.HORIZON_SCENARIOS "H4"): the threat solver proves nothing and runs long
+QUIET_MIDGAME = [(7, 7), (8, 7), (9, 7), (7, 6), (6, 7), (7, 8), (7, 9)]
+
+def slow_service():
+    controller = AIController()
+    # Seconds of solving without a stop (the searches get THREAT_TIME_SHARE of a 30 s time_limit)
+    controller.threat_search = ThreatSearch(node_limit=10 ** 6)
+    board = Board(size=15)
+    for r, c in QUIET_MIDGAME:
+        board.make_move(r, c)
+    return EngineService(controller, ponder=False), board
+
+def test_cancel_stops_the_threat_solver():
+    service, board = slow_service()
+
+    async def cancelled_search():
+        task = asyncio.ensure_future(service.search(board, "AlphaBeta_Combined", time_limit=30))
+        await asyncio.sleep(0.2)
+        service.cancel()
+        start = time.perf_counter()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return time.perf_counter() - start
+        return None
+
+    elapsed = asyncio.run(cancelled_search())
+    service.close()
+    assert elapsed is not None and elapsed < 0.2
+
+def test_close_without_wait_returns_at_once():
+    service, board = slow_service()
+    future = service.submit(board, "AlphaBeta_Combined", time_limit=30)
+    time.sleep(0.2)
+    start = time.perf_counter()
+    service.close(wait=False)
+    assert time.perf_counter() - start < 0.1
+    concurrent.futures.wait([future], timeout=5)
+    assert future.cancelled()
+
+def test_ponder_does_not_wait_for_a_running_search():
+    controller = AIController()
+    controller.threat_search = ThreatSearch(node_limit=10 ** 6)
+    service = EngineService(controller)
+    board = Board(size=15)
+    for r, c in QUIET_MIDGAME:
+        board.make_move(r, c)
+    future = service.submit(board, "AlphaBeta_Combined", time_limit=30)
+    time.sleep(0.2)
+    start = time.perf_counter()
+    service.ponder(board, "AlphaBeta_Combined")
+    assert time.perf_counter() - start < 0.05
+    assert not future.done()
+    service.close()
@@ -0,0 +1,39 @@
+# Evaluation cache: both tiers, and a second controller reading the first one's file
+
+import pytest
+
+from AIController import AIController
+from Board import Board
+from EvalCache import EvalCache
+
+def test_scores_survive_in_the_file(tmp_path):
+    path = str(tmp_path / "evals.db")
+    cache = EvalCache("v1", path, flush_every=2)
+    assert cache.get(1, "X") is None
+    cache.put(1, "X", 12)
+    cache.put(2 ** 64 - 1, "O", 2.5)
+    cache.close()
+    reader = EvalCache("v1", path)
+    assert reader.get(1, "X") == 12 and reader.get(2 ** 64 - 1, "O") == 2.5
+    assert reader.get(1, "O") is None
+    assert reader.stats()["disk_hits"] == 2
+    assert EvalCache("v2", path).get(1, "X") is None
+    assert EvalCache("v1", path, read_disk=False).get(1, "X") is None
+
+def test_second_controller_reads_the_disk_tier(tmp_path):
+    pytest.importorskip("numpy")
+    path = str(tmp_path / "evals.db")
+    results = []
+    for _ in range(2):
+        controller = AIController(backend="numpy", eval_cache_path=path)
+        controller.threat_search.node_limit = 0 # search every position
+        board = Board(size=15)
+        for r, c in [(7, 7), (7, 6), (6, 8), (7, 8), (5, 7)]:
+            board.make_move(r, c)
+        move, _, nodes = controller.select_best_move(board, "AlphaBeta_H2")
+        results.append((move, nodes, controller.cache_stats()["AlphaBeta_H2"]))
+        controller.close()
+    (first_move, first_nodes, first), (second_move, second_nodes, second) = results
+    assert first["disk_hits"] == 0 and first["misses"] > 0
+    assert second["disk_hits"] == first["misses"] and second["misses"] == 0
+    assert (second_move, second_nodes) == (first_move, first_nodes)
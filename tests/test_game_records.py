@@ -0,0 +1,65 @@
+# Record readers: the three formats, their error records, and the position replay
+
+import gzip
+import json
+import logging
+
+import pytest
+
+from GameRecords import RecordError, parse_move, positions, read_games, read_gomocup, read_move_lines, read_renju
+
+def test_parse_move():
+    assert parse_move("7,7", 15) == (7, 7)
+    assert parse_move("h8", 15) == (7, 7)
+    assert parse_move("A15", 15) == (0, 0)
+    with pytest.raises(RecordError):
+        parse_move("", 15)
+    with pytest.raises(RecordError):
+        parse_move("7-7", 15)
+
+def test_move_lines():
+    lines = ["# comment", "", "7,7 8,8;7,8", "h8 i9;", "7,7;8,8;", "[[7, 7], [8, 8]]",
+             json.dumps({"size": 19, "opening": [[9, 9]], "moves": [[9, 10]]})]
+    games = list(read_move_lines(lines, "games", 15))
+    assert games == [("games:3", 15, [(7, 7), (8, 8), (7, 8)]),
+                     ("games:4", 15, [(7, 7), (6, 8)]),
+                     ("games:5", 15, [(7, 7), (8, 8)]),
+                     ("games:6", 15, [(7, 7), (8, 8)]),
+                     ("games:7", 19, [(9, 9), (9, 10)])]
+
+def test_bad_move_lines_are_skipped_and_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="GameRecords"):
+        games = list(read_move_lines(["7,7 zz", "[7, 7", "8,8"], "bad", 15))
+    assert games == [("bad:3", 15, [(8, 8)])]
+    assert "bad:1" in caplog.text and "bad:2" in caplog.text
+
+def test_gomocup():
+    lines = ["Piskvorky 20x20, 11:11, 0", "8,8,500", "9,9,300", "-1", "junk",
+             "Piskvorky 15x15, 0:0, 0", "1,2"]
+    games = list(read_gomocup(lines, "g.psq", 15))
+    assert games == [("g.psq:1", 20, [(7, 7), (8, 8)]), ("g.psq:6", 15, [(1, 0)])]
+
+def test_renju(caplog):
+    lines = ['[Event "test"]', '[Size "15"]', "1. h8 i9 2. j10", "",
+             "<move>h8 i9</move>", '[Size "19"]', "a1 zz"]
+    with caplog.at_level(logging.WARNING, logger="GameRecords"):
+        games = list(read_renju(lines, "r.txt", 15))
+    assert games == [("r.txt:1", 15, [(7, 7), (6, 8), (5, 9)]), ("r.txt:5", 15, [(7, 7), (6, 8)])]
+    assert "r.txt:6" in caplog.text
+
+def test_read_games_from_gzip(tmp_path):
+    path = tmp_path / "games.txt.gz"
+    with gzip.open(path, "wt") as f:
+        f.write("7,7 8,8\n")
+    assert list(read_games([str(path)])) == [(f"{path}:1", 15, [(7, 7), (8, 8)])]
+    with pytest.raises(ValueError):
+        list(read_games([str(path)], fmt="sgf"))
+
+def test_positions_dedupe_and_illegal_moves():
+    games = [("a", 15, [(7, 7), (8, 8)]), ("b", 15, [(7, 7), (8, 8), (7, 7)])]
+    counts = {}
+    result = list(positions(games, counts=counts))
+    assert [(game, ply) for game, ply, _, _ in result] == [("a", 0), ("a", 1), ("a", 2)]
+    assert counts == {"games": 2, "positions": 3, "duplicates": 3, "illegal": 1}
+    symmetric = list(positions([("c", 15, [(7, 7), (8, 8)]), ("d", 15, [(7, 7), (6, 6)])], dedupe="symmetric"))
+    assert len(symmetric) == 3
@@ -0,0 +1,30 @@
+# H1 line reading (LineIndex slices) against the join-per-line references
+
+import random
+
+from HeuristicEvaluator import AI, OP, evaluate, evaluate_join, get_lines, get_lines_join
+
+def random_grid(rng, n):
+    density = rng.random() * 0.6
+    return [[rng.choice("XO") if rng.random() < density else "." for _ in range(n)] for _ in range(n)]
+
+def test_get_lines_matches_join():
+    rng = random.Random(0)
+    for n in (5, 6, 9, 15, 19):
+        for _ in range(20):
+            grid = random_grid(rng, n)
+            assert get_lines(grid) == get_lines_join(grid)
+
+def test_evaluate_matches_join():
+    rng = random.Random(1)
+    for n in (5, 7, 15, 19):
+        for _ in range(200):
+            grid = random_grid(rng, n)
+            for player in (AI, OP):
+                assert evaluate(grid, player) == evaluate_join(grid, player)
+
+def test_single_stone_lines_score_nothing():
+    grid = [["."] * 15 for _ in range(15)]
+    assert evaluate(grid) == evaluate_join(grid) == 0
+    grid[7][7] = "X"
+    assert evaluate(grid) == evaluate_join(grid) == 0
@@ -0,0 +1,50 @@
+# IncrementalEvaluator must always give the full-board scores of HeuristicEvaluator
+
+import random
+
+from Board import Board
+from HeuristicEvaluator import AI, OP, evaluate, evaluate_distance_to_center, evaluate_freedom
+from IncrementalEvaluator import IncrementalEvaluator
+
+def assert_matches(evaluator, board):
+    for player in (AI, OP):
+        assert evaluator.score(player) == evaluate(board.board, player)
+        assert evaluator.distance(player) == evaluate_distance_to_center(board.board, player)
+        assert evaluator.freedom(player) == evaluate_freedom(board.board, player)
+
+def test_random_make_undo_sequences():
+    rng = random.Random(0)
+    for size in (7, 15, 19):
+        board = Board(size=size)
+        evaluator = IncrementalEvaluator(board).attach()
+        for _ in range(400):
+            if board.move_history and rng.random() < 0.35:
+                board.undo_move(*board.move_history[-1])
+            else:
+                empty = [(r, c) for r in range(size) for c in range(size) if board.board[r][c] == "."]
+                if not empty: break
+                board.make_move(*rng.choice(empty))
+            assert_matches(evaluator, board)
+        while board.move_history:
+            board.undo_move(*board.move_history[-1])
+        assert_matches(evaluator, board)
+
+def test_binding_to_a_position_in_progress():
+    rng = random.Random(1)
+    board = Board(size=15)
+    for _ in range(40):
+        board.make_move(*rng.choice(board.get_possible_moves()))
+    evaluator = IncrementalEvaluator(board).attach()
+    assert_matches(evaluator, board)
+    evaluator.detach()
+    board.make_move(*board.get_possible_moves()[0])
+    assert evaluator not in board.listeners
+
+def test_bounded_line_cache():
+    rng = random.Random(2)
+    board = Board(size=15)
+    evaluator = IncrementalEvaluator(board, cache_limit=50).attach()
+    for _ in range(100):
+        board.make_move(*rng.choice(board.get_possible_moves()))
+        assert len(evaluator.line_cache) <= 50
+        assert_matches(evaluator, board)
@@ -0,0 +1,31 @@
+# The NumPy backend must give exactly the scores of HeuristicEvaluator
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import HeuristicEvaluator as reference
+import NumpyEvaluator
+from HeuristicEvaluator import AI, OP
+
+def random_board(rng, n, fill):
+    return [[rng.choice("XO") if rng.random() < fill else "." for _ in range(n)] for _ in range(n)]
+
+def test_single_positions_match_reference():
+    rng = random.Random(0)
+    for _ in range(300):
+        board = random_board(rng, rng.choice([5, 8, 15, 19]), rng.random())
+        for player in (AI, OP):
+            assert NumpyEvaluator.evaluate(board, player) == reference.evaluate(board, player)
+            assert NumpyEvaluator.evaluate_distance_to_center(board, player) == reference.evaluate_distance_to_center(board, player)
+            assert NumpyEvaluator.evaluate_freedom(board, player) == reference.evaluate_freedom(board, player)
+
+def test_batches_match_reference():
+    rng = random.Random(1)
+    boards = [random_board(rng, 15, 0.2) for _ in range(64)]
+    for player in (AI, OP):
+        assert list(NumpyEvaluator.evaluate_batch(boards, player)) == [reference.evaluate(b, player) for b in boards]
+        assert list(NumpyEvaluator.evaluate_distance_to_center_batch(boards, player)) == \
+            [reference.evaluate_distance_to_center(b, player) for b in boards]
+        assert list(NumpyEvaluator.evaluate_freedom_batch(boards, player)) == [reference.evaluate_freedom(b, player) for b in boards]
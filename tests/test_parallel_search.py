@@ -0,0 +1,70 @@
+# ParallelAlphaBeta and PVSAlphaBeta must pick the serial AlphaBeta move, with or without quiescence
+
+import math
+import threading
+import time
+
+import pytest
+
+from AlphaBeta import AlphaBeta, SearchCancelled
+from Board import Board
+from HeuristicEvaluator import evaluate
+from MoveOrdering import MoveOrderer
+from ParallelAlphaBeta import ParallelAlphaBeta
+from PVSAlphaBeta import PVSAlphaBeta
+from TranspositionTable import TranspositionTable
+
+# benchMark.SCENARIOS "Split Three", HORIZON_SCENARIOS "Broken Three" and "Cross"
+POSITIONS = [[(7, 7), (2, 2), (7, 8), (2, 3), (7, 10)],
+             [(7, 7), (7, 6), (6, 8), (7, 8), (5, 7)],
+             [(7, 7), (8, 8), (6, 7), (8, 6), (9, 8)]]
+
+def make_board(moves):
+    board = Board(size=15)
+    for r, c in moves:
+        board.make_move(r, c)
+    return board
+
+def options(quiescence, tables=True):
+    return {"heuristic_func": evaluate, "transposition_table": TranspositionTable() if tables else None,
+            "move_orderer": MoveOrderer() if tables else None, "quiescence_depth": quiescence}
+
+@pytest.mark.parametrize("quiescence", [0, 4])
+def test_same_move_as_alphabeta(quiescence):
+    parallel = ParallelAlphaBeta(depth=3, workers=2, **options(quiescence))
+    try:
+        for moves in POSITIONS:
+            serial = AlphaBeta(depth=3, **options(quiescence))
+            expected = serial.find_best_move(make_board(moves))
+            for bot in (parallel, PVSAlphaBeta(depth=3, **options(quiescence))):
+                board = make_board(moves)
+                assert bot.find_best_move(board) == expected, type(bot).__name__
+                assert bot.last_score == serial.last_score
+                assert board.move_history == moves
+    finally:
+        parallel.close()
+
+def test_cancelled_search_does_not_bound_the_next_one():
+    # No table or orderer history to carry over: the next search starts from the same state
+    parallel = ParallelAlphaBeta(depth=4, workers=2, **options(4, tables=False))
+    try:
+        board = make_board(POSITIONS[2])
+        stop_event = parallel.stop_event = threading.Event()
+
+        def cancel_while_the_workers_search():
+            while parallel.pool is None: time.sleep(0.01)
+            time.sleep(0.2)
+            stop_event.set()
+
+        threading.Thread(target=cancel_while_the_workers_search, daemon=True).start()
+        with pytest.raises(SearchCancelled):
+            parallel.find_best_move(board)
+        parallel.stop_event = None
+        time.sleep(0.5) # the cancelled workers would have written their scores by now
+        assert parallel.shared_alpha.value == -math.inf
+        parallel.depth = 3
+        serial = AlphaBeta(depth=3, **options(4, tables=False))
+        assert parallel.find_best_move(board) == serial.find_best_move(make_board(POSITIONS[2]))
+        assert parallel.last_score == serial.last_score
+    finally:
+        parallel.close()
@@ -0,0 +1,28 @@
+# The compiled PatternMatcher must score every line like the substring loop it replaced
+
+import random
+
+from HeuristicEvaluator import AI, OP, MATCHER, evaluate_line, evaluate_line_substring, get_lines
+from PatternMatcher import flip
+
+def test_random_lines_match_substring_loop():
+    rng = random.Random(0)
+    for _ in range(3000):
+        line = "".join(rng.choice("..XO") for _ in range(rng.randint(1, 19)))
+        for player in (AI, OP):
+            assert evaluate_line(line, player) == evaluate_line_substring(line, player)
+
+def test_board_lines_match_substring_loop():
+    rng = random.Random(1)
+    board = [[rng.choice("....XO") for _ in range(15)] for _ in range(15)]
+    for line in get_lines(board):
+        for player in (AI, OP):
+            assert evaluate_line(line, player) == evaluate_line_substring(line, player)
+
+def test_memo_is_bounded_and_cold_scores_are_unchanged():
+    MATCHER.memo.clear()
+    line = ".XXX.O.OO."
+    cold = evaluate_line(line, AI)
+    assert line in MATCHER.memo
+    assert evaluate_line(line, AI) == cold == evaluate_line_substring(line, AI)
+    assert flip(flip("XO.")) == "XO."